@@ -0,0 +1,437 @@
+"""
+비동기 Bitbucket REST API 클라이언트 (httpx.AsyncClient, HTTP/2 지원)
+asyncio 파이프라인에서 Bitbucket I/O와 LLM 호출을 섞어 실행하고,
+하나의 워커가 여러 이슈를 동시에 처리할 수 있도록 BitbucketAPI와 같은 메서드를 코루틴으로 제공
+"""
+
+import os
+import time
+import asyncio
+import logging
+import importlib.util
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.bitbucket_api import FileFetchResult, get_file_cache
+from app.bitbucket_common import (
+    COMMIT_HASH_PATTERN, IDEMPOTENT_METHODS, STALE_PARENT_STATUS, BitbucketClientBase
+)
+from app.multipart import MultipartStream, multipart_stream
+from app.rate_limit import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 사용에 필요한 h2 패키지 설치 여부 (httpx[http2])"""
+    return importlib.util.find_spec('h2') is not None
+
+
+async def _stream_body(body: MultipartStream) -> AsyncIterator[bytes]:
+    """MultipartStream → httpx 비동기 본문 (조각 단위로만 복사)"""
+    for chunk in body:
+        yield bytes(chunk)
+
+
+class AsyncBitbucketAPI(BitbucketClientBase):
+    """
+    Bitbucket REST API 비동기 클라이언트
+
+    하나의 AsyncClient(공유 커넥션 풀, HTTP/2면 연결 하나에서 요청 다중화)를 사용하며
+    호출 제한(토큰 버킷, 429 Retry-After, X-RateLimit-*)과 브랜치 해시 캐시는 BitbucketAPI와 같은
+    BitbucketClientBase 로직을 사용하고 파일 캐시도 공유
+    클라이언트는 처음 요청하는 이벤트 루프에서 생성되므로 한 인스턴스는 하나의 루프에서만 사용
+    """
+
+    def __init__(self, url: str, username: str, access_token: str, workspace: str, repository: str,
+                 pool_size: Optional[int] = None, http2: Optional[bool] = None,
+                 ref_cache_ttl: Optional[float] = None, rate_limit: Optional[float] = None,
+                 max_retries: Optional[int] = None, transport: Any = None):
+        """
+        Args:
+            url: Bitbucket API 주소
+            username: 호환성을 위해 유지 (Bearer Token만 사용)
+            access_token: Bearer Token
+            workspace: 워크스페이스
+            repository: 저장소 이름
+            pool_size: 최대 연결 수 겸 동시 요청 수 (기본: BITBUCKET_POOL_SIZE)
+            http2: HTTP/2 사용 여부 (기본: BITBUCKET_HTTP2, h2가 없으면 HTTP/1.1)
+            ref_cache_ttl: 브랜치 해시 캐시 유지 시간(초)
+            rate_limit: 초당 요청 수 (0이면 제한 없음)
+            max_retries: 재시도 횟수
+            transport: httpx 전송 계층 (테스트용 MockTransport 등)
+        """
+        self.base_url = url
+        self.username = username
+        self.access_token = access_token
+        self.workspace = workspace
+        self.repository = repository
+
+        self.api_base = f"{url}/2.0"
+        self.repo_base = f"{self.api_base}/repositories/{workspace}/{repository}"
+
+        if pool_size is None:
+            pool_size = int(os.getenv('BITBUCKET_POOL_SIZE', '10'))
+        self.pool_size = max(1, pool_size)
+        if http2 is None:
+            http2 = os.getenv('BITBUCKET_HTTP2', 'true').lower() == 'true'
+        if http2 and not _http2_available():
+            logger.warning("h2 패키지가 없어 HTTP/1.1로 연결합니다 (pip install 'httpx[http2]')")
+            http2 = False
+        self.http2 = http2
+        self._transport = transport
+        self._client = None
+        self._semaphore = None
+
+        self._init_client_state(ref_cache_ttl, rate_limit, max_retries)
+
+    def _get_client(self):
+        """공유 AsyncClient (첫 요청 시 생성, httpx는 이때 import)"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size),
+                timeout=httpx.Timeout(30.0),
+                headers={'Authorization': f'Bearer {self.access_token}', 'Accept-Encoding': 'gzip'},
+                transport=self._transport,
+            )
+            # HTTP/2에서는 연결 수가 아니라 스트림 수가 늘어나므로 동시 요청 수를 따로 제한
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 정리"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        return False
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """요청 수/브랜치 해시 캐시/호출 제한 통계"""
+        return {
+            'requests': self._request_count,
+            'pool_size': self.pool_size,
+            'http2': self.http2,
+            'ref_lookups': self._ref_lookups,
+            'ref_cache_hits': self._ref_cache_hits,
+            'rate_limit': self._rate_limit_snapshot(),
+        }
+
+    async def _acquire(self):
+        """토큰 버킷에서 토큰을 얻을 때까지 이벤트 루프를 막지 않고 대기"""
+        start = time.monotonic()
+        while True:
+            delay = self._rate_limiter.reserve(time.monotonic() - start)
+            if delay <= 0:
+                return
+            await asyncio.sleep(min(delay, 1.0))
+
+    async def request(self, url: str, method: str = 'GET', body: Optional[MultipartStream] = None, **kwargs):
+        """
+        Bitbucket API 요청 (BitbucketAPI.make_bitbucket_request와 같은 재시도 규칙)
+
+        429는 모든 메서드, 5xx/연결 오류는 멱등 요청만 재시도
+
+        Args:
+            url: 요청 URL
+            method: HTTP 메서드
+            body: multipart 본문 (재시도할 때마다 처음부터 다시 전송)
+            **kwargs: httpx 요청 인자 (json, params, headers 등)
+
+        Returns:
+            httpx.Response
+        """
+        import httpx
+        client = self._get_client()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        headers = dict(kwargs.pop('headers', None) or {})
+        if body is not None:
+            headers['Content-Type'] = body.content_type
+            if not self.upload_chunked:
+                headers['Content-Length'] = str(body.length)
+
+        attempt = 0
+        while True:
+            await self._acquire()
+            self._count_request()
+            if body is not None:
+                kwargs['content'] = _stream_body(body)
+
+            try:
+                async with self._semaphore:
+                    response = await client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                if idempotent and attempt < self.max_retries:
+                    delay = backoff_delay(attempt, self.retry_base_delay)
+                    logger.warning(f"요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {str(e)}")
+                    self._count_retry('connection_error')
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                logger.error(f"Bearer Token 요청 실패: {str(e)}")
+                raise
+
+            self._observe_quota(response)
+
+            if response.status_code == 429:
+                delay = self._on_throttled(response, attempt)
+                if delay is not None and attempt < self.max_retries:
+                    logger.warning(f"Bitbucket 호출 한도 초과, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                    self._count_retry('throttled')
+                    attempt += 1
+                    continue
+            elif response.status_code >= 500 and idempotent and attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base_delay)
+                logger.warning(f"서버 오류 (HTTP {response.status_code}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                self._count_retry('server_error')
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.is_error:
+                logger.error(f"API 요청 실패 (HTTP {response.status_code}): {response.text[:200]}")
+            return response
+
+    async def validate_token(self):
+        """토큰 유효성 검증"""
+        try:
+            response = await self.request(self.repo_base)
+            if response.status_code != 200:
+                logger.error(f"토큰 검증 실패: {response.status_code}")
+                return False, None
+            try:
+                repo_data = response.json() if response.content else {"status": "valid"}
+            except ValueError as e:
+                return True, {"status": "valid", "parse_error": str(e)}
+            logger.info(f"토큰 검증 성공, 저장소: {repo_data.get('name', 'Unknown')}")
+            return True, repo_data
+        except Exception as e:
+            logger.error(f"토큰 검증 중 오류: {str(e)}")
+            return False, None
+
+    async def get_branch_head(self, branch: str, refresh: bool = False) -> str:
+        """
+        브랜치 최신 커밋 해시 조회 (TTL 내에서는 캐시 사용)
+
+        Args:
+            branch: 브랜치 이름
+            refresh: True면 캐시를 무시하고 다시 조회
+
+        Returns:
+            커밋 해시
+        """
+        if not refresh:
+            cached = self._cached_ref(branch)
+            if cached:
+                return cached
+
+        self._count_ref_lookup()
+        response = await self.request(f"{self.repo_base}/refs/branches/{branch}")
+        response.raise_for_status()
+        commit_hash = self._parse_branch_head(response, branch)
+        self._remember_ref(branch, commit_hash)
+        return commit_hash
+
+    async def create_branch(self, branch_name: str, from_branch: str = "master") -> Dict:
+        """새 브랜치 생성 (기준 브랜치 해시는 항상 새로 조회)"""
+        logger.info(f"브랜치 생성 시작: {branch_name} (기준: {from_branch})")
+        try:
+            target_hash = await self.get_branch_head(from_branch, refresh=True)
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code == 404:
+                logger.error(f"기준 브랜치 '{from_branch}'가 존재하지 않습니다.")
+                raise Exception(f"기준 브랜치 '{from_branch}'를 찾을 수 없습니다.")
+            raise
+
+        response = await self.request(
+            f"{self.repo_base}/refs/branches",
+            method='POST',
+            json={"name": branch_name, "target": {"hash": target_hash}}
+        )
+        response.raise_for_status()
+        logger.info(f"브랜치 생성 완료: {branch_name}")
+        self._remember_ref(branch_name, target_hash)
+
+        try:
+            return response.json() if response.content else {"status": "success", "name": branch_name}
+        except ValueError as e:
+            return {"status": "success", "name": branch_name, "parse_error": str(e)}
+
+    async def _resolve_ref(self, ref: str) -> Optional[str]:
+        """브랜치 이름 → 커밋 해시 (브랜치가 없으면 None)"""
+        if COMMIT_HASH_PATTERN.fullmatch(ref):
+            return ref
+        try:
+            return await self.get_branch_head(ref)
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code == 404:
+                logger.info(f"브랜치가 존재하지 않음: {ref}")
+                return None
+            raise
+
+    async def _fetch_file(self, file_path: str, commit_hash: str) -> Optional[bytes]:
+        cache = get_file_cache()
+        cache_name = f"{self.repo_base}/{commit_hash}/{file_path}"
+        if cache is not None:
+            cached = cache.get(cache_name)
+            if cached is not None:
+                return cached
+
+        response = await self.request(f"{self.repo_base}/src/{commit_hash}/{file_path}")
+        if response.status_code == 404:
+            logger.info(f"파일이 존재하지 않음: {file_path}")
+            return None
+        response.raise_for_status()
+        if cache is not None:
+            cache.put(cache_name, response.content)
+        return response.content
+
+    async def get_file_content_raw(self, file_path: str, branch: str = "master") -> Optional[bytes]:
+        """
+        파일 내용을 바이너리로 가져오기 (커밋 해시 기준, 파일 캐시 공유)
+
+        Args:
+            file_path: 파일 경로
+            branch: 브랜치 이름 또는 커밋 해시
+
+        Returns:
+            파일 내용 (바이트) 또는 None
+        """
+        try:
+            commit_hash = await self._resolve_ref(branch)
+            if commit_hash is None:
+                return None
+            return await self._fetch_file(file_path, commit_hash)
+        except Exception as e:
+            logger.error(f"파일 읽기 실패 (바이너리): {str(e)}")
+            raise
+
+    async def get_files_raw(self, paths: Iterable[str], ref: str = "master") -> FileFetchResult:
+        """
+        여러 파일을 동시에 가져오기 (동시 요청 수는 pool_size로 제한)
+
+        Args:
+            paths: 파일 경로 목록
+            ref: 브랜치 이름 또는 커밋 해시
+
+        Returns:
+            FileFetchResult {경로: 바이트 또는 None}, 경로별 timings/errors 포함
+        """
+        paths = list(dict.fromkeys(paths))
+        commit_hash = ref if COMMIT_HASH_PATTERN.fullmatch(ref) else await self.get_branch_head(ref)
+        result = FileFetchResult(ref, commit_hash)
+
+        async def fetch(path):
+            start = time.perf_counter()
+            try:
+                result[path] = await self._fetch_file(path, commit_hash)
+            except Exception as e:
+                result.errors[path] = e
+            result.timings[path] = time.perf_counter() - start
+
+        await asyncio.gather(*(fetch(path) for path in paths))
+        return result
+
+    async def _post_commit(self, branch: str, message: str, files: Dict[str, Tuple[str, Any, Optional[str]]],
+                           parent_commit: Optional[str] = None):
+        """/src 커밋 요청 (캐시된 부모 해시가 오래되어 409/412면 다시 조회 후 1회 재시도)"""
+        url = f"{self.repo_base}/src"
+        explicit_parent = bool(parent_commit)
+        cached = None
+        refresh = False
+
+        while True:
+            if not explicit_parent:
+                cached = None if refresh else self._cached_ref(branch)
+                parent_commit = cached or await self.get_branch_head(branch, refresh=True)
+
+            body = multipart_stream({'message': message, 'branch': branch, 'parents': parent_commit}, files,
+                                    chunked=self.upload_chunked)
+            response = await self.request(url, method='POST', body=body)
+
+            if response.status_code in STALE_PARENT_STATUS and cached:
+                logger.warning(f"부모 커밋 불일치 (HTTP {response.status_code}): {branch}의 최신 해시를 다시 조회합니다")
+                self.invalidate_ref(branch)
+                refresh = True
+                continue
+            break
+
+        response.raise_for_status()
+        self._update_ref_from_commit(branch, response)
+        return response
+
+    async def commit_file_binary(self, branch: str, file_path: str, content_bytes: bytes,
+                                 message: str, parent_commit: Optional[str] = None) -> Dict:
+        """바이너리 파일 커밋 (인코딩 유지)"""
+        try:
+            response = await self._post_commit(
+                branch, message, {file_path: (file_path, content_bytes, 'application/octet-stream')}, parent_commit
+            )
+            logger.info(f"바이너리 파일 커밋 완료: {file_path} on {branch}")
+            return self._commit_result(response)
+        except Exception as e:
+            logger.error(f"바이너리 파일 커밋 실패: {str(e)}")
+            raise
+
+    async def commit_multiple_files_binary(self, branch: str, file_changes: List[Dict],
+                                           message: str, parent_commit: Optional[str] = None) -> Dict:
+        """
+        여러 바이너리 파일을 한 번에 커밋 (인코딩 유지)
+
+        Args:
+            branch: 브랜치 이름
+            file_changes: [{"path": ..., "content_bytes": b"...", "action": "update"}, ...]
+            message: 커밋 메시지
+            parent_commit: 부모 커밋 해시 (선택사항)
+
+        Returns:
+            커밋 정보
+        """
+        files = self._binary_commit_files(file_changes)
+        if not files:
+            logger.warning("커밋할 파일이 없습니다.")
+            return {}
+
+        try:
+            response = await self._post_commit(branch, message, files, parent_commit)
+            logger.info(f"다중 바이너리 파일 커밋 완료: {len(files)}개 파일 on {branch}")
+            return self._commit_result(response)
+        except Exception as e:
+            logger.error(f"다중 파일 커밋 실패: {str(e)}")
+            raise
+
+    async def create_pull_request(self, source_branch: str, destination_branch: str,
+                                  title: str, description: str) -> Dict:
+        """Pull Request 생성"""
+        try:
+            response = await self.request(
+                f"{self.repo_base}/pullrequests",
+                method='POST',
+                json={
+                    "title": title,
+                    "description": description,
+                    "source": {"branch": {"name": source_branch}},
+                    "destination": {"branch": {"name": destination_branch}},
+                    "close_source_branch": True
+                }
+            )
+            response.raise_for_status()
+            try:
+                pr_data = response.json() if response.content else {"status": "success", "title": title}
+            except ValueError as e:
+                return {"status": "success", "title": title, "parse_error": str(e)}
+            logger.info(f"PR 생성 완료: {pr_data.get('id', 'N/A')} - {title}")
+            return pr_data
+        except Exception as e:
+            logger.error(f"PR 생성 실패: {str(e)}")
+            raise
@@ -0,0 +1,233 @@
+"""
+비동기 LLM 실행 환경
+프로세스 전역 이벤트 루프, 동시 호출 제한(세마포어), 분당 요청/토큰 제한
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    최근 60초 구간의 요청 수(RPM)와 토큰 수(TPM) 제한
+
+    OpenAI와 동일하게 예약 시점에는 (프롬프트 추정 토큰 + max_tokens)를 차감하고,
+    응답을 받으면 실제 사용량으로 보정 (대기 중인 요청은 보정되는 즉시 다시 확인)
+    rpm/tpm이 0이면 해당 제한 없음
+    """
+
+    # 대기 중 재확인 최대 간격 (초)
+    MAX_WAIT_STEP = 1.0
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._events: deque = deque()  # [시각, 토큰]
+        self._lock = asyncio.Lock()
+        self._released = asyncio.Event()  # 예약 토큰이 실제 사용량으로 줄어들면 set
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _purge(self, now: float):
+        while self._events and now - self._events[0][0] >= self.window:
+            self._events.popleft()
+
+    def _used_tokens(self) -> int:
+        return sum(event[1] for event in self._events)
+
+    async def acquire(self, tokens: int) -> List:
+        """
+        요청 1건과 토큰 예약 (제한 초과 시 대기)
+
+        Returns:
+            예약 항목 (record_usage에 전달)
+        """
+        async with self._lock:
+            waited = False
+            start = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._purge(now)
+                requests_ok = not self.rpm or len(self._events) < self.rpm
+                # 한 건이 tpm보다 커도 구간이 비어 있으면 통과 (무한 대기 방지)
+                tokens_ok = not self.tpm or not self._events or self._used_tokens() + tokens <= self.tpm
+                if requests_ok and tokens_ok:
+                    break
+                waited = True
+                # 가장 오래된 예약이 구간을 벗어날 때까지 기다리되, 사용량 보정으로 여유가 생기면 바로 재확인
+                delay = min(max(self._events[0][0] + self.window - now, 0.01), self.MAX_WAIT_STEP)
+                self._released.clear()
+                try:
+                    await asyncio.wait_for(self._released.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            if waited:
+                self.waits += 1
+                self.wait_seconds += time.monotonic() - start
+            event = [time.monotonic(), tokens]
+            self._events.append(event)
+            return event
+
+    def record_usage(self, event: List, actual_tokens: Optional[int]):
+        """예약 토큰을 실제 사용량으로 보정 (런타임 루프에서 호출)"""
+        if actual_tokens is not None:
+            released = actual_tokens < event[1]
+            event[1] = actual_tokens
+            if released:
+                self._released.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """구간 내 요청/토큰과 대기 통계 (다른 스레드에서도 호출하므로 사본으로 계산)"""
+        now = time.monotonic()
+        events = [event for event in list(self._events) if now - event[0] < self.window]
+        return {
+            'rpm_limit': self.rpm,
+            'tpm_limit': self.tpm,
+            'requests_in_window': len(events),
+            'tokens_in_window': sum(event[1] for event in events),
+            'waits': self.waits,
+            'wait_seconds': round(self.wait_seconds, 3),
+        }
+
+
+class LLMRuntime:
+    """
+    전용 스레드에서 도는 이벤트 루프
+
+    AsyncOpenAI 클라이언트의 연결 풀과 세마포어/제한기가 하나의 루프에 묶이도록
+    모든 API 호출을 이 루프에서 실행
+    """
+
+    def __init__(self, max_concurrency: int = 8, rpm: int = 0, tpm: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.limiter = RateLimiter(rpm=rpm, tpm=tpm)
+        self.in_flight = 0
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.loop.run_forever, name='llm-runtime', daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, coro):
+        """
+        코루틴을 런타임 루프에 예약하고 concurrent.futures.Future 반환
+
+        호출한 스레드의 contextvars(이슈별 메트릭 등)를 그대로 이어받아 실행
+        """
+        self._ensure_started()
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+
+        def copy_result(task):
+            if future.cancelled():
+                return
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def start():
+            if not future.set_running_or_notify_cancel():
+                coro.close()
+                return
+            # Task는 생성 시점의 컨텍스트를 복사하므로 호출자 컨텍스트 안에서 생성
+            task = context.run(self.loop.create_task, coro)
+            task.add_done_callback(copy_result)
+
+        self.loop.call_soon_threadsafe(start)
+        return future
+
+    def run(self, coro):
+        """동기 코드에서 코루틴 실행 후 결과 반환"""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("LLM 런타임 루프 안에서는 동기 API를 호출할 수 없습니다")
+        return self.submit(coro).result()
+
+    async def call(self, coro_factory, estimated_tokens: int):
+        """
+        세마포어와 RPM/TPM 제한을 적용하여 API 호출 (런타임 루프에서 실행)
+
+        Args:
+            coro_factory: API 호출 코루틴을 만드는 함수
+            estimated_tokens: 예약할 토큰 수
+
+        Returns:
+            API 응답
+        """
+        async with self.semaphore:
+            event = await self.limiter.acquire(estimated_tokens)
+            self.in_flight += 1
+            try:
+                response = await coro_factory()
+            finally:
+                self.in_flight -= 1
+            usage = getattr(response, 'usage', None)
+            self.limiter.record_usage(event, getattr(usage, 'total_tokens', None))
+            return response
+
+    async def run_on_loop(self, coro):
+        """임의의 이벤트 루프에서 코루틴을 런타임 루프로 넘겨 await"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.limiter.stats()
+        stats['max_concurrency'] = self.max_concurrency
+        stats['in_flight'] = self.in_flight
+        return stats
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_llm_runtime() -> LLMRuntime:
+    """
+    프로세스 공유 LLM 런타임
+
+    LLM_MAX_CONCURRENCY, LLM_RPM_LIMIT, LLM_TPM_LIMIT 환경 변수로 설정
+    """
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = LLMRuntime(
+                    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+                    rpm=int(os.getenv('LLM_RPM_LIMIT', '500')),
+                    tpm=int(os.getenv('LLM_TPM_LIMIT', '150000'))
+                )
+    return _runtime
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: int) -> int:
+    """프롬프트 토큰 추정 (약 4문자당 1토큰) + 최대 응답 토큰"""
+    chars = sum(len(str(message.get('content', ''))) for message in messages)
+    return chars // 4 + max_tokens
@@ -7,18 +7,139 @@ import requests
 import base64
 import json
 import logging
+import os
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from collections import deque
+from fnmatch import fnmatchcase
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
-from functools import wraps
+from app.bitbucket_common import (
+    COMMIT_HASH_PATTERN, IDEMPOTENT_METHODS, STALE_PARENT_STATUS, BitbucketClientBase
+)
+from app.cache_store import BlobStore
+from app.multipart import multipart_stream
+from app.rate_limit import AdaptiveConcurrency, backoff_delay
+from app.metrics import BITBUCKET_CONCURRENCY_LIMIT
 
 logger = logging.getLogger(__name__)
 
+_file_cache = None
+_file_cache_lock = threading.Lock()
 
-class BitbucketAPI:
-    """Bitbucket REST API 클라이언트"""
+
+def get_file_cache() -> Optional[BlobStore]:
+    """
+    커밋 해시 기준 파일 내용 캐시 (프로세스 공유, 디스크 blob 저장소)
+
+    경로@커밋 해시의 내용은 변하지 않으므로 만료 없이 용량 제한(LRU)만 적용
+    BITBUCKET_FILE_CACHE_ENABLED=false이면 None
+    """
+    global _file_cache
+    if os.getenv('BITBUCKET_FILE_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+    if _file_cache is None:
+        with _file_cache_lock:
+            if _file_cache is None:
+                try:
+                    _file_cache = BlobStore(
+                        'bitbucket_files',
+                        max_bytes=int(os.getenv('BITBUCKET_FILE_CACHE_MAX_MB', '512')) * 1024 * 1024
+                    )
+                except OSError as e:
+                    logger.warning(f"파일 캐시 비활성화: {e}")
+                    return None
+    return _file_cache
+
+
+def glob_to_regex(pattern: str) -> 're.Pattern':
+    """
+    경로 glob → 정규식 (``*``/``?``는 '/'를 넘지 않고, ``**``는 여러 디렉토리와 일치)
+
+    예: 'src/wg_*/**/*.cpp'는 'src/wg_db/MatlDB.cpp', 'src/wg_db/sub/a.cpp'와 일치
+    """
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex + r'\Z')
+
+
+def _glob_base(pattern: str) -> str:
+    """glob에서 와일드카드가 나오기 전까지의 디렉토리 (탐색 시작 위치)"""
+    base = []
+    for part in pattern.split('/')[:-1]:
+        if any(ch in part for ch in '*?['):
+            break
+        base.append(part)
+    return '/'.join(base)
+
+
+def _dir_may_match(dir_path: str, pattern: str) -> bool:
+    """디렉토리 아래에 glob과 일치하는 파일이 있을 수 있는지 (없으면 하위 탐색 생략)"""
+    pattern_parts = pattern.split('/')
+    for i, part in enumerate(dir_path.split('/')):
+        if i >= len(pattern_parts) - 1:
+            return '**' in pattern_parts[-1:]
+        if pattern_parts[i] == '**':
+            return True
+        if not fnmatchcase(part, pattern_parts[i]):
+            return False
+    return True
+
+
+def _server_filter(pattern: Optional[str]) -> Optional[str]:
+    """
+    glob의 확장자 조건을 Bitbucket src 목록의 q(BBQL) 필터로 변환
+
+    하위 탐색을 위해 디렉토리는 항상 포함하고, 정확한 일치 여부는 클라이언트에서 다시 확인
+    """
+    if not pattern:
+        return None
+    match = re.fullmatch(r'\*(\.[A-Za-z0-9_]+)', pattern.rsplit('/', 1)[-1])
+    if not match:
+        return None
+    return f'type="commit_directory" OR path ~ "{match.group(1)}"'
+
+
+class FileFetchResult(dict):
+    """
+    get_files_raw 결과 {경로: 바이트 또는 None(파일 없음)}
+
+    조회 중 예외가 난 경로는 매핑에 넣지 않고 errors에 보관
+    """
+
+    def __init__(self, ref: str, commit_hash: str):
+        super().__init__()
+        self.ref = ref
+        self.commit_hash = commit_hash
+        self.timings: Dict[str, float] = {}  # 경로별 소요 시간(초)
+        self.errors: Dict[str, Exception] = {}
+
+
+class BitbucketAPI(BitbucketClientBase):
+    """Bitbucket REST API 클라이언트 (브랜치 해시 캐시/429·쿼터 처리는 BitbucketClientBase 공유)"""
     
-    def __init__(self, url: str, username: str, access_token: str, workspace: str, repository: str):
+    def __init__(self, url: str, username: str, access_token: str, workspace: str, repository: str,
+                 pool_size: Optional[int] = None, ref_cache_ttl: Optional[float] = None,
+                 rate_limit: Optional[float] = None, max_retries: Optional[int] = None):
         self.base_url = url
         self.username = username  # 호환성을 위해 유지하지만 실제로는 사용하지 않음
         self.access_token = access_token
@@ -28,6 +149,88 @@ class BitbucketAPI:
         # API 엔드포인트 설정
         self.api_base = f"{url}/2.0"
         self.repo_base = f"{self.api_base}/repositories/{workspace}/{repository}"
+
+        # 커넥션 풀 설정 (호스트당 최대 연결 수, keep-alive 재사용)
+        if pool_size is None:
+            pool_size = int(os.getenv('BITBUCKET_POOL_SIZE', '10'))
+        self.pool_size = max(1, pool_size)
+        # 모든 스레드가 하나의 어댑터(urllib3 PoolManager)를 공유
+        # pool_block=True: 호스트당 연결 수가 pool_size를 넘지 않도록 대기
+        self._adapter = HTTPAdapter(
+            pool_connections=int(os.getenv('BITBUCKET_POOL_HOSTS', '4')),
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+        # Session(쿠키 저장소 등)은 스레드 안전하지 않으므로 스레드별로 생성
+        self._local = threading.local()
+
+        # 브랜치 해시 캐시, 토큰 버킷, 쿼터, 재시도 설정 (AsyncBitbucketAPI와 공유하는 상태)
+        self._init_client_state(ref_cache_ttl, rate_limit, max_retries)
+        # 429 시 줄어드는 동시 요청 수
+        self._concurrency = AdaptiveConcurrency(self.pool_size)
+
+    def _get_session(self) -> requests.Session:
+        """현재 스레드의 Session 반환 (공유 커넥션 풀 사용)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive'
+            })
+            self._local.session = session
+        return session
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        커넥션 재사용 통계 (핸드셰이크 절감 확인용)
+
+        Returns:
+            요청 수, 새로 연 연결 수, 재사용된 요청 수
+        """
+        connections_opened = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pooled_requests += pool.num_requests
+
+        with self._stats_lock:
+            request_count = self._request_count
+            ref_lookups = self._ref_lookups
+            ref_cache_hits = self._ref_cache_hits
+
+        connections_reused = max(0, pooled_requests - connections_opened)
+        return {
+            'requests': request_count,
+            'connections_opened': connections_opened,
+            'connections_reused': connections_reused,
+            'reuse_ratio': round(connections_reused / pooled_requests, 3) if pooled_requests else 0.0,
+            'pool_size': self.pool_size,
+            'ref_lookups': ref_lookups,
+            'ref_cache_hits': ref_cache_hits,
+            'rate_limit': self.get_rate_limit_stats()
+        }
+
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        호출 제한/쿼터 상태 (모니터링용)
+
+        Returns:
+            서버 쿼터(X-RateLimit-*), 429 횟수, 재시도 횟수, 현재 동시 요청 한도 등
+        """
+        stats = self._rate_limit_snapshot()
+        stats['concurrency_limit'] = self._concurrency.limit
+        return stats
+
+    def close(self):
+        """풀에 열려 있는 연결 정리"""
+        self._adapter.close()
     
     def get_auth_header(self):
         """Bearer 토큰 인증 헤더 생성"""
@@ -40,23 +243,6 @@ class BitbucketAPI:
             headers.update(additional_headers)
         return headers
     
-    def retry_on_failure(self, max_retries=3, delay=1):
-        """요청 실패 시 재시도 데코레이터"""
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                for attempt in range(max_retries):
-                    try:
-                        return func(*args, **kwargs)
-                    except requests.exceptions.RequestException as e:
-                        if attempt == max_retries - 1:
-                            raise e
-                        logger.warning(f"Request failed (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                        time.sleep(delay * (2 ** attempt))  # 지수 백오프
-                return None
-            return wrapper
-        return decorator
-    
     def handle_bitbucket_error(self, response):
         """Bitbucket API 에러 처리"""
         if response.status_code == 401:
@@ -74,27 +260,71 @@ class BitbucketAPI:
         return error_msg
     
     def make_bitbucket_request(self, url, method='GET', **kwargs):
-        """Bitbucket API 요청 메서드 - Bearer Token 전용"""
+        """
+        Bitbucket API 요청 메서드 - Bearer Token 전용
+
+        토큰 버킷과 동시 요청 한도를 거쳐 전송
+        429는 서버가 처리하지 않은 요청이므로 메서드와 관계없이 Retry-After(없으면 지터 백오프)만큼
+        모든 요청을 멈춘 뒤 재시도하고, 5xx/연결 오류는 멱등 요청만 재시도
+        """
         headers = kwargs.pop('headers', {})
         headers.update(self.get_auth_header())
-        
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=30,
-                **kwargs
-            )
-            
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            self._rate_limiter.acquire()
+            self._count_request()
+
+            try:
+                with self._concurrency:
+                    response = self._get_session().request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        timeout=30,
+                        **kwargs
+                    )
+            except requests.exceptions.RequestException as e:
+                if idempotent and attempt < self.max_retries:
+                    delay = backoff_delay(attempt, self.retry_base_delay)
+                    logger.warning(f"요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {str(e)}")
+                    self._count_retry('connection_error')
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                logger.error(f"Bearer Token 요청 실패: {str(e)}")
+                raise
+
+            self._observe_quota(response)
+
+            if response.status_code == 429:
+                delay = self._on_throttled(response, attempt)
+                if delay is not None and attempt < self.max_retries:
+                    logger.warning(f"Bitbucket 호출 한도 초과, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                    self._count_retry('throttled')
+                    attempt += 1
+                    continue  # 다음 acquire()에서 pause가 끝날 때까지 대기
+            elif response.status_code >= 500 and idempotent and attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.retry_base_delay)
+                logger.warning(f"서버 오류 (HTTP {response.status_code}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                self._count_retry('server_error')
+                time.sleep(delay)
+                attempt += 1
+                continue
+            else:
+                self._concurrency.on_success()
+                BITBUCKET_CONCURRENCY_LIMIT.set(self._concurrency.limit)
+
             if not response.ok:
                 self.handle_bitbucket_error(response)
-            
+
             return response
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Bearer Token 요청 실패: {str(e)}")
-            raise
+
+    def _on_concurrency_throttled(self):
+        """429 시 동시 요청 한도 절반으로 축소"""
+        self._concurrency.on_throttle()
+        BITBUCKET_CONCURRENCY_LIMIT.set(self._concurrency.limit)
     
     def validate_token(self):
         """토큰 유효성 검증 (Bearer Token 우선)"""
@@ -122,6 +352,86 @@ class BitbucketAPI:
             logger.error(f"토큰 검증 중 오류: {str(e)}")
             return False, None
     
+    def _fetch_branch_ref(self, branch: str) -> requests.Response:
+        """refs/branches 조회 (조회 횟수 기록)"""
+        self._count_ref_lookup()
+        return self.make_bitbucket_request(f"{self.repo_base}/refs/branches/{branch}")
+
+    def get_branch_head(self, branch: str, refresh: bool = False) -> str:
+        """
+        브랜치 최신 커밋 해시 조회 (TTL 내에서는 캐시 사용)
+
+        Args:
+            branch: 브랜치 이름
+            refresh: True면 캐시를 무시하고 다시 조회
+
+        Returns:
+            커밋 해시
+        """
+        if not refresh:
+            cached = self._cached_ref(branch)
+            if cached:
+                return cached
+
+        response = self._fetch_branch_ref(branch)
+        response.raise_for_status()
+
+        commit_hash = self._parse_branch_head(response, branch)
+        self._remember_ref(branch, commit_hash)
+        return commit_hash
+
+    def _post_commit(self, branch: str, message: str, files: Dict[str, Tuple[str, Any, Optional[str]]],
+                     parent_commit: Optional[str] = None) -> requests.Response:
+        """
+        /src 커밋 요청
+
+        부모 커밋을 지정하지 않으면 캐시된 브랜치 해시를 사용하고,
+        캐시 해시가 오래되어 부모 불일치(409/412)가 나면 다시 조회한 뒤 1회 재시도
+
+        Args:
+            branch: 브랜치 이름
+            message: 커밋 메시지
+            files: {필드 이름: (파일명, 내용 bytes/memoryview/str, Content-Type 또는 None)}
+                본문은 MultipartStream으로 조각 단위 전송 (파일 내용을 복사해 합치지 않음)
+            parent_commit: 부모 커밋 해시 (선택사항)
+
+        Returns:
+            커밋 응답
+        """
+        url = f"{self.repo_base}/src"
+        explicit_parent = bool(parent_commit)
+        cached = None
+        refresh = False
+
+        while True:
+            if not explicit_parent:
+                cached = None if refresh else self._cached_ref(branch)
+                parent_commit = cached or self.get_branch_head(branch, refresh=True)
+
+            data = {
+                'message': message,
+                'branch': branch,
+                'parents': parent_commit
+            }
+            body = multipart_stream(data, files, chunked=self.upload_chunked)
+            response = self.make_bitbucket_request(
+                url,
+                method='POST',
+                data=body,
+                headers={'Content-Type': body.content_type}
+            )
+
+            if response.status_code in STALE_PARENT_STATUS and cached:
+                logger.warning(f"부모 커밋 불일치 (HTTP {response.status_code}): {branch}의 최신 해시를 다시 조회합니다")
+                self.invalidate_ref(branch)
+                refresh = True
+                continue
+            break
+
+        response.raise_for_status()
+        self._update_ref_from_commit(branch, response)
+        return response
+
     def create_branch(self, branch_name: str, from_branch: str = "master") -> Dict:
         """새 브랜치 생성"""
         try:
@@ -132,7 +442,7 @@ class BitbucketAPI:
             ref_url = f"{self.repo_base}/refs/branches/{from_branch}"
             logger.info(f"기준 브랜치 확인 URL: {ref_url}")
             
-            response = self.make_bitbucket_request(ref_url)
+            response = self._fetch_branch_ref(from_branch)
             logger.info(f"기준 브랜치 응답 상태: {response.status_code}")
             
             if response.status_code == 404:
@@ -146,6 +456,7 @@ class BitbucketAPI:
                 branch_data = response.json()
                 target_hash = branch_data['target']['hash']
                 logger.info(f"기준 커밋 해시: {target_hash}")
+                self._remember_ref(from_branch, target_hash)
             except (KeyError, requests.exceptions.JSONDecodeError) as e:
                 logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
                 logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
@@ -169,6 +480,8 @@ class BitbucketAPI:
             response.raise_for_status()
             
             logger.info(f"브랜치 생성 완료: {branch_name}")
+            # 새 브랜치는 기준 커밋을 가리키므로 첫 커밋에서 다시 조회할 필요 없음
+            self._remember_ref(branch_name, target_hash)
             
             # 브랜치 생성 응답 파싱
             try:
@@ -225,15 +538,37 @@ class BitbucketAPI:
         """
         파일 내용을 바이너리로 가져오기 (인코딩 변환 없음)
 
+        브랜치를 커밋 해시로 바꿔 /src/{hash}/{path}를 조회하고,
+        경로@해시는 변하지 않으므로 결과를 파일 캐시에 저장하여 다시 받지 않음
+
         Args:
             file_path: 파일 경로
-            branch: 브랜치 이름
+            branch: 브랜치 이름 또는 커밋 해시
 
         Returns:
             파일 내용 (바이트) 또는 None
         """
         try:
-            url = f"{self.repo_base}/src/{branch}/{file_path}"
+            if COMMIT_HASH_PATTERN.fullmatch(branch):
+                commit_hash = branch
+            else:
+                try:
+                    commit_hash = self.get_branch_head(branch)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        logger.info(f"브랜치가 존재하지 않음: {branch}")
+                        return None
+                    raise
+
+            cache = get_file_cache()
+            cache_name = f"{self.repo_base}/{commit_hash}/{file_path}"
+            if cache is not None:
+                cached = cache.get(cache_name)
+                if cached is not None:
+                    logger.debug(f"파일 캐시 사용: {file_path}@{commit_hash[:12]}")
+                    return cached
+
+            url = f"{self.repo_base}/src/{commit_hash}/{file_path}"
             response = self.make_bitbucket_request(url)
 
             if response.status_code == 404:
@@ -241,6 +576,8 @@ class BitbucketAPI:
                 return None
 
             response.raise_for_status()
+            if cache is not None:
+                cache.put(cache_name, response.content)
             # 바이너리로 반환 (인코딩 변환 안 함)
             return response.content
 
@@ -248,9 +585,57 @@ class BitbucketAPI:
             logger.error(f"파일 읽기 실패 (바이너리): {str(e)}")
             raise
     
+    def get_files_raw(self, paths: Iterable[str], ref: str = "master",
+                      max_workers: Optional[int] = None) -> FileFetchResult:
+        """
+        여러 파일을 제한된 동시성으로 한 번에 가져오기 (바이너리)
+
+        브랜치는 한 번만 커밋 해시로 바꾸므로 모든 파일이 같은 커밋 기준으로 조회됨
+
+        Args:
+            paths: 파일 경로 목록 (중복은 한 번만 조회)
+            ref: 브랜치 이름 또는 커밋 해시
+            max_workers: 동시 조회 수 (기본: BITBUCKET_FETCH_WORKERS, 커넥션 풀 크기 이하)
+
+        Returns:
+            FileFetchResult {경로: 바이트 또는 None}, 경로별 timings/errors 포함
+        """
+        paths = list(dict.fromkeys(paths))
+        commit_hash = ref if COMMIT_HASH_PATTERN.fullmatch(ref) else self.get_branch_head(ref)
+        result = FileFetchResult(ref, commit_hash)
+        if not paths:
+            return result
+
+        if max_workers is None:
+            max_workers = int(os.getenv('BITBUCKET_FETCH_WORKERS', '8'))
+        # 풀 크기를 넘으면 연결을 기다리기만 하므로 풀 크기로 제한
+        workers = max(1, min(max_workers, self.pool_size, len(paths)))
+
+        def fetch(path):
+            start = time.perf_counter()
+            try:
+                return path, self.get_file_content_raw(path, commit_hash), None, time.perf_counter() - start
+            except Exception as e:
+                return path, None, e, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bitbucket-fetch') as executor:
+            for path, content, error, seconds in executor.map(fetch, paths):
+                result.timings[path] = seconds
+                if error is not None:
+                    result.errors[path] = error
+                else:
+                    result[path] = content
+
+        logger.info(
+            f"파일 {len(paths)}개 일괄 조회 완료 ({time.perf_counter() - start:.2f}초, 동시 {workers}개, "
+            f"없음 {sum(1 for content in result.values() if content is None)}개, 실패 {len(result.errors)}개)"
+        )
+        return result
+
     def get_directory_listing(self, path: str = "", branch: str = "master") -> List[Dict]:
         """
-        디렉토리 목록 가져오기
+        디렉토리 목록 가져오기 (next 링크를 따라 모든 페이지 수집)
         
         Args:
             path: 디렉토리 경로 (빈 문자열이면 루트)
@@ -261,25 +646,105 @@ class BitbucketAPI:
         """
         try:
             url = f"{self.repo_base}/src/{branch}/{path}"
-            response = self.make_bitbucket_request(url)
-            response.raise_for_status()
-            
-            # 디렉토리 목록 응답 파싱
-            try:
-                if response.content:
+            values = []
+            while url:
+                response = self.make_bitbucket_request(url)
+                response.raise_for_status()
+
+                # 디렉토리 목록 응답 파싱
+                try:
+                    if not response.content:
+                        logger.warning("디렉토리 목록 응답이 비어있습니다.")
+                        break
                     dir_data = response.json()
-                    return dir_data.get('values', [])
-                else:
-                    logger.warning("디렉토리 목록 응답이 비어있습니다.")
-                    return []
-            except (KeyError, requests.exceptions.JSONDecodeError) as e:
-                logger.error(f"디렉토리 목록 파싱 실패: {str(e)}")
-                logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
-                return []
+                except (KeyError, requests.exceptions.JSONDecodeError) as e:
+                    logger.error(f"디렉토리 목록 파싱 실패: {str(e)}")
+                    logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
+                    break
+                values.extend(dir_data.get('values', []))
+                url = dir_data.get('next')
+            return values
             
         except Exception as e:
             logger.error(f"디렉토리 목록 가져오기 실패: {str(e)}")
             raise
+
+    def _fetch_listing_page(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """src 목록 한 페이지 조회 (디렉토리가 없으면 빈 페이지)"""
+        response = self.make_bitbucket_request(url, params=params)
+        if response.status_code == 404:
+            logger.info(f"디렉토리가 존재하지 않음: {url}")
+            return {'values': []}
+        response.raise_for_status()
+        return response.json() if response.content else {'values': []}
+
+    def walk_tree(self, path: str = "", ref: str = "master", pattern: Optional[str] = None,
+                  include_dirs: bool = False, pagelen: int = 100, prefetch: int = 4) -> Iterator[Dict]:
+        """
+        저장소 트리를 재귀적으로 순회하며 항목을 도착하는 대로 반환 (generator)
+
+        페이지는 next 링크를 따라 필요할 때 가져오고, 현재 페이지를 처리하는 동안
+        다음 페이지와 대기 중인 디렉토리의 첫 페이지를 미리 요청
+        메모리에는 미리 요청한 최대 prefetch개 디렉토리의 페이지와 방문할 디렉토리 경로만 유지
+
+        Args:
+            path: 시작 디렉토리 (비우면 pattern의 고정 접두 디렉토리 또는 루트)
+            ref: 브랜치 이름 또는 커밋 해시 (순회 중 브랜치가 바뀌어도 같은 커밋 기준)
+            pattern: 경로 glob (예: 'src/wg_*/**/*.cpp'), 일치하지 않는 디렉토리는 탐색하지 않음
+            include_dirs: True면 디렉토리 항목도 반환
+            pagelen: 페이지 크기
+            prefetch: 동시에 미리 요청할 디렉토리 수
+
+        Yields:
+            src 목록 항목 (path, type, size 등)
+        """
+        commit_hash = ref if COMMIT_HASH_PATTERN.fullmatch(ref) else self.get_branch_head(ref)
+        matcher = glob_to_regex(pattern) if pattern else None
+        params = {'pagelen': pagelen}
+        server_filter = _server_filter(pattern)
+        if server_filter:
+            params['q'] = server_filter
+
+        def directory_url(dir_path):
+            return f"{self.repo_base}/src/{commit_hash}/{dir_path}/" if dir_path else f"{self.repo_base}/src/{commit_hash}/"
+
+        start = path.strip('/') if path else (_glob_base(pattern) if pattern else '')
+        prefetch = max(1, prefetch)
+        waiting = deque([start])  # 아직 요청하지 않은 디렉토리
+        in_flight = deque()  # (디렉토리, 첫 페이지 future), 최대 prefetch개
+
+        # 현재 디렉토리의 다음 페이지 요청이 막히지 않도록 워커 1개 여유
+        executor = ThreadPoolExecutor(max_workers=prefetch + 1, thread_name_prefix='bitbucket-tree')
+
+        def fill():
+            while waiting and len(in_flight) < prefetch:
+                dir_path = waiting.popleft()
+                in_flight.append((dir_path, executor.submit(self._fetch_listing_page, directory_url(dir_path), params)))
+
+        try:
+            fill()
+            while in_flight:
+                dir_path, page_future = in_flight.popleft()
+                fill()
+                while page_future is not None:
+                    page = page_future.result()
+                    next_url = page.get('next')
+                    # next 링크에 쿼리가 포함되어 있으므로 params는 다시 붙이지 않음
+                    page_future = executor.submit(self._fetch_listing_page, next_url) if next_url else None
+
+                    for entry in page.get('values', []):
+                        entry_path = entry.get('path', '')
+                        if entry.get('type') == 'commit_directory':
+                            if not pattern or _dir_may_match(entry_path, pattern):
+                                waiting.append(entry_path)
+                            if not include_dirs:
+                                continue
+                        if matcher is None or matcher.match(entry_path):
+                            yield entry
+                    fill()
+        finally:
+            # 소비자가 중간에 멈추면 남은 요청은 취소
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def commit_file(self, branch: str, file_path: str, content: str, 
                    message: str, parent_commit: Optional[str] = None) -> Dict:
@@ -297,60 +762,17 @@ class BitbucketAPI:
             커밋 정보
         """
         try:
-            # 부모 커밋이 없으면 현재 브랜치의 최신 커밋을 가져옴
-            if not parent_commit:
-                ref_url = f"{self.repo_base}/refs/branches/{branch}"
-                response = self.make_bitbucket_request(ref_url)
-                response.raise_for_status()
-                
-                # 브랜치 정보 파싱
-                try:
-                    branch_data = response.json()
-                    parent_commit = branch_data['target']['hash']
-                except (KeyError, requests.exceptions.JSONDecodeError) as e:
-                    logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
-                    logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
-                    raise Exception(f"브랜치 '{branch}' 정보를 가져올 수 없습니다")
-            
-            # 파일 커밋
-            url = f"{self.repo_base}/src"
-            
-            # form-data로 전송
-            files = {
-                file_path: (file_path, content)
-            }
-            data = {
-                'message': message,
-                'branch': branch,
-                'parents': parent_commit
-            }
-            
-            response = self.make_bitbucket_request(
-                url,
-                method='POST',
-                data=data,
-                files=files
+            # 파일 커밋 (form-data로 전송, 부모 커밋은 브랜치 해시 캐시 사용)
+            response = self._post_commit(
+                branch, message,
+                {file_path: (file_path, content, None)},
+                parent_commit
             )
-            response.raise_for_status()
             
             # 커밋 응답 파싱
             logger.info(f"파일 커밋 완료: {file_path} on {branch}")
             logger.info(f"커밋 응답 상태: {response.status_code}")
-            
-            try:
-                if response.content:
-                    return response.json()
-                else:
-                    logger.warning("커밋 응답 본문이 비어있습니다.")
-                    return {"status": "success", "message": "Commit successful but no response data"}
-            except requests.exceptions.JSONDecodeError as e:
-                logger.error(f"JSON 파싱 실패: {str(e)}")
-                logger.error(f"Response Content (first 500 chars): {response.text[:500] if response.text else 'Empty'}")
-                return {
-                    "status": "success",
-                    "message": "Commit successful",
-                    "parse_error": str(e)
-                }
+            return self._commit_result(response)
             
         except Exception as e:
             logger.error(f"파일 커밋 실패: {str(e)}")
@@ -372,56 +794,15 @@ class BitbucketAPI:
             커밋 정보
         """
         try:
-            # 부모 커밋이 없으면 현재 브랜치의 최신 커밋을 가져옴
-            if not parent_commit:
-                ref_url = f"{self.repo_base}/refs/branches/{branch}"
-                response = self.make_bitbucket_request(ref_url)
-                response.raise_for_status()
-
-                try:
-                    branch_data = response.json()
-                    parent_commit = branch_data['target']['hash']
-                except (KeyError, requests.exceptions.JSONDecodeError) as e:
-                    logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
-                    raise Exception(f"브랜치 '{branch}' 정보를 가져올 수 없습니다")
-
-            # 파일 커밋
-            url = f"{self.repo_base}/src"
-
-            # BytesIO를 사용하여 바이너리 전송
-            from io import BytesIO
-            files = {
-                file_path: (file_path, BytesIO(content_bytes), 'application/octet-stream')
-            }
-            data = {
-                'message': message,
-                'branch': branch,
-                'parents': parent_commit
-            }
-
-            response = self.make_bitbucket_request(
-                url,
-                method='POST',
-                data=data,
-                files=files
+            # 바이트를 복사하지 않고 그대로 스트리밍 전송
+            response = self._post_commit(
+                branch, message,
+                {file_path: (file_path, content_bytes, 'application/octet-stream')},
+                parent_commit
             )
-            response.raise_for_status()
 
             logger.info(f"바이너리 파일 커밋 완료: {file_path} on {branch}")
-
-            try:
-                if response.content:
-                    return response.json()
-                else:
-                    logger.warning("커밋 응답 본문이 비어있습니다.")
-                    return {"status": "success", "message": "Commit successful but no response data"}
-            except requests.exceptions.JSONDecodeError as e:
-                logger.error(f"JSON 파싱 실패: {str(e)}")
-                return {
-                    "status": "success",
-                    "message": "Commit successful",
-                    "parse_error": str(e)
-                }
+            return self._commit_result(response)
 
         except Exception as e:
             logger.error(f"바이너리 파일 커밋 실패: {str(e)}")
@@ -449,31 +830,8 @@ class BitbucketAPI:
             커밋 정보
         """
         try:
-            # 부모 커밋이 없으면 현재 브랜치의 최신 커밋을 가져옴
-            if not parent_commit:
-                ref_url = f"{self.repo_base}/refs/branches/{branch}"
-                response = self.make_bitbucket_request(ref_url)
-                response.raise_for_status()
-                
-                # 브랜치 정보 파싱
-                try:
-                    branch_data = response.json()
-                    parent_commit = branch_data['target']['hash']
-                except (KeyError, requests.exceptions.JSONDecodeError) as e:
-                    logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
-                    logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
-                    raise Exception(f"브랜치 '{branch}' 정보를 가져올 수 없습니다")
-
-            # 여러 파일 커밋
-            url = f"{self.repo_base}/src"
-
             # 파일들을 form-data로 준비
             files = {}
-            data = {
-                'message': message,
-                'branch': branch,
-                'parents': parent_commit
-            }
 
             for file_change in file_changes:
                 file_path = file_change['path']
@@ -487,45 +845,18 @@ class BitbucketAPI:
                 else:
                     # 파일 생성/수정
                     content = file_change['content']
-                    files[file_path] = (file_path, content)
+                    files[file_path] = (file_path, content, None)
 
             if not files:
                 logger.warning("커밋할 파일이 없습니다.")
                 return {}
 
-            response = self.make_bitbucket_request(
-                url,
-                method='POST',
-                data=data,
-                files=files
-            )
-            response.raise_for_status()
+            response = self._post_commit(branch, message, files, parent_commit)
+
+            logger.info(f"커밋 응답 상태: {response.status_code}")
+            logger.info(f"응답 크기: {len(response.content) if response.content else 0} bytes")
+            commit_data = self._commit_result(response)
 
-            # 응답 파싱 시 에러 처리 강화
-            try:
-                logger.info(f"커밋 응답 상태: {response.status_code}")
-                logger.info(f"응답 Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
-                logger.info(f"응답 크기: {len(response.content) if response.content else 0} bytes")
-                
-                if response.content:
-                    commit_data = response.json()
-                    logger.info(f"JSON 파싱 성공: {len(str(commit_data))} characters")
-                else:
-                    logger.warning("커밋 응답 본문이 비어있습니다.")
-                    commit_data = {"status": "success", "message": "Commit successful but no response data"}
-            except requests.exceptions.JSONDecodeError as e:
-                logger.error(f"JSON 파싱 실패: {str(e)}")
-                logger.error(f"Response Status: {response.status_code}")
-                logger.error(f"Response Headers: {dict(response.headers)}")
-                logger.error(f"Response Content (first 500 chars): {response.text[:500] if response.text else 'Empty'}")
-                # 커밋은 성공했으므로 기본 정보 반환
-                commit_data = {
-                    "status": "success",
-                    "message": "Commit successful",
-                    "parse_error": str(e),
-                    "status_code": response.status_code
-                }
-            
             file_names = list(files.keys())
             logger.info(f"다중 파일 커밋 완료: {len(file_names)}개 파일 on {branch}")
             logger.info(f"커밋된 파일들: {', '.join(file_names[:5])}{'...' if len(file_names) > 5 else ''}")
@@ -558,80 +889,18 @@ class BitbucketAPI:
             커밋 정보
         """
         try:
-            # 부모 커밋이 없으면 현재 브랜치의 최신 커밋을 가져옴
-            if not parent_commit:
-                ref_url = f"{self.repo_base}/refs/branches/{branch}"
-                response = self.make_bitbucket_request(ref_url)
-                response.raise_for_status()
-
-                try:
-                    branch_data = response.json()
-                    parent_commit = branch_data['target']['hash']
-                except (KeyError, requests.exceptions.JSONDecodeError) as e:
-                    logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
-                    raise Exception(f"브랜치 '{branch}' 정보를 가져올 수 없습니다")
-
-            # 여러 파일 커밋
-            url = f"{self.repo_base}/src"
-
-            # 바이너리 파일들 준비
-            from io import BytesIO
-            files = {}
-            data = {
-                'message': message,
-                'branch': branch,
-                'parents': parent_commit
-            }
-
-            for file_change in file_changes:
-                file_path = file_change['path']
-                content_bytes = file_change.get('content_bytes')
-                action = file_change.get('action', 'update')
-
-                if action == 'delete':
-                    logger.warning(f"파일 삭제는 현재 미지원: {file_path}")
-                    continue
-
-                if content_bytes is None:
-                    logger.warning(f"파일 내용 없음: {file_path}")
-                    continue
-
-                # 바이너리로 전송
-                files[file_path] = (
-                    file_path,
-                    BytesIO(content_bytes),
-                    'application/octet-stream'
-                )
+            # 바이너리 파일들 준비 (삭제/내용 없는 항목 제외)
+            files = self._binary_commit_files(file_changes)
 
             if not files:
                 logger.warning("커밋할 파일이 없습니다.")
                 return {}
 
-            response = self.make_bitbucket_request(
-                url,
-                method='POST',
-                data=data,
-                files=files
-            )
-            response.raise_for_status()
+            # 바이너리로 전송 (파일 수와 관계없이 본문을 메모리에 만들지 않고 스트리밍)
+            response = self._post_commit(branch, message, files, parent_commit)
 
-            # 응답 파싱
-            try:
-                logger.info(f"커밋 응답 상태: {response.status_code}")
-                if response.content:
-                    commit_data = response.json()
-                    logger.info(f"JSON 파싱 성공")
-                else:
-                    logger.warning("커밋 응답 본문이 비어있습니다.")
-                    commit_data = {"status": "success", "message": "Commit successful but no response data"}
-            except requests.exceptions.JSONDecodeError as e:
-                logger.error(f"JSON 파싱 실패: {str(e)}")
-                commit_data = {
-                    "status": "success",
-                    "message": "Commit successful",
-                    "parse_error": str(e),
-                    "status_code": response.status_code
-                }
+            logger.info(f"커밋 응답 상태: {response.status_code}")
+            commit_data = self._commit_result(response)
 
             file_names = list(files.keys())
             logger.info(f"다중 바이너리 파일 커밋 완료: {len(file_names)}개 파일 on {branch}")
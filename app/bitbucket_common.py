@@ -0,0 +1,253 @@
+"""
+Bitbucket 클라이언트 공통 로직 (BitbucketAPI / AsyncBitbucketAPI 공유)
+전송 계층(requests/httpx)과 무관한 브랜치 해시 캐시, 429/쿼터 처리, 커밋 응답 해석
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.rate_limit import QuotaTracker, TokenBucket, backoff_delay, parse_retry_after
+from app.metrics import BITBUCKET_QUOTA_REMAINING, BITBUCKET_RETRIES, BITBUCKET_THROTTLED
+
+logger = logging.getLogger(__name__)
+
+# 커밋 시 부모 해시가 브랜치 최신 커밋과 다를 때 Bitbucket이 반환하는 상태 코드
+STALE_PARENT_STATUS = (409, 412)
+
+COMMIT_HASH_PATTERN = re.compile(r'[0-9a-fA-F]{40}')
+
+# 같은 요청을 다시 보내도 결과가 같은 메서드 (5xx/연결 오류 시 재시도 대상)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+class BitbucketClientBase:
+    """
+    동기/비동기 Bitbucket 클라이언트가 공유하는 상태와 판단 로직
+
+    응답 객체는 headers/content/json()만 사용하므로 requests.Response와 httpx.Response 모두 지원
+    실제 전송과 대기(time.sleep/asyncio.sleep)는 각 클라이언트가 담당
+    """
+
+    def _init_client_state(self, ref_cache_ttl: Optional[float] = None, rate_limit: Optional[float] = None,
+                           max_retries: Optional[int] = None):
+        """
+        브랜치 해시 캐시와 호출 제한 상태 초기화 (각 클라이언트의 __init__에서 호출)
+
+        Args:
+            ref_cache_ttl: 브랜치 해시 캐시 유지 시간(초, 0이면 사용 안 함)
+            rate_limit: 초당 요청 수 (0이면 제한 없음)
+            max_retries: 재시도 횟수
+        """
+        self._stats_lock = threading.Lock()
+        self._request_count = 0
+
+        # 브랜치 최신 커밋 해시 캐시 (브랜치 생성/커밋 응답으로 갱신, 0이면 사용 안 함)
+        if ref_cache_ttl is None:
+            ref_cache_ttl = float(os.getenv('BITBUCKET_REF_CACHE_TTL', '60'))
+        self.ref_cache_ttl = ref_cache_ttl
+        self._ref_cache: Dict[str, Tuple[str, float]] = {}
+        self._ref_lock = threading.Lock()
+        self._ref_lookups = 0
+        self._ref_cache_hits = 0
+
+        # 호출 제한: 토큰 버킷(초당 요청 수, 0이면 제한 없음) + 서버 쿼터(X-RateLimit-*)
+        if rate_limit is None:
+            rate_limit = float(os.getenv('BITBUCKET_RATE_LIMIT', '10'))
+        self.rate_limit = rate_limit
+        self._rate_limiter = TokenBucket(rate_limit, capacity=float(os.getenv('BITBUCKET_RATE_BURST', '40')))
+        self._quota = QuotaTracker()
+        if max_retries is None:
+            max_retries = int(os.getenv('BITBUCKET_MAX_RETRIES', '3'))
+        self.max_retries = max_retries
+        self.retry_base_delay = float(os.getenv('BITBUCKET_RETRY_BASE_DELAY', '1'))
+        # Retry-After가 이보다 길면 기다리지 않고 실패 처리 (작업 워커가 오래 멈추지 않도록)
+        self.max_retry_wait = float(os.getenv('BITBUCKET_MAX_RETRY_WAIT', '120'))
+        self._throttled = 0
+        self._retries = 0
+        # 커밋 본문을 Content-Length 대신 Transfer-Encoding: chunked로 전송
+        self.upload_chunked = os.getenv('BITBUCKET_UPLOAD_CHUNKED', 'false').lower() == 'true'
+
+    def _count_request(self):
+        with self._stats_lock:
+            self._request_count += 1
+
+    def _count_retry(self, reason: str):
+        with self._stats_lock:
+            self._retries += 1
+        BITBUCKET_RETRIES.inc(reason=reason)
+
+    def _count_ref_lookup(self):
+        with self._stats_lock:
+            self._ref_lookups += 1
+
+    def _rate_limit_snapshot(self) -> Dict[str, Any]:
+        """서버 쿼터(X-RateLimit-*), 429 횟수, 재시도 횟수, 요청 속도/대기 시간"""
+        stats = self._quota.snapshot()
+        with self._stats_lock:
+            stats['throttled'] = self._throttled
+            stats['retries'] = self._retries
+        stats['request_rate'] = self._rate_limiter.rate
+        stats['paused_seconds'] = round(self._rate_limiter.paused_seconds, 1)
+        stats['wait_seconds'] = round(self._rate_limiter.wait_seconds, 3)
+        return stats
+
+    def _on_concurrency_throttled(self):
+        """429 시 동시 요청 수 조절 (동시성 제어 방식이 다르므로 각 클라이언트에서 재정의)"""
+        pass
+
+    def _on_throttled(self, response, attempt: int) -> Optional[float]:
+        """
+        429 처리: 동시 요청 수를 줄이고 모든 요청을 대기 시간만큼 멈춤
+
+        Returns:
+            대기 시간(초), Retry-After가 max_retry_wait보다 길면 None (재시도하지 않음)
+        """
+        with self._stats_lock:
+            self._throttled += 1
+        BITBUCKET_THROTTLED.inc()
+        self._on_concurrency_throttled()
+
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self._quota.seconds_to_reset() if self._quota.remaining == 0 else None
+        if delay is None:
+            delay = backoff_delay(attempt, self.retry_base_delay)
+        if delay > self.max_retry_wait:
+            logger.error(f"Bitbucket 호출 한도 초과: {delay:.0f}초 후에 다시 시도해야 합니다")
+            return None
+
+        self._rate_limiter.pause(delay)
+        return delay
+
+    def _observe_quota(self, response):
+        """X-RateLimit-* 헤더로 쿼터를 갱신하고 남은 쿼터에 맞춰 요청 속도 조절"""
+        if not self._quota.update(response.headers):
+            return
+
+        remaining = self._quota.remaining
+        limit = self._quota.limit
+        reset_in = self._quota.seconds_to_reset()
+        if remaining is not None:
+            BITBUCKET_QUOTA_REMAINING.set(remaining)
+
+        if remaining is not None and remaining <= 0 and reset_in:
+            # 쿼터 소진: 초기화 시점까지 멈춤 (너무 길면 이후 429에서 실패 처리)
+            self._rate_limiter.pause(min(reset_in, self.max_retry_wait))
+        elif reset_in and remaining is not None and (
+                self._quota.near_limit or (limit and remaining < limit * 0.1)):
+            # 쿼터가 얼마 남지 않으면 초기화 시점까지 남은 호출을 고르게 분배
+            paced_rate = max(remaining / reset_in, 0.01)
+            if self.rate_limit > 0:
+                paced_rate = min(paced_rate, self.rate_limit)
+            if paced_rate != self._rate_limiter.rate:
+                logger.warning(f"Bitbucket 쿼터 {remaining}/{limit} 남음: 초당 {paced_rate:.2f}회로 조절")
+                self._rate_limiter.set_rate(paced_rate)
+        elif self._rate_limiter.rate != self.rate_limit:
+            self._rate_limiter.set_rate(self.rate_limit)
+
+    def _remember_ref(self, branch: str, commit_hash: Optional[str]):
+        """브랜치 최신 커밋 해시 캐시에 기록"""
+        if not commit_hash or self.ref_cache_ttl <= 0:
+            return
+        with self._ref_lock:
+            self._ref_cache[branch] = (commit_hash, time.monotonic() + self.ref_cache_ttl)
+
+    def _cached_ref(self, branch: str) -> Optional[str]:
+        """만료되지 않은 캐시 해시 반환 (없으면 None)"""
+        with self._ref_lock:
+            entry = self._ref_cache.get(branch)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._ref_cache[branch]
+                return None
+        with self._stats_lock:
+            self._ref_cache_hits += 1
+        return entry[0]
+
+    def invalidate_ref(self, branch: Optional[str] = None):
+        """
+        브랜치 해시 캐시 무효화
+
+        Args:
+            branch: 브랜치 이름 (None이면 전체)
+        """
+        with self._ref_lock:
+            if branch is None:
+                self._ref_cache.clear()
+            else:
+                self._ref_cache.pop(branch, None)
+
+    @staticmethod
+    def _parse_branch_head(response, branch: str) -> str:
+        """refs/branches 응답에서 커밋 해시 추출 (형식이 다르면 예외)"""
+        try:
+            return response.json()['target']['hash']
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"브랜치 정보 파싱 실패: {str(e)}")
+            logger.error(f"응답 내용: {response.text[:200] if response.text else 'Empty'}")
+            raise Exception(f"브랜치 '{branch}' 정보를 가져올 수 없습니다")
+
+    def _update_ref_from_commit(self, branch: str, response):
+        """커밋 응답(Location 헤더 또는 본문의 hash)으로 브랜치 해시 캐시 갱신"""
+        commit_hash = None
+        match = re.search(r'/commit/([0-9a-fA-F]{7,40})', response.headers.get('Location', ''))
+        if match:
+            commit_hash = match.group(1)
+        elif response.content:
+            try:
+                body = response.json()
+                if isinstance(body, dict):
+                    commit_hash = body.get('hash')
+            except ValueError:
+                pass
+
+        if commit_hash:
+            self._remember_ref(branch, commit_hash)
+        else:
+            # 새 커밋 해시를 알 수 없으면 다음 커밋에서 다시 조회
+            self.invalidate_ref(branch)
+
+    @staticmethod
+    def _commit_result(response) -> Dict:
+        """커밋 응답 본문 (비어 있거나 JSON이 아니어도 커밋은 성공한 것으로 처리)"""
+        try:
+            if response.content:
+                return response.json()
+            logger.warning("커밋 응답 본문이 비어있습니다.")
+            return {"status": "success", "message": "Commit successful but no response data"}
+        except ValueError as e:
+            logger.error(f"JSON 파싱 실패: {str(e)}")
+            return {
+                "status": "success",
+                "message": "Commit successful",
+                "parse_error": str(e),
+                "status_code": response.status_code
+            }
+
+    @staticmethod
+    def _binary_commit_files(file_changes: List[Dict]) -> Dict[str, Tuple[str, Any, Optional[str]]]:
+        """
+        file_changes → multipart 파일 필드 (삭제/내용 없는 항목은 건너뜀)
+
+        Args:
+            file_changes: [{"path": ..., "content_bytes": b"...", "action": "update"}, ...]
+
+        Returns:
+            {경로: (파일명, 내용, Content-Type)}
+        """
+        files = {}
+        for file_change in file_changes:
+            file_path = file_change['path']
+            if file_change.get('action', 'update') == 'delete':
+                logger.warning(f"파일 삭제는 현재 미지원: {file_path}")
+                continue
+            if file_change.get('content_bytes') is None:
+                logger.warning(f"파일 내용 없음: {file_path}")
+                continue
+            files[file_path] = (file_path, file_change['content_bytes'], 'application/octet-stream')
+        return files
@@ -0,0 +1,331 @@
+"""
+2단계 캐시 저장소 (메모리 LRU + 디스크)
+Clang 함수 추출 결과 등 재계산 비용이 큰 결과를 프로세스/재시작 간 재사용
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+
+
+def make_cache_key(*parts: Any) -> str:
+    """여러 값을 하나의 안정적인 해시 키로 변환"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def content_hash(content) -> str:
+    """문자열/바이트 내용의 SHA-256 해시"""
+    if isinstance(content, str):
+        content = content.encode('utf-8', errors='surrogatepass')
+    return hashlib.sha256(content).hexdigest()
+
+
+class LRUCache:
+    """스레드 안전한 메모리 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> int:
+        """값 저장 후 밀려난 항목 수 반환"""
+        evicted = 0
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    디렉토리 기반 바이트 캐시 (크기 제한 LRU)
+
+    키별로 파일 하나를 저장하고, 읽을 때 mtime을 갱신하여
+    용량 초과 시 가장 오래 사용되지 않은 파일부터 삭제
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = self._scan_size()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _scan_size(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"캐시 파일 읽기 실패 ({path}): {e}")
+            return None
+
+        try:
+            os.utime(path, None)  # LRU 순서 갱신
+        except OSError:
+            pass
+        return data
+
+    def set(self, key: str, data: bytes) -> int:
+        """데이터 저장 후 용량 초과로 삭제된 파일 수 반환"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"캐시 파일 저장 실패 ({path}): {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return 0
+
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+        return self._evict_if_needed()
+
+    def delete(self, key: str):
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _evict_if_needed(self) -> int:
+        if not self.max_bytes:
+            return 0
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return 0
+
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith('.tmp'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            # 여유를 두고 최대 용량의 90%까지 정리
+            target = int(self.max_bytes * 0.9)
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                    evicted += 1
+                except OSError:
+                    pass
+            self._total_bytes = total
+        if evicted:
+            logger.info(f"디스크 캐시 정리: {evicted}개 삭제 ({self.directory})")
+        return evicted
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class TieredCache:
+    """
+    메모리 LRU + 디스크 2단계 JSON 캐시
+
+    메모리에 없으면 디스크에서 읽어 메모리로 승격
+    ttl(초)이 지나면 만료된 항목으로 간주
+    """
+
+    def __init__(self, namespace: str, directory: Optional[str] = None,
+                 memory_entries: int = 64, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, use_disk: bool = True):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = LRUCache(memory_entries)
+        self.disk = None
+        if use_disk:
+            try:
+                self.disk = DiskCache(
+                    os.path.join(directory or DEFAULT_CACHE_DIR, namespace),
+                    max_bytes=max_bytes
+                )
+            except OSError as e:
+                logger.warning(f"디스크 캐시 비활성화 ({namespace}): {e}")
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            if not self._expired(entry['t']):
+                self._count('memory_hits')
+                return entry['v']
+            self.memory.delete(key)
+
+        if self.disk is not None:
+            raw = self.disk.get(key)
+            if raw is not None:
+                try:
+                    entry = json.loads(raw.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    entry = None
+                if entry is not None and not self._expired(entry['t']):
+                    self.memory.set(key, entry)
+                    self._count('disk_hits')
+                    return entry['v']
+                self.disk.delete(key)
+
+        self._count('misses')
+        return None
+
+    def set(self, key: str, value: Any):
+        entry = {'t': time.time(), 'v': value}
+        evicted = self.memory.set(key, entry)
+        if self.disk is not None:
+            data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+            evicted += self.disk.set(key, data)
+        self._count('writes')
+        if evicted:
+            self._count('evictions', evicted)
+
+    def clear_memory(self):
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 3) if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        stats['disk_bytes'] = self.disk.total_bytes if self.disk is not None else 0
+        return stats
+
+
+class BlobStore:
+    """
+    내용 주소 기반 바이트 저장소 (디스크, 크기 제한 LRU)
+
+    blob은 내용의 SHA-256으로 저장하고, 변하지 않는 이름(예: 경로@커밋 해시)은
+    blob 해시를 가리키는 작은 참조로 저장하여 같은 내용은 한 번만 보관
+    """
+
+    def __init__(self, namespace: str, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.namespace = namespace
+        self.disk = DiskCache(os.path.join(directory or DEFAULT_CACHE_DIR, namespace), max_bytes=max_bytes)
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def get(self, name: str) -> Optional[bytes]:
+        """이름으로 blob 조회 (참조나 blob이 정리되었으면 None)"""
+        ref_key = make_cache_key('ref', name)
+        digest = self.disk.get(ref_key)
+        if digest is not None:
+            digest = digest.decode('ascii', errors='replace')
+            data = self.disk.get(digest)
+            if data is not None and content_hash(data) == digest:
+                self._count('hits')
+                return data
+            # blob이 먼저 정리되었거나 손상된 경우
+            self.disk.delete(ref_key)
+            if data is not None:
+                self.disk.delete(digest)
+
+        self._count('misses')
+        return None
+
+    def put(self, name: str, data: bytes) -> str:
+        """
+        blob 저장 후 이름이 blob을 가리키도록 기록
+
+        Returns:
+            blob 해시 (SHA-256)
+        """
+        digest = content_hash(data)
+        evicted = 0
+        if self.disk.get(digest) is None:
+            evicted += self.disk.set(digest, data)
+        evicted += self.disk.set(make_cache_key('ref', name), digest.encode('ascii'))
+        self._count('writes')
+        if evicted:
+            self._count('evictions', evicted)
+        return digest
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['disk_bytes'] = self.disk.total_bytes
+        return stats
@@ -7,122 +7,445 @@ C++17 완전 지원
 import re
 import logging
 import os
-import tempfile
+import time
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
 from typing import List, Dict, Optional, Tuple
+from app.cache_store import TieredCache, content_hash, make_cache_key
 
 logger = logging.getLogger(__name__)
 
-
-class ClangASTChunker:
-    """Clang AST를 사용한 정확한 코드 분석 (내용 기반 매칭)"""
-
-    def __init__(self):
+# C++17 파싱 옵션 (MFC 매크로/타입을 단순 정의로 대체)
+CLANG_PARSE_ARGS = [
+    '-x', 'c++',
+    '-std=c++17',
+    '-DWINDOWS',
+    '-D_UNICODE',
+    '-DUNICODE',
+    '-DBOOL=int',
+    '-DTRUE=1',
+    '-DFALSE=0',
+    '-DOUT=',
+    '-DIN=',
+    '-DAFX_EXT_CLASS=',
+    '-DAFX_DATA=',
+    '-D__declspec(x)=',
+    '-DWORD=unsigned int',
+    '-DDWORD=unsigned long',
+    '-DLPCTSTR=const char*',
+    '-DLPCSTR=const char*',
+    '-DLPWSTR=wchar_t*',
+    '-DHANDLE=void*',
+    '-DT_UNIT_INDEX=int',
+    '-DT_MATL_LIST_STEEL=void*',
+    '-DCString=void*',
+    '-DCStringArray=void*',
+    '-D_ALLOW_COMPILER_AND_STL_VERSION_MISMATCH',
+    '-Wno-everything',
+    '-nostdinc++',
+    '-nobuiltininc',
+    '-fms-extensions',
+    '-fms-compatibility',
+    '-fsyntax-only',
+]
+
+# unsaved_files로 넘기는 가상 소스 경로 (디스크에 쓰지 않음, 커서 파일 비교에도 사용)
+CLANG_VIRTUAL_SOURCE = 'sdb_agent_input.cpp'
+
+# 함수 추출 결과 형식/알고리즘이 바뀌면 올려서 기존 캐시 무효화
+EXTRACTION_CACHE_VERSION = 4
+
+# 구문 검사는 에러를 모두 받아야 수정 전/후 비교가 가능 (기본 제한 20개 해제)
+CLANG_SYNTAX_ARGS = CLANG_PARSE_ARGS + ['-ferror-limit=0']
+
+# 스레드별로 재파싱(reparse)용으로 유지하는 번역 단위 상한 (수정 전/후 한 쌍이면 충분, 0이면 유지 안 함)
+# 번역 단위는 파일 크기의 수 배 메모리를 쓰므로 상한 x 파일 파이프라인 스레드 수만큼 상주할 수 있음
+LIVE_TRANSLATION_UNITS = int(os.getenv('CLANG_SYNTAX_LIVE_TUS', '2'))
+
+_function_cache = None
+_function_cache_lock = threading.Lock()
+
+
+def get_function_cache():
+    """
+    Clang 함수 추출 결과 캐시 (프로세스 공유, 메모리 LRU + 디스크)
+
+    CLANG_CACHE_ENABLED=false이면 None
+    """
+    global _function_cache
+    if os.getenv('CLANG_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+    if _function_cache is None:
+        with _function_cache_lock:
+            if _function_cache is None:
+                _function_cache = TieredCache(
+                    'clang_functions',
+                    memory_entries=int(os.getenv('CLANG_CACHE_MEMORY_ENTRIES', '16')),
+                    max_bytes=int(os.getenv('CLANG_CACHE_MAX_MB', '256')) * 1024 * 1024
+                )
+    return _function_cache
+
+
+_libclang = None
+_libclang_loaded = False
+_libclang_init_seconds = None
+_libclang_lock = threading.Lock()
+
+
+def load_libclang():
+    """
+    libclang 로드 (프로세스당 1회, 첫 사용 시점에 호출)
+
+    Returns:
+        clang.cindex 모듈 또는 사용 불가 시 None
+    """
+    global _libclang, _libclang_loaded, _libclang_init_seconds
+    if _libclang_loaded:
+        return _libclang
+
+    with _libclang_lock:
+        if _libclang_loaded:
+            return _libclang
+        start = time.perf_counter()
+        _libclang = _probe_libclang()
+        _libclang_init_seconds = time.perf_counter() - start
+        _libclang_loaded = True
+        logger.info(f"libclang 초기화 완료: {_libclang_init_seconds * 1000:.0f}ms "
+                    f"({'사용 가능' if _libclang else '사용 불가, 정규식 폴백'})")
+    return _libclang
+
+
+def _probe_libclang():
+    """운영체제별 libclang 라이브러리 경로 설정 후 clang.cindex 반환"""
+    try:
+        import clang.cindex
+        import platform
+        import os
+        
+        logger.info(f"운영체제: {platform.system()}")
+        
+        # DLL이 이미 설정되었는지 확인 (중복 설정 방지)
+        library_already_loaded = False
         try:
-            import clang.cindex
-            import platform
-            import os
-            
-            logger.info(f"운영체제: {platform.system()}")
-            
-            # DLL이 이미 설정되었는지 확인 (중복 설정 방지)
-            library_already_loaded = False
-            try:
-                # Index를 생성해서 라이브러리가 이미 로드되었는지 테스트
-                test_index = clang.cindex.Index.create()
-                library_already_loaded = True
-                logger.info("✅ libclang 라이브러리 이미 로드됨")
-            except:
-                pass
-            
-            # 라이브러리가 아직 로드되지 않은 경우에만 경로 설정
-            if not library_already_loaded:
-                # 운영체제별 라이브러리 경로 설정
-                if platform.system() == 'Windows':
-                    # 방법 1: pip install libclang의 내장 DLL 찾기
-                    try:
-                        import clang
-                        pkg_dir = os.path.dirname(clang.__file__)
-                        
-                        # 가능한 DLL 위치들
-                        possible_internal_paths = [
-                            os.path.join(pkg_dir, 'native', 'libclang.dll'),
-                            os.path.join(pkg_dir, 'cindex', 'libclang.dll'),
-                            os.path.join(pkg_dir, 'libclang.dll'),
+            # Index를 생성해서 라이브러리가 이미 로드되었는지 테스트
+            test_index = clang.cindex.Index.create()
+            library_already_loaded = True
+            logger.info("✅ libclang 라이브러리 이미 로드됨")
+        except:
+            pass
+        
+        # 라이브러리가 아직 로드되지 않은 경우에만 경로 설정
+        if not library_already_loaded:
+            # 운영체제별 라이브러리 경로 설정
+            if platform.system() == 'Windows':
+                # 방법 1: pip install libclang의 내장 DLL 찾기
+                try:
+                    import clang
+                    pkg_dir = os.path.dirname(clang.__file__)
+                    
+                    # 가능한 DLL 위치들
+                    possible_internal_paths = [
+                        os.path.join(pkg_dir, 'native', 'libclang.dll'),
+                        os.path.join(pkg_dir, 'cindex', 'libclang.dll'),
+                        os.path.join(pkg_dir, 'libclang.dll'),
+                    ]
+                    
+                    logger.info(f"Python clang 패키지 경로: {pkg_dir}")
+                    
+                    dll_found = False
+                    for dll_path in possible_internal_paths:
+                        if os.path.exists(dll_path):
+                            logger.info(f"DLL 발견: {dll_path}")
+                            try:
+                                clang.cindex.Config.set_library_file(dll_path)
+                                dll_found = True
+                                logger.info(f"✅ DLL 설정 성공: {dll_path}")
+                                break
+                            except Exception as e:
+                                logger.debug(f"DLL 설정 실패 ({dll_path}): {e}")
+                    
+                    # 방법 2: 시스템 LLVM 경로 시도
+                    if not dll_found:
+                        logger.info("패키지 내장 DLL 없음. 시스템 LLVM 경로 시도...")
+                        possible_system_paths = [
+                            r'C:\Program Files\LLVM\bin\libclang.dll',
+                            r'C:\Program Files (x86)\LLVM\bin\libclang.dll',
                         ]
                         
-                        logger.info(f"Python clang 패키지 경로: {pkg_dir}")
-                        
-                        dll_found = False
-                        for dll_path in possible_internal_paths:
-                            if os.path.exists(dll_path):
-                                logger.info(f"DLL 발견: {dll_path}")
+                        for lib_path in possible_system_paths:
+                            if os.path.exists(lib_path):
+                                logger.info(f"파일 존재: {lib_path}")
                                 try:
-                                    clang.cindex.Config.set_library_file(dll_path)
+                                    clang.cindex.Config.set_library_file(lib_path)
                                     dll_found = True
-                                    logger.info(f"✅ DLL 설정 성공: {dll_path}")
+                                    logger.info(f"✅ DLL 설정 성공: {lib_path}")
                                     break
                                 except Exception as e:
-                                    logger.debug(f"DLL 설정 실패 ({dll_path}): {e}")
-                        
-                        # 방법 2: 시스템 LLVM 경로 시도
-                        if not dll_found:
-                            logger.info("패키지 내장 DLL 없음. 시스템 LLVM 경로 시도...")
-                            possible_system_paths = [
-                                r'C:\Program Files\LLVM\bin\libclang.dll',
-                                r'C:\Program Files (x86)\LLVM\bin\libclang.dll',
-                            ]
-                            
-                            for lib_path in possible_system_paths:
-                                if os.path.exists(lib_path):
-                                    logger.info(f"파일 존재: {lib_path}")
-                                    try:
-                                        clang.cindex.Config.set_library_file(lib_path)
-                                        dll_found = True
-                                        logger.info(f"✅ DLL 설정 성공: {lib_path}")
-                                        break
-                                    except Exception as e:
-                                        logger.debug(f"DLL 설정 실패 ({lib_path}): {e}")
+                                    logger.debug(f"DLL 설정 실패 ({lib_path}): {e}")
+                    
+                    if not dll_found:
+                        logger.info("DLL 경로 미설정. 자동 탐지 모드...")
                         
-                        if not dll_found:
-                            logger.info("DLL 경로 미설정. 자동 탐지 모드...")
-                            
-                    except Exception as e:
-                        logger.debug(f"Windows DLL 경로 설정 중 오류: {e}")
-                        logger.info("자동 탐지 모드로 계속 진행...")
-                else:
-                    # Linux/Mac
+                except Exception as e:
+                    logger.debug(f"Windows DLL 경로 설정 중 오류: {e}")
+                    logger.info("자동 탐지 모드로 계속 진행...")
+            else:
+                # Linux/Mac
+                try:
+                    clang.cindex.Config.set_library_path('/usr/lib/llvm-14/lib')
+                except:
                     try:
-                        clang.cindex.Config.set_library_path('/usr/lib/llvm-14/lib')
+                        clang.cindex.Config.set_library_file('libclang.so')
                     except:
-                        try:
-                            clang.cindex.Config.set_library_file('libclang.so')
-                        except:
-                            pass
-                    
-            self.index = clang.cindex.Index.create()
-            self.CursorKind = clang.cindex.CursorKind
-            self.TranslationUnit = clang.cindex.TranslationUnit
-            self.Diagnostic = clang.cindex.Diagnostic
-            self.available = True
-            logger.info("✅ Clang AST Parser 초기화 완료 (C++17 지원, 내용 기반 매칭)")
-        except ImportError:
-            logger.warning("libclang 미설치. 정규식 기반으로 폴백됩니다.")
-            logger.warning("설치: pip install libclang")
-            self.available = False
-        except Exception as e:
-            logger.error(f"Clang AST Parser 초기화 실패: {e}. 정규식 기반으로 폴백됩니다.")
-            logger.error(f"상세 오류 타입: {type(e).__name__}")
-            import traceback
-            logger.error(f"스택 트레이스:\n{traceback.format_exc()}")
-            self.available = False
+                        pass
+                
+        clang.cindex.Index.create()
+        logger.info("✅ Clang AST Parser 초기화 완료 (C++17 지원, 내용 기반 매칭)")
+        return clang.cindex
+    except ImportError:
+        logger.warning("libclang 미설치. 정규식 기반으로 폴백됩니다.")
+        logger.warning("설치: pip install libclang")
+        return None
+    except Exception as e:
+        logger.error(f"Clang AST Parser 초기화 실패: {e}. 정규식 기반으로 폴백됩니다.")
+        logger.error(f"상세 오류 타입: {type(e).__name__}")
+        import traceback
+        logger.error(f"스택 트레이스:\n{traceback.format_exc()}")
+        return None
+
+
+# 중괄호 깊이 계산용 토큰: 주석/문자열/문자 리터럴은 통째로 건너뛰고 '{', '}'만 의미 있음
+_BRACE_TOKEN_PATTERN = re.compile(
+    r'//[^\n]*'                                  # 한 줄 주석
+    r'|/\*.*?(?:\*/|\Z)'                          # 블록 주석 (닫히지 않으면 파일 끝까지)
+    r'|R"(?P<delim>[^()\\\s]{0,16})\(.*?\)(?P=delim)"'  # raw 문자열
+    r'|"(?:\\.|[^"\\\n])*"'                      # 문자열
+    r"|'(?:\\.|[^'\\\n])*'"                      # 문자 리터럴
+    r'|[{}]',
+    re.DOTALL
+)
+
+
+# 선언부와 본문 사이 주석 (본문 없는 선언 판별 시 제외)
+_COMMENT_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+# 구문 검사 시 빈 줄로 바꾸는 #include (헤더가 없으면 fatal 에러로 이후 진단이 모두 생략됨)
+_INCLUDE_PATTERN = re.compile(r'^[ \t]*#[ \t]*include\b[^\n]*', re.MULTILINE)
+
 
-    def extract_functions(self, content: str, file_path: str = None) -> List[Dict]:
+def function_matches(func_name: str, targets: List[str]) -> bool:
+    """함수 이름이 대상 목록과 매칭되는지 (부분 문자열 양방향 비교)"""
+    return any(target in func_name or func_name in target for target in targets)
+
+
+def new_syntax_errors(before: Optional[Dict], after: Optional[Dict]) -> List[Dict]:
+    """
+    수정 후 새로 생긴 구문 에러 (라인은 수정으로 밀리므로 메시지 개수로 비교)
+
+    Args:
+        before: 수정 전 check_syntax 결과
+        after: 수정 후 check_syntax 결과
+
+    Returns:
+        수정 전보다 늘어난 메시지의 에러 리스트 (검사 결과가 없으면 빈 리스트)
+    """
+    if not before or not after:
+        return []
+    remaining = {}
+    for error in before['errors']:
+        remaining[error['message']] = remaining.get(error['message'], 0) + 1
+
+    added = []
+    for error in after['errors']:
+        if remaining.get(error['message'], 0) > 0:
+            remaining[error['message']] -= 1
+        else:
+            added.append(error)
+    return added
+
+
+def scan_brace_depths(lines: List[str]) -> Tuple[array, array]:
+    """
+    토크나이저 한 번으로 줄별 중괄호 깊이와 짝 정보 계산 (주석/문자열 안의 중괄호 무시)
+
+    Args:
+        lines: 원본 파일의 줄 리스트
+
+    Returns:
+        (depth, close_of) - 1-based 인덱스의 array('i')
+        depth[n]: n번째 줄 끝의 중괄호 깊이
+        close_of[n]: n번째 줄의 (가장 바깥) '{'와 짝인 '}' 줄 (없으면 0)
+    """
+    content = '\n'.join(lines)
+    count = len(lines)
+    depth = array('i', bytes(4 * (count + 2)))
+    close_of = array('i', bytes(4 * (count + 2)))
+    # line_starts[n]: n+1번째 줄의 시작 오프셋 (중괄호 위치 → 줄 번호는 이분 탐색)
+    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    stack = []
+    filled = 1  # depth가 기록되지 않은 첫 줄
+
+    for token in _BRACE_TOKEN_PATTERN.finditer(content):
+        text = token.group()
+        if text != '{' and text != '}':
+            continue  # 주석/문자열
+        number = bisect_right(line_starts, token.start())
+        if number > filled:
+            # 이전 줄들은 현재 깊이로 끝남
+            depth[filled:number] = array('i', [len(stack)]) * (number - filled)
+            filled = number
+        if text == '{':
+            stack.append(number)
+        elif stack:
+            # 같은 줄에서 여는 중괄호가 여러 개면 마지막에 닫히는 가장 바깥 짝이 남음
+            close_of[stack.pop()] = number
+    if count + 1 > filled:
+        depth[filled:count + 1] = array('i', [len(stack)]) * (count + 1 - filled)
+
+    return depth, close_of
+
+
+class FunctionBoundaryIndex:
+    """
+    원본 파일 한 번 순회로 만든 함수 경계 색인
+
+    - 중괄호: scan_brace_depths 결과로 줄별 깊이와 '{' 줄 → 짝 '}' 줄을 O(1) 조회
+    - 시그니처: (클래스, 함수 이름) → 시그니처가 있는 줄 목록 (폴백 조회 시 한 번 생성)
+    파일 전체를 선형 시간에 처리하며, 함수마다 파일을 처음부터 다시 훑지 않음
+    """
+
+    SIGNATURE_PATTERN = re.compile(r'^\s*\w+.*?\s+(?:(\w+)::)?(~?\w+)\s*\(')
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self._signatures: Optional[Dict[Tuple[Optional[str], str], List[int]]] = None
+        self.depth, self._close_of = scan_brace_depths(lines)
+
+        # 줄 → 그 줄 이후 첫 '{' 줄 (짝이 있는 것만)
+        self._first_open = array('i', bytes(4 * (len(lines) + 2)))
+        next_open = 0
+        for number in range(len(lines), 0, -1):
+            if self._close_of[number]:
+                next_open = number
+            self._first_open[number] = next_open
+
+    def depth_at(self, line: int) -> int:
+        """line 끝의 중괄호 깊이 (1-based, 범위 밖이면 0)"""
+        return self.depth[line] if 1 <= line <= len(self.lines) else 0
+
+    def function_end(self, line_start: int) -> Optional[int]:
+        """line_start 이후 첫 '{'의 짝 '}' 줄 (1-based)"""
+        if not 1 <= line_start <= len(self.lines):
+            return None
+        open_line = self._first_open[line_start]
+        return self._close_of[open_line] if open_line else None
+
+    def body_end(self, line: int, column: int) -> Optional[int]:
+        """
+        선언부가 (line, column)에서 끝나는 함수의 본문 끝 줄 (본문 없는 선언이면 None)
+
+        본문을 건너뛴 파싱에서는 커서 extent가 선언부까지만이므로 이후 첫 '{'의 짝으로 계산
+        선언부와 '{' 사이에 ';'가 있으면 본문 없는 선언 (= default, = 0 포함)
+
+        Args:
+            line: 선언부 끝 줄 (1-based)
+            column: 선언부 끝 열 (libclang 기준 1-based 바이트 위치)
+        """
+        if not 1 <= line <= len(self.lines):
+            return None
+        open_line = self._first_open[line]
+        if not open_line:
+            return None
+
+        rest = self.lines[line - 1].encode('utf-8')[max(column - 1, 0):].decode('utf-8', 'ignore')
+        gap = _COMMENT_PATTERN.sub('', '\n'.join([rest] + self.lines[line:open_line]))
+        if ';' in gap.split('{', 1)[0]:
+            return None
+        return self._close_of[open_line]
+
+    def is_function_extent(self, line_start: int, line_end: int) -> bool:
+        """커서 extent를 원본 라인으로 옮긴 값이 실제 함수 범위인지 확인"""
+        if not 1 <= line_start <= line_end <= len(self.lines):
+            return False
+        return self.function_end(line_start) == line_end
+
+    def find_signature(self, class_name: Optional[str], func_name: str, near: Optional[int] = None) -> Optional[int]:
+        """
+        시그니처 줄 조회 (후보가 여러 개면 near에 가장 가까운 줄)
+
+        Returns:
+            1-based 줄 번호 또는 None
+        """
+        if self._signatures is None:
+            # 시그니처 색인은 extent가 맞지 않을 때만 필요하므로 처음 조회할 때 생성
+            self._signatures = {}
+            for number, line in enumerate(self.lines, 1):
+                match = self.SIGNATURE_PATTERN.match(line)
+                if match:
+                    self._signatures.setdefault((match.group(1), match.group(2)), []).append(number)
+
+        candidates = self._signatures.get((class_name, func_name))
+        if not candidates and class_name is None:
+            # 클래스 안에 정의된 인라인 메서드 등은 이름만으로 조회
+            candidates = [line for (cls, name), lines in self._signatures.items() if name == func_name for line in lines]
+        if not candidates:
+            return None
+        if near is None:
+            return candidates[0]
+        return min(candidates, key=lambda line: abs(line - near))
+
+
+class ClangASTChunker:
+    """Clang AST를 사용한 정확한 코드 분석 (내용 기반 매칭)"""
+
+    def __init__(self):
+        # libclang 로드와 Index 생성은 첫 사용 시점까지 지연 (워커 기동 비용 제거)
+        # Index는 스레드별로 하나씩 만들어 재사용 (공유 인스턴스를 여러 파이프라인 스레드가 동시에 사용)
+        self._local = threading.local()
+
+    @property
+    def available(self) -> bool:
+        return load_libclang() is not None
+
+    @property
+    def index(self):
+        index = getattr(self._local, 'index', None)
+        if index is None:
+            cindex = load_libclang()
+            if cindex is None:
+                return None
+            index = self._local.index = cindex.Index.create()
+        return index
+
+    @property
+    def CursorKind(self):
+        return load_libclang().CursorKind
+
+    @property
+    def TranslationUnit(self):
+        return load_libclang().TranslationUnit
+
+    @property
+    def Diagnostic(self):
+        return load_libclang().Diagnostic
+
+    def extract_functions(self, content: str, file_path: str = None,
+                          targets: Optional[List[str]] = None) -> List[Dict]:
         """
         Clang AST로 함수 추출 (내용 기반 매칭 - 개선됨)
 
+        CLANG_FAST_PARSE=true(기본)이면 2단계로 처리
+        1) 함수 본문을 건너뛰고(PARSE_SKIP_FUNCTION_BODIES) 선언만 따라가며 함수 테이블 생성
+           (본문 범위는 중괄호 색인으로 계산하므로 라인 정확도는 동일)
+        2) targets에 매칭되는 함수만 원본 라인에서 본문(content) 복원
+
         Args:
             content: 원본 파일 내용
             file_path: 파일 경로 (선택적)
+            targets: 본문을 채울 함수 이름 목록 (None이면 전체, 매칭되지 않은 함수에는 'content' 없음)
 
         Returns:
             함수 정보 리스트 (정확한 라인 번호 포함)
@@ -131,62 +454,74 @@ class ClangASTChunker:
             logger.info("Clang AST 사용 불가. 정규식 폴백")
             return []
 
+        # 0. 캐시 확인 (내용 해시 + 파싱 옵션 기준, 내용이 바뀌면 자동 무효화)
+        cached = self.get_cached_table(content)
+        if cached is not None:
+            return self._materialize_cached_functions(cached, content.splitlines(), targets)
+
+        functions = self.extract_function_table(content, file_path)
+        if functions is None:
+            return []
+
+        # 함수 테이블만 캐시 (본문은 원본 라인에서 복원)
+        self.store_table(content, functions)
+        return self._materialize_cached_functions(functions, content.splitlines(), targets)
+
+    def _cache_key(self, content: str) -> str:
+        fast_parse = os.getenv('CLANG_FAST_PARSE', 'true').lower() == 'true'
+        return make_cache_key(EXTRACTION_CACHE_VERSION, content_hash(content), CLANG_PARSE_ARGS, fast_parse)
+
+    def get_cached_table(self, content: str) -> Optional[List[Dict]]:
+        """캐시된 함수 테이블 (본문 없음, 캐시 비활성/미스면 None)"""
+        cache = get_function_cache()
+        if cache is None:
+            return None
+        cached = cache.get(self._cache_key(content))
+        if cached is not None:
+            logger.info(f"Clang 함수 추출 캐시 적중: {len(cached)}개 함수")
+        return cached
+
+    def store_table(self, content: str, functions: List[Dict]):
+        """함수 테이블 캐시 저장 (캐시 비활성이면 무시)"""
+        cache = get_function_cache()
+        if cache is not None:
+            cache.set(self._cache_key(content), functions)
+
+    def extract_function_table(self, content: str, file_path: str = None) -> Optional[List[Dict]]:
+        """
+        캐시 없이 파싱해서 함수 테이블 생성 (본문 'content' 없음, 프로세스 풀 워커에서도 호출)
+
+        Args:
+            content: 원본 파일 내용
+            file_path: 파일 경로 (선택적)
+
+        Returns:
+            함수 정보 리스트 또는 파싱 실패 시 None
+        """
+        fast_parse = os.getenv('CLANG_FAST_PARSE', 'true').lower() == 'true'
+
         try:
             # 1. 원본 파일의 줄별 매핑 생성
             original_lines = content.splitlines()
             logger.debug(f"원본 파일: {len(original_lines)}줄")
             
-            # 2. 코드 전처리 (클래스 전방 선언 추가)
-            preprocessed_content = self._preprocess_code_for_parsing(content)
-            preprocessed_lines = preprocessed_content.splitlines()
-            logger.debug(f"전처리 후: {len(preprocessed_lines)}줄 (추가: {len(preprocessed_lines) - len(original_lines)}줄)")
-
-            # 3. 임시 파일 생성 및 파싱
-            with tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.cpp',
-                delete=False,
-                encoding='utf-8'
-            ) as tmp:
-                tmp.write(preprocessed_content)
-                tmp_path = tmp.name
-
-            # C++17 파싱 옵션
-            args = [
-                '-x', 'c++',
-                '-std=c++17',
-                '-DWINDOWS',
-                '-D_UNICODE',
-                '-DUNICODE',
-                '-DBOOL=int',
-                '-DTRUE=1',
-                '-DFALSE=0',
-                '-DOUT=',
-                '-DIN=',
-                '-DAFX_EXT_CLASS=',
-                '-DAFX_DATA=',
-                '-D__declspec(x)=',
-                '-DWORD=unsigned int',
-                '-DDWORD=unsigned long',
-                '-DLPCTSTR=const char*',
-                '-DLPCSTR=const char*',
-                '-DLPWSTR=wchar_t*',
-                '-DHANDLE=void*',
-                '-DT_UNIT_INDEX=int',
-                '-DT_MATL_LIST_STEEL=void*',
-                '-DCString=void*',
-                '-DCStringArray=void*',
-                '-D_ALLOW_COMPILER_AND_STL_VERSION_MISMATCH',
-                '-Wno-everything',
-                '-nostdinc++',
-                '-nobuiltininc',
-                '-fms-extensions',
-                '-fms-compatibility',
-                '-fsyntax-only',
-            ]
-
-            # 4. Clang AST 파싱
-            tu = self.index.parse(tmp_path, args=args)
+            # 2. 코드 전처리 (클래스 전방 선언 추가), 앞에 붙인 줄 수만큼 커서 라인을 보정
+            prelude = self._build_parse_prelude(content)
+            preprocessed_content = prelude + content
+            line_offset = prelude.count('\n')
+            logger.debug(f"전처리 후 추가된 줄: {line_offset}줄")
+            boundary_index = FunctionBoundaryIndex(original_lines)
+
+            # 3. Clang AST 파싱 (임시 파일 없이 메모리 내용을 가상 경로로 전달)
+            options = 0
+            if fast_parse:
+                options = self.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES | self.TranslationUnit.PARSE_INCOMPLETE
+            tu = self.index.parse(
+                CLANG_VIRTUAL_SOURCE,
+                args=CLANG_PARSE_ARGS,
+                unsaved_files=[(CLANG_VIRTUAL_SOURCE, preprocessed_content)],
+                options=options
+            )
 
             # 파싱 에러 확인
             error_count = 0
@@ -204,33 +539,23 @@ class ClangASTChunker:
                 if error_count > 5:
                     logger.warning(f"  ... 외 {error_count - 5}개 더")
 
-            # 5. 함수 추출 및 원본 파일에서 매칭
+            # 4. 함수 추출 및 원본 파일에서 매칭 (본문 없이 함수 테이블만)
             functions = []
-            for cursor in tu.cursor.walk_preorder():
-                if cursor.kind in [self.CursorKind.FUNCTION_DECL, self.CursorKind.CXX_METHOD]:
-                    if cursor.is_definition() and cursor.location.file:
-                        # 임시 파일 경로 확인
-                        cursor_file_abs = os.path.abspath(cursor.location.file.name)
-                        tmp_path_abs = os.path.abspath(tmp_path)
-                        
-                        if cursor_file_abs == tmp_path_abs:
-                            # 6. 원본 파일에서 함수 위치 찾기 (내용 기반 매칭)
-                            func_info = self._find_and_extract_function(
-                                cursor, 
-                                original_lines
-                            )
-                            
-                            if func_info:
-                                functions.append(func_info)
-                                logger.info(f"✅ {func_info['name']}: 라인 {func_info['line_start']}-{func_info['line_end']}")
-                            else:
-                                logger.warning(f"❌ {cursor.spelling}: 원본에서 찾지 못함")
-
-            # 임시 파일 삭제
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            for cursor, line_range in self._iter_function_definitions(tu, line_offset, boundary_index, fast_parse):
+                # 5. 원본 파일에서 함수 위치 찾기 (내용 기반 매칭)
+                func_info = self._find_and_extract_function(
+                    cursor,
+                    original_lines,
+                    line_offset,
+                    boundary_index,
+                    line_range
+                )
+
+                if func_info:
+                    functions.append(func_info)
+                    logger.info(f"✅ {func_info['name']}: 라인 {func_info['line_start']}-{func_info['line_end']}")
+                else:
+                    logger.warning(f"❌ {cursor.spelling}: 원본에서 찾지 못함")
 
             logger.info(f"Clang AST로 {len(functions)}개 함수 추출 완료")
             return functions
@@ -239,82 +564,219 @@ class ClangASTChunker:
             logger.error(f"Clang AST 파싱 실패: {e}")
             import traceback
             logger.error(f"스택 트레이스:\n{traceback.format_exc()}")
-            return []
+            return None
 
-    def _find_and_extract_function(self, cursor, original_lines: list) -> Optional[Dict]:
+    def _iter_function_definitions(self, tu, line_offset: int, boundary_index: 'FunctionBoundaryIndex',
+                                   fast_parse: bool):
+        """
+        입력 소스에 정의된 함수 커서와 원본 기준 (시작, 끝) 라인 반환
+
+        fast_parse면 본문이 없는 AST이므로 네임스페이스/클래스 선언만 따라 내려가고
+        본문 범위는 boundary_index로 계산 (본문 없는 선언은 제외), 아니면 전체 AST 순회
+
+        Yields:
+            (cursor, (line_start, line_end) 또는 None - None이면 extent로 계산)
+        """
+        function_kinds = (self.CursorKind.FUNCTION_DECL, self.CursorKind.CXX_METHOD)
+
+        if not fast_parse:
+            for cursor in tu.cursor.walk_preorder():
+                if cursor.kind in function_kinds and cursor.is_definition() and cursor.location.file:
+                    # 입력 소스에 정의된 함수만 (가상 경로 그대로 반환되므로 문자열 비교로 충분)
+                    if cursor.location.file.name == CLANG_VIRTUAL_SOURCE:
+                        yield cursor, None
+            return
+
+        container_kinds = tuple(
+            getattr(self.CursorKind, name) for name in
+            ('NAMESPACE', 'CLASS_DECL', 'STRUCT_DECL', 'CLASS_TEMPLATE', 'LINKAGE_SPEC', 'UNEXPOSED_DECL')
+            if hasattr(self.CursorKind, name)
+        )
+        # 소스 순서를 유지하도록 자식 iterator 스택으로 순회
+        pending = [iter(tu.cursor.get_children())]
+        while pending:
+            cursor = next(pending[-1], None)
+            if cursor is None:
+                pending.pop()
+                continue
+            if cursor.kind in container_kinds:
+                pending.append(iter(cursor.get_children()))
+                continue
+            if cursor.kind not in function_kinds or not cursor.location.file:
+                continue
+            if cursor.location.file.name != CLANG_VIRTUAL_SOURCE:
+                continue
+
+            # 전처리로 붙인 클래스 스텁 안의 선언은 원본 범위 밖
+            line_start = cursor.extent.start.line - line_offset
+            if line_start < 1:
+                continue
+            end = cursor.extent.end
+            line_end = boundary_index.body_end(end.line - line_offset, end.column)
+            if line_end:
+                yield cursor, (line_start, line_end)
+
+    def _materialize_cached_functions(self, cached: List[Dict], original_lines: list,
+                                      targets: Optional[List[str]] = None) -> List[Dict]:
+        """
+        함수 테이블에 원본 라인으로 함수 본문 복원
+
+        Args:
+            cached: 본문 없는 함수 테이블 (캐시 또는 방금 추출한 결과)
+            original_lines: 원본 파일의 줄 리스트
+            targets: 본문을 채울 함수 이름 목록 (None이면 전체)
+        """
+        functions = []
+        for entry in cached:
+            func = dict(entry)
+            if targets is None or function_matches(func['name'], targets):
+                func['content'] = '\n'.join(original_lines[func['line_start']-1:func['line_end']])
+            functions.append(func)
+        return functions
+
+    def check_syntax(self, content: str, base_content: Optional[str] = None) -> Optional[Dict]:
+        """
+        Clang 구문 검사 (diff 적용 후 검증용, 함수 본문까지 전체 파싱)
+
+        base_content의 번역 단위가 현재 스레드에 남아 있으면 새로 파싱하지 않고
+        tu.reparse로 수정된 내용만 다시 반영 (같은 파일을 조금씩 고치는 경우)
+        결과는 내용 해시로 캐시하므로 같은 내용은 다시 파싱하지 않음
+
+        #include는 빈 줄로 바꿔서 파싱 (라인 번호는 유지, 헤더 누락 fatal 에러가 이후 진단을 가리지 않도록)
+
+        Args:
+            content: 검사할 내용
+            base_content: 수정 전 내용 (선택적, 재파싱 기준)
+
+        Returns:
+            {'error_count': 에러 수, 'errors': [{'line': 원본 라인 또는 None, 'message': 메시지}],
+             'reparsed': reparse 사용 여부}
+            또는 libclang 사용 불가/파싱 실패 시 None
+        """
+        if not self.available:
+            return None
+
+        cache = get_function_cache()
+        key = content_hash(content)
+        cache_key = make_cache_key('syntax', EXTRACTION_CACHE_VERSION, key, CLANG_SYNTAX_ARGS)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, reparsed=False)
+
+        source = _INCLUDE_PATTERN.sub('', content)
+        prelude = self._build_parse_prelude(source)
+        unsaved_files = [(CLANG_VIRTUAL_SOURCE, prelude + source)]
+
+        live = getattr(self._local, 'translation_units', None)
+        if live is None:
+            live = self._local.translation_units = OrderedDict()
+
+        reparsed = False
+        try:
+            tu = live.pop(key, None)
+            if tu is None and base_content is not None:
+                tu = live.pop(content_hash(base_content), None)
+                if tu is not None:
+                    tu.reparse(unsaved_files=unsaved_files)
+                    reparsed = True
+            if tu is None:
+                tu = self.index.parse(
+                    CLANG_VIRTUAL_SOURCE,
+                    args=CLANG_SYNTAX_ARGS,
+                    unsaved_files=unsaved_files,
+                    options=self.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE
+                )
+        except Exception as e:
+            logger.error(f"Clang 구문 검사 실패: {e}")
+            return None
+
+        # 다음 수정에서 reparse할 수 있도록 최근 번역 단위만 유지 (상한을 넘으면 오래된 것부터 해제)
+        live[key] = tu
+        while live and len(live) > LIVE_TRANSLATION_UNITS:
+            live.popitem(last=False)
+
+        line_offset = prelude.count('\n')
+        errors = []
+        for diag in tu.diagnostics:
+            if diag.severity < self.Diagnostic.Error:
+                continue
+            line = None
+            if diag.location.file and diag.location.file.name == CLANG_VIRTUAL_SOURCE:
+                line = diag.location.line - line_offset
+            errors.append({'line': line if line and line >= 1 else None, 'message': diag.spelling})
+
+        result = {'error_count': len(errors), 'errors': errors, 'reparsed': reparsed}
+        logger.info(f"Clang 구문 검사: 에러 {len(errors)}개 ({'reparse' if reparsed else 'parse'})")
+        if cache is not None:
+            cache.set(cache_key, result)
+        return result
+
+    def release_translation_units(self) -> int:
+        """
+        현재 스레드가 reparse용으로 유지하던 번역 단위 해제
+
+        Returns:
+            해제한 번역 단위 수
+        """
+        live = getattr(self._local, 'translation_units', None)
+        if not live:
+            return 0
+        released = len(live)
+        live.clear()
+        return released
+
+    def cache_stats(self) -> Dict:
+        """함수 추출 캐시 적중/미스 통계"""
+        cache = get_function_cache()
+        return cache.stats() if cache is not None else {}
+
+    def _find_and_extract_function(self, cursor, original_lines: list, line_offset: int = 0,
+                                   boundary_index: Optional['FunctionBoundaryIndex'] = None,
+                                   line_range: Optional[Tuple[int, int]] = None) -> Optional[Dict]:
         """
         Clang cursor로부터 함수 정보 추출 후 원본 파일에서 정확한 위치 찾기
-        
+
+        커서 extent의 라인에서 전처리로 앞에 붙인 줄 수(line_offset)를 빼서 원본 라인으로 바로 변환
+        (오버로드/같은 이름의 함수도 각자 위치로 매핑), extent가 원본과 맞지 않으면
+        한 번만 만들어 둔 시그니처 → 라인 색인으로 폴백
+
         Args:
             cursor: Clang AST cursor
             original_lines: 원본 파일의 줄 리스트
-            
+            line_offset: 전처리로 원본 앞에 추가된 줄 수
+            boundary_index: 원본 파일의 FunctionBoundaryIndex (없으면 생성)
+            line_range: 이미 계산된 원본 기준 (시작, 끝) 라인 (본문을 건너뛴 파싱)
+
         Returns:
-            함수 정보 딕셔너리 (원본 파일 기준 라인 번호 포함)
+            함수 정보 딕셔너리 (원본 파일 기준 라인 번호 포함, 본문 'content'는 호출부에서 복원)
         """
         try:
             func_name = cursor.spelling
             if not func_name:
                 return None
-            
-            # 1. 함수 시그니처 패턴 생성
-            # 클래스 메서드인 경우: ClassName::MethodName
+
             class_name = self._get_class_name(cursor)
-            if class_name:
-                # 클래스::메서드 패턴
-                signature_pattern = re.compile(
-                    rf'^\s*\w+.*\s+{re.escape(class_name)}::{re.escape(func_name)}\s*\(',
-                    re.MULTILINE
-                )
+            if boundary_index is None:
+                boundary_index = FunctionBoundaryIndex(original_lines)
+
+            # 1. 커서 extent → 원본 라인
+            extent_start = cursor.extent.start.line - line_offset
+            extent_end = cursor.extent.end.line - line_offset
+            if line_range:
+                line_start, line_end = line_range
+            elif boundary_index.is_function_extent(extent_start, extent_end):
+                line_start, line_end = extent_start, extent_end
             else:
-                # 일반 함수 패턴
-                signature_pattern = re.compile(
-                    rf'^\s*\w+.*\s+{re.escape(func_name)}\s*\(',
-                    re.MULTILINE
-                )
-            
-            # 2. 원본 파일에서 함수 시그니처 찾기
-            line_start = None
-            line_end = None
-            
-            for i, line in enumerate(original_lines):
-                if signature_pattern.search(line):
-                    line_start = i + 1  # 1-based
-                    logger.debug(f"[{func_name}] 시그니처 발견: 라인 {line_start}")
-                    
-                    # 3. 중괄호 카운팅으로 함수 끝 찾기
-                    brace_count = 0
-                    found_opening_brace = False
-                    
-                    for j in range(i, len(original_lines)):
-                        line_content = original_lines[j]
-                        
-                        # 간단한 중괄호 카운팅 (문자열/주석 내 중괄호도 카운트됨)
-                        # 더 정교한 파싱이 필요하면 개선 가능
-                        for char in line_content:
-                            if char == '{':
-                                brace_count += 1
-                                found_opening_brace = True
-                            elif char == '}':
-                                brace_count -= 1
-                        
-                        # 함수가 완전히 닫힘
-                        if found_opening_brace and brace_count == 0:
-                            line_end = j + 1  # 1-based
-                            logger.debug(f"[{func_name}] 함수 끝 발견: 라인 {line_end}")
-                            break
-                    
-                    if line_end:
-                        break
-            
+                # 2. 폴백: 시그니처 색인 (extent 위치에 가장 가까운 후보)
+                line_start = boundary_index.find_signature(class_name, func_name, near=extent_start)
+                line_end = boundary_index.function_end(line_start) if line_start else None
+
             if not line_start or not line_end:
                 logger.warning(f"[{func_name}] 원본에서 함수를 찾지 못함")
                 return None
             
-            # 4. 함수 내용 추출
-            func_content = '\n'.join(original_lines[line_start-1:line_end])
-            
-            # 5. 추가 메타데이터 추출
+            # 4. 추가 메타데이터 추출
             try:
                 return_type = cursor.result_type.spelling if cursor.result_type else ''
             except:
@@ -336,14 +798,13 @@ class ClangASTChunker:
             except:
                 signature = func_name
             
-            # 6. 결과 반환
+            # 5. 결과 반환
             return {
                 'name': func_name,
                 'qualified_name': cursor.displayname if hasattr(cursor, 'displayname') else func_name,
                 'signature': signature,
                 'line_start': line_start,
                 'line_end': line_end,
-                'content': func_content,
                 'return_type': return_type,
                 'is_method': cursor.kind == self.CursorKind.CXX_METHOD,
                 'is_static': cursor.is_static_method() if hasattr(cursor, 'is_static_method') else False,
@@ -390,8 +851,14 @@ class ClangASTChunker:
         문제: 클래스 멤버 함수만 있는 코드 (예: CMatlDB::GetSteelList)
         해결: 클래스 선언과 메서드 스텁 자동 추가
         """
-        import re
+        return self._build_parse_prelude(content) + content
 
+    def _build_parse_prelude(self, content: str) -> str:
+        """
+        원본 앞에 붙일 클래스 선언 스텁 (필요 없으면 빈 문자열)
+
+        원본 내용은 바꾸지 않고 앞에만 추가하므로 prelude의 줄 수가 곧 커서 라인 보정값
+        """
         # 클래스::메서드 전체 시그니처 추출
         # 예: BOOL CMatlDB::GetSteelList(int param, OUT T_MATL& list)
         method_pattern = re.compile(
@@ -435,9 +902,110 @@ class ClangASTChunker:
 
             forward_declarations = '\n\n'.join(class_declarations)
             logger.debug(f"클래스 스텁 추가: {', '.join(sorted(missing_classes))}")
-            return forward_declarations + '\n\n' + content
+            return forward_declarations + '\n\n'
+
+        return ''
+
+
+_shared_chunker = None
+_shared_chunker_lock = threading.Lock()
+
+
+def get_code_chunker() -> 'CodeChunker':
+    """
+    프로세스 공유 CodeChunker (첫 호출 시 생성, 스레드 안전)
+
+    호출부마다 CodeChunker()를 새로 만들지 않고 이 인스턴스를 재사용
+    """
+    global _shared_chunker
+    if _shared_chunker is None:
+        with _shared_chunker_lock:
+            if _shared_chunker is None:
+                _shared_chunker = CodeChunker()
+    return _shared_chunker
+
+
+def preload_clang() -> Dict:
+    """
+    libclang 로드와 공유 chunker/Index 생성을 미리 수행 (워커 기동 시 CLANG_PRELOAD=true)
+
+    Returns:
+        {'available': libclang 사용 가능 여부, 'init_ms': libclang 로드 시간, 'preload_ms': 전체 소요 시간}
+    """
+    start = time.perf_counter()
+    available = get_code_chunker().clang_chunker.index is not None
+    elapsed = time.perf_counter() - start
+    stats = {
+        'available': available,
+        'init_ms': round((_libclang_init_seconds or 0) * 1000, 1),
+        'preload_ms': round(elapsed * 1000, 1)
+    }
+    logger.info(f"Clang 사전 로드 완료: {stats}")
+    return stats
+
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """
+    함수 추출용 프로세스 풀 (프로세스 공유, 첫 호출 시 생성)
+
+    libclang 파싱과 커서 순회는 Python 쪽에서 GIL을 오래 잡으므로 파일 간 병렬화는 프로세스로 처리
+    워커는 spawn으로 시작해 libclang/Index를 미리 로드한 채 계속 재사용
+
+    CLANG_PROCESS_WORKERS: 워커 수 (0이면 min(4, CPU 수), 1이면 풀 없이 현재 프로세스에서 추출)
+
+    spawn 워커는 부모의 __main__ 모듈을 다시 import함 (gunicorn/flask run은 런처 스크립트라 가벼움,
+    python -m app.main으로 실행하면 워커마다 Flask 앱/클라이언트/작업 큐 객체를 한 번씩 생성)
+    워커는 처음 생성될 때만 이 비용을 치르고 이후 계속 재사용됨
+
+    Returns:
+        ProcessPoolExecutor 또는 풀을 쓰지 않으면 None
+    """
+    global _extraction_pool
+    workers = int(os.getenv('CLANG_PROCESS_WORKERS', '0'))
+    if workers <= 0:
+        # 컨테이너 CPU 제한(affinity)이 있으면 그 안에서
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+        workers = min(4, cpus)
+    if workers <= 1:
+        return None
+
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                _extraction_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_extraction_worker
+                )
+                logger.info(f"Clang 추출 프로세스 풀 생성 (워커 {workers}개)")
+    return _extraction_pool
+
+
+def shutdown_extraction_pool():
+    """프로세스 풀 종료 (다음 get_extraction_pool 호출 시 다시 생성)"""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
-        return content
+def _init_extraction_worker():
+    """워커 프로세스 초기화: 캐시는 부모가 관리하고 libclang/Index는 미리 로드"""
+    os.environ['CLANG_CACHE_ENABLED'] = 'false'
+    preload_clang()
+
+
+def _extract_table_in_worker(content: str, file_path: str) -> Optional[List[Dict]]:
+    """워커 프로세스에서 함수 테이블 추출 (본문 없이 반환해 프로세스 간 전송량 최소화)"""
+    return get_code_chunker().clang_chunker.extract_function_table(content, file_path)
 
 
 class CodeChunker:
@@ -446,12 +1014,8 @@ class CodeChunker:
     def __init__(self):
         self.max_chunk_lines = 500  # LLM에 전달할 최대 라인 수
 
-        # Clang AST Chunker 초기화 (실패시 정규식 사용)
+        # Clang AST Chunker (libclang은 첫 추출 시 로드, 실패시 정규식 사용)
         self.clang_chunker = ClangASTChunker()
-        if self.clang_chunker.available:
-            logger.info("CodeChunker: Clang AST 모드 활성화 (C++17 지원, 내용 기반 매칭)")
-        else:
-            logger.info("CodeChunker: 정규식 모드로 동작")
 
     def extract_macro_region(self, file_content: str, target_macro_prefix: str) -> dict:
         """
@@ -532,13 +1096,15 @@ class CodeChunker:
             'section_content': '\n'.join(lines[region_start-1:region_end])
         }
 
-    def extract_functions(self, content: str, file_path: str = None) -> List[Dict]:
+    def extract_functions(self, content: str, file_path: str = None,
+                          targets: Optional[List[str]] = None) -> List[Dict]:
         """
         C++ 파일에서 함수들을 추출
 
         Args:
             content: 파일 내용
             file_path: 파일 경로 (선택적)
+            targets: 본문(content)을 채울 함수 이름 목록 (None이면 전체, Clang 추출에만 적용)
 
         Returns:
             List[Dict]: 각 함수의 정보
@@ -554,7 +1120,7 @@ class CodeChunker:
         """
         # 1. Clang AST 시도
         if self.clang_chunker.available:
-            functions = self.clang_chunker.extract_functions(content, file_path)
+            functions = self.clang_chunker.extract_functions(content, file_path, targets)
             if functions:  # 성공
                 return functions
             else:
@@ -563,52 +1129,101 @@ class CodeChunker:
         # 2. 정규식 폴백
         return self._extract_functions_regex(content)
 
+    def extract_functions_many(self, items: List[Tuple[str, str]],
+                               targets: Optional[Dict[str, List[str]]] = None) -> List[List[Dict]]:
+        """
+        여러 파일의 함수를 프로세스 풀에서 병렬 추출 (전체 소요 시간 ≈ 가장 느린 파일)
+
+        캐시 적중 파일은 바로 반환하고 나머지만 워커로 보내며, 본문은 부모에서 원본 라인으로 복원
+        풀을 쓸 수 없으면 현재 프로세스에서 순서대로 추출
+
+        Args:
+            items: [(파일 경로, 파일 내용)]
+            targets: {파일 경로: 본문을 채울 함수 이름 목록} (경로가 없으면 전체 본문)
+
+        Returns:
+            items 순서대로 함수 정보 리스트 (extract_functions와 같은 형식)
+        """
+        targets = targets or {}
+        clang = self.clang_chunker
+        pool = get_extraction_pool() if clang.available else None
+        if pool is None:
+            return [self.extract_functions(content, path, targets.get(path)) for path, content in items]
+
+        from concurrent.futures.process import BrokenProcessPool
+
+        tables: List[Optional[List[Dict]]] = [clang.get_cached_table(content) for _, content in items]
+        futures = {}
+        for i, (path, content) in enumerate(items):
+            if tables[i] is None:
+                futures[i] = pool.submit(_extract_table_in_worker, content, path)
+
+        for i, future in futures.items():
+            path, content = items[i]
+            try:
+                tables[i] = future.result()
+            except Exception as e:
+                # 워커 비정상 종료 등 - 이 파일만 현재 프로세스에서 다시 추출
+                logger.warning(f"프로세스 풀 추출 실패, 현재 프로세스에서 추출 ({path}): {e}")
+                if isinstance(e, BrokenProcessPool):
+                    # 깨진 풀은 재사용할 수 없으므로 다음 호출 때 새로 생성
+                    shutdown_extraction_pool()
+                tables[i] = clang.extract_function_table(content, path)
+            if tables[i] is not None:
+                clang.store_table(content, tables[i])
+
+        results = []
+        for (path, content), table in zip(items, tables):
+            if table:
+                results.append(clang._materialize_cached_functions(table, content.splitlines(), targets.get(path)))
+            else:
+                logger.warning(f"Clang AST 추출 실패. 정규식으로 폴백 ({path})")
+                results.append(self._extract_functions_regex(content))
+        return results
+
     def _extract_functions_regex(self, content: str) -> List[Dict]:
         """정규식 기반 함수 추출 (폴백)"""
         lines = content.split('\n')
         functions = []
 
-        # C++ 함수 패턴 매칭
-        in_function = False
-        current_function = None
-        brace_count = 0
+        # C++ 함수 패턴 매칭 (함수 끝은 중괄호 색인으로 바로 조회)
+        index = FunctionBoundaryIndex(lines)
+        signature_pattern = re.compile(r'^\s*(BOOL|void|int|double|CString|static|inline)\s+.*::\w+\(')
 
-        for i, line in enumerate(lines):
+        i = 0
+        while i < len(lines):
+            line = lines[i]
             # 함수 시작 감지 (간단한 휴리스틱)
-            if re.match(r'^\s*(BOOL|void|int|double|CString|static|inline)\s+.*::\w+\(', line):
-                if not in_function:
-                    in_function = True
-                    current_function = {
-                        'line_start': i + 1,
-                        'signature': line.strip(),
-                        'content_lines': []
-                    }
+            if not signature_pattern.match(line):
+                i += 1
+                continue
 
-            if in_function:
-                current_function['content_lines'].append(line)
-                brace_count += line.count('{') - line.count('}')
+            line_end = index.function_end(i + 1)
+            if not line_end:
+                # 닫히지 않은 함수 - 이후에는 완성된 함수가 없음
+                break
 
-                # 함수 끝 감지
-                if brace_count == 0 and '{' in ''.join(current_function['content_lines']):
-                    current_function['line_end'] = i + 1
-                    current_function['content'] = '\n'.join(current_function['content_lines'])
+            current_function = {
+                'line_start': i + 1,
+                'line_end': line_end,
+                'signature': line.strip(),
+                'content': '\n'.join(lines[i:line_end])
+            }
 
-                    # 함수 이름 추출
-                    match = re.search(r'::(\w+)\(', current_function['signature'])
-                    if match:
-                        current_function['name'] = match.group(1)
-                    else:
-                        # 클래스 없는 함수
-                        match = re.search(r'\s+(\w+)\(', current_function['signature'])
-                        if match:
-                            current_function['name'] = match.group(1)
+            # 함수 이름 추출
+            match = re.search(r'::(\w+)\(', current_function['signature'])
+            if match:
+                current_function['name'] = match.group(1)
+            else:
+                # 클래스 없는 함수
+                match = re.search(r'\s+(\w+)\(', current_function['signature'])
+                if match:
+                    current_function['name'] = match.group(1)
 
-                    if 'name' in current_function:
-                        functions.append(current_function)
+            if 'name' in current_function:
+                functions.append(current_function)
 
-                    in_function = False
-                    current_function = None
-                    brace_count = 0
+            i = line_end
 
         logger.info(f"정규식으로 {len(functions)}개 함수 추출 완료")
         return functions
@@ -785,8 +1400,7 @@ class TemplateBasedGenerator:
 """
 
         try:
-            response = self.llm_handler.client.chat.completions.create(
-                model=self.llm_handler.model,
+            generated_code = self.llm_handler.chat_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -795,8 +1409,6 @@ class TemplateBasedGenerator:
                 max_tokens=4000
             )
 
-            generated_code = response.choices[0].message.content
-
             # 코드 블록 추출
             if "```" in generated_code:
                 generated_code = self.llm_handler._extract_code_from_response(generated_code)
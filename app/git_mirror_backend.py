@@ -0,0 +1,370 @@
+"""
+로컬 git 미러 기반 저장소 백엔드
+REST 파일 조회/멀티파트 커밋 대신 bare 미러에서 blob을 직접 읽고,
+커밋은 로컬에서 만들어 브랜치 ref 하나만 push
+"""
+
+import os
+import time
+import logging
+import tempfile
+import threading
+import subprocess
+from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.bitbucket_api import COMMIT_HASH_PATTERN, FileFetchResult
+from app.cache_store import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class GitCommandError(Exception):
+    """git 명령 실패"""
+
+    def __init__(self, command: str, returncode: int, stderr: str):
+        super().__init__(f"git {command} 실패 (exit {returncode}): {stderr}")
+        self.command = command
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class PushRejectedError(GitCommandError):
+    """원격 브랜치가 앞서 있어 push가 거부됨 (부모 커밋 불일치)"""
+
+
+class GitMirrorBackend:
+    """
+    bare 미러 저장소 백엔드
+
+    BitbucketAPI의 파일 읽기/커밋 메서드와 같은 인터페이스를 제공하여
+    IssueProcessor가 설정만으로 백엔드를 바꿀 수 있음
+    (PR 생성처럼 git으로 할 수 없는 작업은 bitbucket_api에 위임)
+    """
+
+    def __init__(self, remote_url: str, mirror_dir: str, bitbucket_api=None,
+                 access_token: Optional[str] = None, author_name: Optional[str] = None,
+                 author_email: Optional[str] = None, fetch_interval: Optional[float] = None):
+        self.remote_url = remote_url
+        self.mirror_dir = os.path.abspath(mirror_dir)
+        self.bitbucket_api = bitbucket_api
+        self.access_token = access_token
+        self.author_name = author_name or os.getenv('GIT_MIRROR_AUTHOR_NAME', 'SDB Agent')
+        self.author_email = author_email or os.getenv('GIT_MIRROR_AUTHOR_EMAIL', 'sdb-agent@localhost')
+        if fetch_interval is None:
+            fetch_interval = float(os.getenv('GIT_MIRROR_FETCH_INTERVAL', '30'))
+        self.fetch_interval = fetch_interval
+
+        # 미러 초기화/fetch/ref 갱신은 직렬화 (blob 읽기는 동시에 가능)
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._last_fetch = 0.0
+        self._stats = {'fetches': 0, 'blob_reads': 0, 'commits': 0, 'push_retries': 0}
+
+    def _git(self, *args: str, input: Optional[bytes] = None, env: Optional[Dict[str, str]] = None,
+             check: bool = True) -> subprocess.CompletedProcess:
+        """미러 저장소에서 git 명령 실행"""
+        full_env = dict(os.environ)
+        full_env['GIT_TERMINAL_PROMPT'] = '0'
+        if self.access_token:
+            # 토큰이 URL/명령줄/설정 파일에 남지 않도록 환경 변수로 헤더 전달
+            full_env['GIT_CONFIG_COUNT'] = '1'
+            full_env['GIT_CONFIG_KEY_0'] = 'http.extraHeader'
+            full_env['GIT_CONFIG_VALUE_0'] = f"Authorization: Bearer {self.access_token}"
+        if env:
+            full_env.update(env)
+
+        completed = subprocess.run(
+            ['git', '--git-dir', self.mirror_dir, *args],
+            input=input, capture_output=True, env=full_env
+        )
+        if check and completed.returncode != 0:
+            raise GitCommandError(args[0], completed.returncode,
+                                  completed.stderr.decode('utf-8', errors='replace').strip())
+        return completed
+
+    def _ensure_mirror(self):
+        """bare 미러 생성 (최초 1회)"""
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            if not os.path.exists(os.path.join(self.mirror_dir, 'HEAD')):
+                logger.info(f"git 미러 생성: {self.mirror_dir}")
+                os.makedirs(self.mirror_dir, exist_ok=True)
+                subprocess.run(['git', 'init', '--bare', '--quiet', self.mirror_dir],
+                               check=True, capture_output=True)
+                self._git('config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*')
+            self._git('config', 'remote.origin.url', self.remote_url)
+            self._initialized = True
+
+    def fetch(self, force: bool = False):
+        """
+        원격 브랜치를 미러로 증분 fetch
+
+        Args:
+            force: False면 마지막 fetch 후 fetch_interval이 지나지 않았을 때 생략
+        """
+        self._ensure_mirror()
+        with self._lock:
+            if not force and self._last_fetch and time.monotonic() - self._last_fetch < self.fetch_interval:
+                return
+            start = time.perf_counter()
+            self._git('fetch', '--prune', '--no-tags', '--quiet', 'origin')
+            self._last_fetch = time.monotonic()
+            self._stats['fetches'] += 1
+            logger.info(f"git 미러 fetch 완료 ({time.perf_counter() - start:.2f}초)")
+
+    def _resolve(self, ref: str) -> Optional[str]:
+        """브랜치 이름 또는 커밋 해시 → 커밋 해시 (없으면 None)"""
+        if COMMIT_HASH_PATTERN.fullmatch(ref):
+            return ref
+        completed = self._git('rev-parse', '--verify', '--quiet', f'refs/heads/{ref}^{{commit}}', check=False)
+        return completed.stdout.decode('ascii').strip() or None
+
+    def get_branch_head(self, branch: str, refresh: bool = False) -> str:
+        """
+        브랜치 최신 커밋 해시
+
+        Args:
+            branch: 브랜치 이름
+            refresh: True면 원격에서 다시 fetch 후 조회
+
+        Returns:
+            커밋 해시
+        """
+        self.fetch(force=refresh)
+        commit_hash = self._resolve(branch)
+        if not commit_hash:
+            raise Exception(f"브랜치 '{branch}'를 찾을 수 없습니다")
+        return commit_hash
+
+    def create_branch(self, branch_name: str, from_branch: str = "master") -> Dict:
+        """새 브랜치 생성 (이슈 시작 시점이므로 원격 변경사항을 먼저 fetch)"""
+        target_hash = self.get_branch_head(from_branch, refresh=True)
+        self._push(target_hash, branch_name)
+        logger.info(f"브랜치 생성 완료: {branch_name} ({target_hash[:12]})")
+        return {'name': branch_name, 'target': {'hash': target_hash}}
+
+    def get_files_raw(self, paths: Iterable[str], ref: str = "master",
+                      max_workers: Optional[int] = None) -> FileFetchResult:
+        """
+        여러 파일을 오브젝트 저장소에서 한 번에 읽기 (git cat-file --batch 1회)
+
+        Args:
+            paths: 파일 경로 목록
+            ref: 브랜치 이름 또는 커밋 해시
+            max_workers: BitbucketAPI와 인터페이스를 맞추기 위한 인자 (사용 안 함)
+
+        Returns:
+            FileFetchResult {경로: 바이트 또는 None}
+        """
+        if COMMIT_HASH_PATTERN.fullmatch(ref):
+            self.fetch()
+            commit_hash = ref
+        else:
+            commit_hash = self.get_branch_head(ref)
+        paths = list(dict.fromkeys(paths))
+        result = FileFetchResult(ref, commit_hash)
+        if not paths:
+            return result
+
+        start = time.perf_counter()
+        request = ''.join(f"{commit_hash}:{path}\n" for path in paths).encode('utf-8')
+        output = self._git('cat-file', '--batch', input=request).stdout
+
+        pos = 0
+        for path in paths:
+            end = output.index(b'\n', pos)
+            header = output[pos:end].decode('utf-8', errors='replace')
+            pos = end + 1
+            if header.endswith(' missing') or header.endswith(' ambiguous'):
+                result[path] = None
+                continue
+            _, object_type, size = header.rsplit(' ', 2)
+            size = int(size)
+            result[path] = output[pos:pos + size] if object_type == 'blob' else None
+            pos += size + 1
+
+        # 한 번의 배치로 읽으므로 파일별 시간은 균등 분배
+        elapsed = time.perf_counter() - start
+        for path in paths:
+            result.timings[path] = elapsed / len(paths)
+        with self._lock:
+            self._stats['blob_reads'] += len(paths)
+        return result
+
+    def get_file_content_raw(self, file_path: str, branch: str = "master") -> Optional[bytes]:
+        """
+        파일 내용을 바이너리로 가져오기
+
+        Args:
+            file_path: 파일 경로
+            branch: 브랜치 이름 또는 커밋 해시
+
+        Returns:
+            파일 내용 (바이트) 또는 None
+        """
+        return self.get_files_raw([file_path], branch).get(file_path)
+
+    def _tree_modes(self, commit_hash: str, paths: List[str]) -> Dict[str, str]:
+        """기존 파일의 모드 (실행 권한 등 유지용)"""
+        output = self._git('ls-tree', '-z', commit_hash, '--', *paths).stdout
+        modes = {}
+        for entry in output.split(b'\0'):
+            if not entry:
+                continue
+            info, path = entry.split(b'\t', 1)
+            modes[path.decode('utf-8')] = info.split(b' ', 1)[0].decode('ascii')
+        return modes
+
+    def _build_commit(self, parent_commit: str, changes: List[tuple], message: str) -> str:
+        """
+        부모 커밋 트리에 변경 파일을 반영한 커밋을 로컬에서 생성
+
+        Returns:
+            새 커밋 해시
+        """
+        fd, index_path = tempfile.mkstemp(prefix='index-', dir=self.mirror_dir)
+        os.close(fd)
+        os.unlink(index_path)  # read-tree가 새 인덱스를 만들도록 빈 파일 제거
+        env = {'GIT_INDEX_FILE': index_path}
+        try:
+            self._git('read-tree', parent_commit, env=env)
+            modes = self._tree_modes(parent_commit, [path for path, _ in changes])
+
+            index_info = []
+            for path, content_bytes in changes:
+                blob = self._git('hash-object', '-w', '--stdin', input=content_bytes).stdout.decode('ascii').strip()
+                index_info.append(f"{modes.get(path, '100644')} {blob}\t{path}\n")
+            self._git('update-index', '--index-info', input=''.join(index_info).encode('utf-8'), env=env)
+
+            tree = self._git('write-tree', env=env).stdout.decode('ascii').strip()
+            author_env = {
+                'GIT_AUTHOR_NAME': self.author_name,
+                'GIT_AUTHOR_EMAIL': self.author_email,
+                'GIT_COMMITTER_NAME': self.author_name,
+                'GIT_COMMITTER_EMAIL': self.author_email,
+            }
+            return self._git('commit-tree', tree, '-p', parent_commit,
+                             input=message.encode('utf-8'), env=author_env).stdout.decode('ascii').strip()
+        finally:
+            try:
+                os.unlink(index_path)
+            except OSError:
+                pass
+
+    def _push(self, commit_hash: str, branch: str):
+        """브랜치 ref 하나만 push 후 미러 ref 갱신 (fast-forward가 아니면 PushRejectedError)"""
+        self._ensure_mirror()
+        completed = self._git('push', '--quiet', 'origin', f'{commit_hash}:refs/heads/{branch}', check=False)
+        if completed.returncode != 0:
+            stderr = completed.stderr.decode('utf-8', errors='replace').strip()
+            if any(marker in stderr for marker in ('rejected', 'non-fast-forward', 'fetch first')):
+                raise PushRejectedError('push', completed.returncode, stderr)
+            raise GitCommandError('push', completed.returncode, stderr)
+        with self._lock:
+            self._git('update-ref', f'refs/heads/{branch}', commit_hash)
+
+    def commit_multiple_files_binary(self, branch: str, file_changes: List[Dict],
+                                     message: str, parent_commit: Optional[str] = None) -> Dict:
+        """
+        여러 바이너리 파일을 커밋 1개로 만들어 push
+
+        Args:
+            branch: 브랜치 이름
+            file_changes: [{"path": ..., "content_bytes": b"...", "action": "update"}]
+            message: 커밋 메시지
+            parent_commit: 부모 커밋 해시 (선택사항, 지정하면 불일치 시 재시도하지 않음)
+
+        Returns:
+            커밋 정보 {'hash', 'parents', 'branch'}
+        """
+        changes = []
+        for file_change in file_changes:
+            file_path = file_change['path']
+            if file_change.get('action', 'update') == 'delete':
+                logger.warning(f"파일 삭제는 현재 미지원: {file_path}")
+                continue
+            if file_change.get('content_bytes') is None:
+                logger.warning(f"파일 내용 없음: {file_path}")
+                continue
+            changes.append((file_path, file_change['content_bytes']))
+
+        if not changes:
+            logger.warning("커밋할 파일이 없습니다.")
+            return {}
+
+        explicit_parent = bool(parent_commit)
+        for attempt in range(2):
+            parent = parent_commit if explicit_parent else self.get_branch_head(branch, refresh=attempt > 0)
+            commit_hash = self._build_commit(parent, changes, message)
+            try:
+                self._push(commit_hash, branch)
+                break
+            except PushRejectedError:
+                if explicit_parent or attempt:
+                    raise
+                logger.warning(f"원격 브랜치가 앞서 있음: {branch}를 다시 fetch 후 재시도합니다")
+                with self._lock:
+                    self._stats['push_retries'] += 1
+
+        with self._lock:
+            self._stats['commits'] += 1
+        logger.info(f"git 미러 커밋 완료: {len(changes)}개 파일 on {branch} ({commit_hash[:12]})")
+        return {'hash': commit_hash, 'parents': [{'hash': parent}], 'branch': branch}
+
+    def commit_file_binary(self, branch: str, file_path: str, content_bytes: bytes,
+                           message: str, parent_commit: Optional[str] = None) -> Dict:
+        """단일 바이너리 파일 커밋"""
+        return self.commit_multiple_files_binary(
+            branch, [{'path': file_path, 'content_bytes': content_bytes}], message, parent_commit
+        )
+
+    def create_pull_request(self, source_branch: str, destination_branch: str,
+                            title: str, description: str) -> Dict:
+        """PR 생성은 REST API에 위임"""
+        if self.bitbucket_api is None:
+            raise Exception("PR 생성에는 BitbucketAPI가 필요합니다")
+        return self.bitbucket_api.create_pull_request(source_branch, destination_branch, title, description)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """fetch/blob 읽기/커밋 횟수"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def default_remote_url(bitbucket_api) -> str:
+    """BitbucketAPI 설정에서 git 원격 주소 생성 (api.bitbucket.org → bitbucket.org)"""
+    parsed = urlparse(bitbucket_api.base_url)
+    host = parsed.netloc[4:] if parsed.netloc.startswith('api.') else parsed.netloc
+    return f"{parsed.scheme or 'https'}://{host}/{bitbucket_api.workspace}/{bitbucket_api.repository}.git"
+
+
+def create_repository_backend(bitbucket_api, backend: str = 'rest', mirror_dir: Optional[str] = None,
+                              remote_url: Optional[str] = None):
+    """
+    설정에 맞는 저장소 백엔드 생성 (생성 시점에는 git/네트워크 작업 없음)
+
+    Args:
+        bitbucket_api: BitbucketAPI 인스턴스
+        backend: 'rest' | 'git_mirror'
+        mirror_dir: git 미러 디렉토리 (기본: CACHE_DIR/git_mirror)
+        remote_url: git 원격 주소 (기본: Bitbucket 설정에서 생성)
+
+    Returns:
+        BitbucketAPI 또는 GitMirrorBackend
+    """
+    backend = (backend or 'rest').lower()
+    if backend != 'git_mirror':
+        return bitbucket_api
+
+    backend_impl = GitMirrorBackend(
+        remote_url or default_remote_url(bitbucket_api),
+        mirror_dir or os.path.join(DEFAULT_CACHE_DIR, 'git_mirror'),
+        bitbucket_api=bitbucket_api,
+        access_token=bitbucket_api.access_token
+    )
+    logger.info(f"저장소 백엔드: git_mirror ({backend_impl.mirror_dir})")
+    return backend_impl
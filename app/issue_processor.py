@@ -4,11 +4,14 @@
 
 import os
 import logging
-from typing import Dict, List, Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 from app.large_file_handler import LargeFileHandler
 from app.target_files_config import get_file_config, get_guide_file
 from app.prompt_builder import PromptBuilder
+from app.metrics import issue_metrics, stage, fail_stage, record_stage, ISSUES_PROCESSED
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +19,23 @@ logger = logging.getLogger(__name__)
 class IssueProcessor:
     """Jira 이슈 처리 프로세서"""
     
-    def __init__(self, bitbucket_api, llm_handler):
+    def __init__(self, bitbucket_api, llm_handler, max_file_workers: Optional[int] = None):
         self.bitbucket_api = bitbucket_api
         self.llm_handler = llm_handler
-        self.large_file_handler = LargeFileHandler(llm_handler)
+        # 파일별 파이프라인 동시 실행 수 (1이면 순차 처리)
+        if max_file_workers is None:
+            max_file_workers = int(os.getenv('FILE_PIPELINE_WORKERS', '4'))
+        self.max_file_workers = max(1, max_file_workers)
+        self._large_file_handler = None
         self.prompt_builder = PromptBuilder(llm_handler)
 
+    @property
+    def large_file_handler(self) -> LargeFileHandler:
+        """대용량 파일 핸들러 (CodeChunker 생성 비용 때문에 첫 사용 시 생성)"""
+        if self._large_file_handler is None:
+            self._large_file_handler = LargeFileHandler(self.llm_handler)
+        return self._large_file_handler
+
     def load_guide_file(self, file_path: str) -> str:
         """
         파일별 구현 가이드 로드
@@ -45,7 +59,17 @@ class IssueProcessor:
             logger.warning(f"가이드 파일 없음: {file_path}")
             return ""
 
-    def _extract_relevant_methods(self, file_content: str, target_functions: list, file_path: str = "") -> tuple:
+    @staticmethod
+    def _is_macro_file(file_path: str, target_functions: list) -> bool:
+        """매크로 정의 파일 여부 (Clang AST 대신 패턴 기반 추출 대상)"""
+        return (
+            "DBCodeDef.h" in file_path or
+            any("MATLCODE" in f for f in target_functions) or
+            any("#pragma region" in f for f in target_functions)
+        )
+
+    def _extract_relevant_methods(self, file_content: str, target_functions: list, file_path: str = "",
+                                  all_functions: Optional[List[Dict]] = None) -> tuple:
         """
         파일에서 관련 함수/매크로 영역 추출 (test_material_db_modification.py와 동일)
 
@@ -53,22 +77,16 @@ class IssueProcessor:
             file_content: 파일 전체 내용
             target_functions: 찾아야 할 함수 이름 또는 매크로 패턴 리스트
             file_path: 파일 경로 (매크로 파일 감지용)
+            all_functions: 미리 일괄 추출한 함수 테이블 (없으면 이 파일만 추출)
 
         Returns:
             (추출된 함수 리스트, 전체 함수 리스트)
         """
         import re
         from collections import Counter
-        from app.code_chunker import CodeChunker
-
-        # 매크로 파일 감지
-        is_macro_file = (
-            "DBCodeDef.h" in file_path or
-            any("MATLCODE" in f for f in target_functions) or
-            any("#pragma region" in f for f in target_functions)
-        )
+        from app.code_chunker import get_code_chunker
 
-        if is_macro_file:
+        if self._is_macro_file(file_path, target_functions):
             logger.info(f"매크로 정의 파일 감지 - 패턴 기반 추출 사용 (파일: {file_path})")
 
             # 매크로 접두사 추출
@@ -100,7 +118,7 @@ class IssueProcessor:
 
             logger.info(f"최종 매크로 접두사: {macro_prefix}")
 
-            chunker = CodeChunker()
+            chunker = get_code_chunker()
             section_info = chunker.extract_macro_region(file_content, macro_prefix)
 
             if section_info:
@@ -120,11 +138,11 @@ class IssueProcessor:
                 logger.warning("❌ 매크로 섹션 추출 실패")
                 return [], []
 
-        # 일반 함수 파일은 기존 Clang AST 사용
-        chunker = CodeChunker()
-
-        logger.info("Clang AST로 함수 추출 중...")
-        all_functions = chunker.extract_functions(file_content)
+        # 일반 함수 파일은 기존 Clang AST 사용 (일괄 추출 결과가 있으면 재사용)
+        if all_functions is None:
+            logger.info("Clang AST로 함수 추출 중...")
+            # 본문은 타겟 함수만 복원 (나머지는 이름/라인 범위만 사용)
+            all_functions = get_code_chunker().extract_functions(file_content, file_path, target_functions)
 
         if not all_functions:
             logger.warning("함수 추출 실패. 전체 파일을 사용합니다.")
@@ -392,14 +410,10 @@ class IssueProcessor:
         try:
             logger.info(f"LLM 호출 중... (프롬프트 크기: {len(prompt)} characters)")
 
-            response = self.llm_handler.client.chat.completions.create(
-                model=self.llm_handler.model,
+            response_content = self.llm_handler.chat_completion(
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=self.llm_handler.max_tokens
+                temperature=0.1
             )
-
-            response_content = response.choices[0].message.content
             logger.info(f"LLM 응답 수신 완료 (크기: {len(response_content)} characters)")
 
             # JSON 추출
@@ -432,21 +446,358 @@ class IssueProcessor:
         except json.JSONDecodeError as e:
             logger.error(f"LLM 응답 JSON 파싱 실패 ({file_path}): {e}")
             logger.error(f"파싱 시도한 JSON 내용:\n{json_content[:500]}...")
+            # 빈 diff로 계속 진행하되 llm_call 단계는 실패로 집계
+            fail_stage(f"JSON 파싱 실패: {e}")
             return []
         except Exception as e:
             logger.error(f"LLM 호출 실패 ({file_path}): {str(e)}")
+            fail_stage(str(e))
+            return []
+
+    def _prepare_file_change(self, file_path: str, branch_name: str, material_spec: str,
+                             encoding_handler, prefetched: Optional[Dict] = None,
+                             prepared: Optional[Dict] = None) -> Optional[tuple]:
+        """
+        단일 파일 수정 파이프라인 (읽기 → 인코딩 감지 → 함수 추출 → 프롬프트 → LLM → diff 적용)
+
+        파일끼리는 커밋 전까지 독립적이므로 병렬 실행 가능
+
+        Args:
+            file_path: 파일 경로
+            branch_name: 작업 브랜치
+            material_spec: Material DB Spec
+            encoding_handler: EncodingHandler 인스턴스
+            prefetched: 일괄 조회 결과 (get_files_raw의 FileFetchResult 또는 {경로: 바이트} dict,
+                        없거나 실패한 경로는 다시 조회)
+            prepared: _prepare_function_tables의 이 파일 결과 (있으면 읽기/디코딩/함수 추출 생략)
+
+        Returns:
+            (커밋용 file_change, 결과용 modified_file) 또는 파일이 없으면 None
+        """
+        if prepared is not None:
+            current_content_bytes = prepared['content_bytes']
+        # ✅ 1. 바이너리로 파일 읽기
+        elif prefetched is not None and file_path in prefetched:
+            current_content_bytes = prefetched[file_path]
+            # 조회 시간은 FileFetchResult에만 있음 (일반 dict면 0으로 기록)
+            timings = getattr(prefetched, 'timings', {})
+            record_stage('file_fetch', timings.get(file_path, 0.0), file_path)
+        else:
+            with stage('file_fetch', file_path):
+                current_content_bytes = self.bitbucket_api.get_file_content_raw(
+                    file_path, branch_name
+                )
+
+        if current_content_bytes is None:
+            logger.warning(f"파일을 찾을 수 없음: {file_path}")
+            return None
+
+        if prepared is not None:
+            current_content, detected_encoding = prepared['content'], prepared['encoding']
+        else:
+            current_content, detected_encoding = self._decode_file(
+                current_content_bytes, file_path, encoding_handler
+            )
+
+        # 파일별 구현 가이드 로드
+        guide_content = self.load_guide_file(file_path)
+
+        # 파일 설정 가져오기 (신규)
+        file_config = get_file_config(file_path)
+
+        # 파일 크기 확인
+        line_count = len(current_content.split('\n'))
+        logger.info(f"파일 크기: {line_count} 줄")
+
+        # Clang AST를 사용한 관련 함수 추출 (test_material_db_modification.py와 동일)
+        logger.info("Clang AST로 관련 함수 추출 중...")
+        with stage('ast_extraction', file_path):
+            relevant_functions, all_functions = self._extract_relevant_methods(
+                current_content,
+                file_config.get('functions', []) if file_config else [],
+                file_path,
+                prepared.get('functions') if prepared is not None else None
+            )
+        logger.info(f"총 {len(all_functions)}개 함수 중 {len(relevant_functions)}개 관련 함수 추출")
+
+        # 관련 함수가 있으면 집중된 프롬프트, 없으면 전체 파일 프롬프트
+        with stage('prompt_build', file_path):
+            if relevant_functions:
+                logger.info(f"✅ {len(relevant_functions)}개 관련 함수 발견 - 집중된 프롬프트 사용")
+
+                # test_material_db_modification.py와 동일한 방식
+                focused_content = self._build_focused_content(
+                    relevant_functions, all_functions, current_content, file_config
+                )
+
+                # 프롬프트 생성 (material_spec + implementation_guide 포함)
+                prompt = self._build_modification_prompt_with_spec(
+                    file_path, focused_content, material_spec, guide_content, file_config,
+                    all_functions, current_content
+                )
+
+            else:
+                logger.warning(f"❌ 관련 함수 없음 - 전체 파일 프롬프트 사용 ({line_count} 줄)")
+
+                # 전체 파일 프롬프트 (test_material_db_modification.py와 동일)
+                prompt = self.prompt_builder.build_modification_prompt(
+                    file_config if file_config else {'path': file_path, 'functions': [], 'description': '', 'section': ''},
+                    current_content,
+                    material_spec,  # Material DB Spec 전체
+                    guide_content   # 구현 가이드
+                )
+
+        # 직접 LLM 호출 (generate_code_diff 대신)
+        with stage('llm_call', file_path):
+            diffs = self._call_llm_with_prompt(prompt, file_path)
+
+        with stage('diff_apply', file_path):
+            # diff를 실제 코드에 적용
+            modified_content = self.llm_handler.apply_diff_to_content(current_content, diffs)
+
+            # Diff 텍스트 생성 (테스트 출력용)
+            diff_text = self._generate_diff_text(current_content, modified_content, file_path)
+
+            # ✅ 7. 원본 인코딩으로 다시 인코딩
+            modified_content_bytes = encoding_handler.encode_preserving_original(
+                modified_content,
+                detected_encoding
+            )
+
+        # diff 적용 결과가 컴파일 가능한지 Clang으로 검사 (수정 전에 없던 에러만 보고)
+        with stage('syntax_check', file_path):
+            syntax_errors = self._check_modified_syntax(current_content, modified_content, file_path)
+
+        logger.info(f"파일 수정 준비 완료: {file_path} ({len(diffs)}개 변경사항, 인코딩: {detected_encoding})")
+
+        # ✅ 8. 바이너리로 커밋 준비
+        file_change = {
+            'path': file_path,
+            'content_bytes': modified_content_bytes,  # 바이너리!
+            'action': 'update'
+        }
+        modified_file = {
+            'path': file_path,
+            'action': 'modified',
+            'diff_count': len(diffs),
+            'encoding': detected_encoding,
+            'modified_content': modified_content,  # 수정된 전체 내용 (확인용)
+            'diff': diff_text,  # Diff 텍스트
+            'syntax_errors': syntax_errors  # 수정으로 새로 생긴 구문 에러
+        }
+        return file_change, modified_file
+
+    def _decode_file(self, content_bytes: bytes, file_path: str, encoding_handler) -> tuple:
+        """
+        인코딩 감지 후 디코딩
+
+        Returns:
+            (디코딩된 내용, 실제 사용한 인코딩)
+        """
+        with stage('encoding_detection', file_path):
+            # ✅ 2. 인코딩 감지
+            original_encoding = encoding_handler.detect_encoding_with_hint(content_bytes, file_path)
+            logger.info(f"파일 인코딩: {original_encoding} ({file_path})")
+
+            # ✅ 3. 디코딩 (수정 작업용)
+            return encoding_handler.decode_with_fallback(content_bytes, original_encoding)
+
+    def _prepare_function_tables(self, files_to_modify: List[str], prefetched: Optional[Dict],
+                                 encoding_handler) -> Dict[str, Dict]:
+        """
+        일괄 조회한 대상 파일을 디코딩하고 함수 테이블을 한 번에 추출 (파일별 파이프라인 시작 전)
+
+        extract_functions_many 한 번으로 모든 파일을 프로세스 풀에 보내므로 전체 추출 시간 ≈ 가장 느린 파일
+        매크로 파일(패턴 기반 추출)과 일괄 조회에 없는 파일은 제외 (파이프라인에서 직접 처리)
+
+        Args:
+            files_to_modify: 대상 파일 경로 리스트
+            prefetched: 일괄 조회 결과 (None이면 빈 dict 반환)
+            encoding_handler: EncodingHandler 인스턴스
+
+        Returns:
+            {경로: {'content_bytes', 'content', 'encoding', 'functions'}}
+        """
+        if prefetched is None:
+            return {}
+
+        from app.code_chunker import get_code_chunker
+
+        prepared = {}
+        targets = {}
+        timings = getattr(prefetched, 'timings', {})
+        for file_path in files_to_modify:
+            content_bytes = prefetched.get(file_path)
+            if content_bytes is None:
+                continue
+            file_config = get_file_config(file_path)
+            target_functions = file_config.get('functions', []) if file_config else []
+            if self._is_macro_file(file_path, target_functions):
+                continue
+
+            record_stage('file_fetch', timings.get(file_path, 0.0), file_path)
+            content, encoding = self._decode_file(content_bytes, file_path, encoding_handler)
+            prepared[file_path] = {'content_bytes': content_bytes, 'content': content, 'encoding': encoding}
+            targets[file_path] = target_functions
+
+        if prepared:
+            with stage('bulk_ast_extraction'):
+                tables = get_code_chunker().extract_functions_many(
+                    [(path, entry['content']) for path, entry in prepared.items()], targets
+                )
+            for entry, functions in zip(prepared.values(), tables):
+                entry['functions'] = functions
+        return prepared
+
+    def _check_modified_syntax(self, original_content: str, modified_content: str, file_path: str) -> List[Dict]:
+        """
+        수정 전/후 내용을 Clang으로 검사해서 수정으로 새로 생긴 구문 에러 반환
+
+        수정 후 내용은 수정 전 번역 단위를 reparse해서 검사 (같은 스레드에서 연속 호출)
+        검사가 끝나면 번역 단위를 바로 해제 (파이프라인 스레드에 상주하지 않도록)
+        CLANG_SYNTAX_CHECK=true일 때만 실행, libclang을 쓸 수 없으면 빈 리스트
+
+        Args:
+            original_content: 수정 전 파일 내용
+            modified_content: diff 적용 후 파일 내용
+            file_path: 파일 경로 (로그용)
+
+        Returns:
+            새 구문 에러 리스트 [{'line': 수정 후 라인, 'message': 메시지}]
+        """
+        if os.getenv('CLANG_SYNTAX_CHECK', 'false').lower() != 'true' or modified_content == original_content:
             return []
 
-    def process_issue(self, issue: Dict) -> Dict[str, Any]:
+        from app.code_chunker import get_code_chunker, new_syntax_errors
+
+        clang_chunker = get_code_chunker().clang_chunker
+        try:
+            before = clang_chunker.check_syntax(original_content)
+            after = clang_chunker.check_syntax(modified_content, base_content=original_content)
+        finally:
+            clang_chunker.release_translation_units()
+        added = new_syntax_errors(before, after)
+
+        if added:
+            logger.warning(f"⚠️  수정 후 새 구문 에러 {len(added)}개: {file_path}")
+            for error in added[:5]:
+                logger.warning(f"  - 라인 {error['line']}: {error['message']}")
+        return added
+
+
+    def _fetch_target_files(self, target_files: List[Dict], branch_name: str) -> tuple:
+        """
+        대상 파일과 대체 경로(alternative_path)를 한 번에 병렬 조회
+
+        Args:
+            target_files: TARGET_FILES 설정 리스트
+            branch_name: 작업 브랜치
+
+        Returns:
+            (수정 대상 경로 리스트, 일괄 조회 결과 또는 실패 시 None)
+            원래 경로에 파일이 없고 대체 경로에 있으면 대체 경로로 바꿔서 반환
+        """
+        files_to_modify = [f['path'] for f in target_files]
+        paths = []
+        for file_info in target_files:
+            paths.append(file_info['path'])
+            if file_info.get('alternative_path'):
+                paths.append(file_info['alternative_path'])
+
+        try:
+            with stage('bulk_fetch'):
+                prefetched = self.bitbucket_api.get_files_raw(paths, branch_name)
+        except Exception as e:
+            logger.warning(f"파일 일괄 조회 실패, 파일별로 조회합니다: {str(e)}")
+            return files_to_modify, None
+
+        for i, file_info in enumerate(target_files):
+            path = file_info['path']
+            alternative_path = file_info.get('alternative_path')
+            if (alternative_path and path in prefetched and prefetched[path] is None
+                    and prefetched.get(alternative_path) is not None):
+                logger.warning(f"파일을 찾을 수 없음. 대체 경로 사용: {alternative_path}")
+                files_to_modify[i] = alternative_path
+
+        return files_to_modify, prefetched
+
+    def _run_file_pipelines(self, files_to_modify: List[str], branch_name: str,
+                            material_spec: str, encoding_handler,
+                            prefetched: Optional[Dict] = None) -> List[tuple]:
+        """
+        파일별 수정 파이프라인을 제한된 폭으로 병렬 실행
+
+        Args:
+            files_to_modify: 대상 파일 경로 리스트
+            branch_name: 작업 브랜치
+            material_spec: Material DB Spec
+            encoding_handler: EncodingHandler 인스턴스
+            prefetched: 일괄 조회 결과 (선택사항)
+
+        Returns:
+            [(file_path, outcome, error)] - 입력 순서와 동일
+        """
+        # 함수 추출은 파일별로 나누지 않고 모든 대상 파일을 한 번에 프로세스 풀로 보냄
+        try:
+            prepared = self._prepare_function_tables(files_to_modify, prefetched, encoding_handler)
+        except Exception as e:
+            logger.warning(f"함수 일괄 추출 실패, 파일별로 추출합니다: {str(e)}")
+            prepared = {}
+
+        def run(file_path):
+            try:
+                return file_path, self._prepare_file_change(
+                    file_path, branch_name, material_spec, encoding_handler, prefetched,
+                    prepared.get(file_path)
+                ), None
+            except Exception as e:
+                return file_path, None, e
+
+        # 워커 스레드에서도 이슈별 메트릭이 기록되도록 호출자 컨텍스트 전달
+        context = contextvars.copy_context()
+
+        def run_in_context(file_path):
+            return context.copy().run(run, file_path)
+
+        workers = min(self.max_file_workers, len(files_to_modify))
+        if workers <= 1:
+            return [run(file_path) for file_path in files_to_modify]
+
+        logger.info(f"파일 {len(files_to_modify)}개 병렬 처리 (동시 {workers}개)")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='file-pipeline') as executor:
+            # map은 입력 순서대로 결과를 반환하므로 결과/에러 순서가 결정적
+            return list(executor.map(run_in_context, files_to_modify))
+
+    def process_issue(self, issue: Dict, stage_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Jira 이슈를 처리하는 메인 워크플로우
-        
+
+        단계별 소요 시간/토큰 사용량은 /metrics로 집계되고 result['metrics']에도 첨부
+
         Args:
             issue: Jira 이슈 정보
-            
+            stage_callback: 단계 변경 시 호출되는 콜백 (작업 큐 진행 상태 보고용)
+
         Returns:
             처리 결과
         """
+        with issue_metrics(issue.get('key')) as recorder:
+            result = self._process_issue(issue, stage_callback)
+        result['metrics'] = recorder.summary()
+        ISSUES_PROCESSED.inc(status=result.get('status'))
+        return result
+
+    def _process_issue(self, issue: Dict, stage_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        process_issue 본체 (Spec 변환 → 브랜치 → 파일 수정 → 커밋 → PR)
+        """
+        def report_stage(stage: str):
+            if stage_callback:
+                try:
+                    stage_callback(stage)
+                except Exception as e:
+                    logger.warning(f"단계 보고 실패 ({stage}): {e}")
+
         result = {
             'status': 'started',
             'issue_key': issue.get('key'),
@@ -459,7 +810,9 @@ class IssueProcessor:
         try:
             # 1. 이슈를 Material DB Spec으로 변환
             logger.info("Step 1: 이슈를 Material DB Spec으로 변환 중...")
-            material_spec = self.llm_handler.convert_issue_to_spec(issue)
+            report_stage('spec_conversion')
+            with stage('spec_conversion'):
+                material_spec = self.llm_handler.convert_issue_to_spec(issue)
             
             # Spec 파일 저장
             spec_file_path = self._save_spec_file(issue.get('key'), material_spec)
@@ -472,9 +825,11 @@ class IssueProcessor:
             # 2. 브랜치 생성
             branch_name = self._generate_branch_name(issue)
             logger.info(f"Step 2: 브랜치 생성 중: {branch_name}")
+            report_stage('branch_creation')
             
             try:
-                self.bitbucket_api.create_branch(branch_name)
+                with stage('branch_creation'):
+                    self.bitbucket_api.create_branch(branch_name)
                 result['branch_name'] = branch_name
             except Exception as e:
                 logger.error(f"브랜치 생성 실패: {str(e)}")
@@ -486,12 +841,14 @@ class IssueProcessor:
             from app.target_files_config import get_target_files
 
             target_files = get_target_files()
-            files_to_modify = [f['path'] for f in target_files]
+            # 대상 파일(+대체 경로)을 한 번에 병렬 조회
+            files_to_modify, prefetched = self._fetch_target_files(target_files, branch_name)
 
             logger.info(f"수정 대상 파일 {len(files_to_modify)}개: {', '.join(files_to_modify)}")
 
             # 4. 파일 수정 및 커밋 (한 번에 모든 파일 커밋) - 바이너리 모드
             logger.info("Step 4: 파일 수정 및 커밋 중 (인코딩 유지 모드)...")
+            report_stage('file_modification')
             modified_files = []
             file_changes = []  # 커밋할 파일 변경사항 모음
 
@@ -500,125 +857,34 @@ class IssueProcessor:
             encoding_handler = EncodingHandler()
 
             # 4-1. 기존 파일 수정 (내용만 준비, 아직 커밋하지 않음)
-            for file_path in files_to_modify:
-                try:
-                    # ✅ 1. 바이너리로 파일 읽기
-                    current_content_bytes = self.bitbucket_api.get_file_content_raw(
-                        file_path, branch_name
-                    )
-
-                    if current_content_bytes is None:
-                        logger.warning(f"파일을 찾을 수 없음: {file_path}")
-                        continue
-
-                    # ✅ 2. 인코딩 감지
-                    original_encoding = encoding_handler.detect_encoding_with_hint(
-                        current_content_bytes, file_path
-                    )
-                    logger.info(f"파일 인코딩: {original_encoding} ({file_path})")
-
-                    # ✅ 3. 디코딩 (수정 작업용)
-                    current_content, detected_encoding = encoding_handler.decode_with_fallback(
-                        current_content_bytes,
-                        original_encoding
-                    )
-
-                    # 파일별 구현 가이드 로드
-                    guide_content = self.load_guide_file(file_path)
-
-                    # 파일 설정 가져오기 (신규)
-                    file_config = get_file_config(file_path)
-
-                    # 파일 크기 확인
-                    line_count = len(current_content.split('\n'))
-                    logger.info(f"파일 크기: {line_count} 줄")
-
-                    # Clang AST를 사용한 관련 함수 추출 (test_material_db_modification.py와 동일)
-                    logger.info("Clang AST로 관련 함수 추출 중...")
-                    relevant_functions, all_functions = self._extract_relevant_methods(
-                        current_content,
-                        file_config.get('functions', []) if file_config else [],
-                        file_path
-                    )
-                    logger.info(f"총 {len(all_functions)}개 함수 중 {len(relevant_functions)}개 관련 함수 추출")
-
-                    # 관련 함수가 있으면 집중된 프롬프트, 없으면 전체 파일 프롬프트
-                    if relevant_functions:
-                        logger.info(f"✅ {len(relevant_functions)}개 관련 함수 발견 - 집중된 프롬프트 사용")
-                        
-                        # test_material_db_modification.py와 동일한 방식
-                        focused_content = self._build_focused_content(
-                            relevant_functions, all_functions, current_content, file_config
-                        )
-                        
-                        # 프롬프트 생성 (material_spec + implementation_guide 포함)
-                        prompt = self._build_modification_prompt_with_spec(
-                            file_path, focused_content, material_spec, guide_content, file_config,
-                            all_functions, current_content
-                        )
-                        
-                        # 직접 LLM 호출 (generate_code_diff 대신)
-                        diffs = self._call_llm_with_prompt(prompt, file_path)
-                        
-                    else:
-                        logger.warning(f"❌ 관련 함수 없음 - 전체 파일 프롬프트 사용 ({line_count} 줄)")
-                        
-                        # 전체 파일 프롬프트 (test_material_db_modification.py와 동일)
-                        prompt = self.prompt_builder.build_modification_prompt(
-                            file_config if file_config else {'path': file_path, 'functions': [], 'description': '', 'section': ''},
-                            current_content,
-                            material_spec,  # Material DB Spec 전체
-                            guide_content   # 구현 가이드
-                        )
-
-                        # 직접 LLM 호출 (test와 동일한 방식)
-                        diffs = self._call_llm_with_prompt(prompt, file_path)
-
-                    # diff를 실제 코드에 적용
-                    modified_content = self.llm_handler.apply_diff_to_content(current_content, diffs)
-
-                    # Diff 텍스트 생성 (테스트 출력용)
-                    diff_text = self._generate_diff_text(current_content, modified_content, file_path)
-
-                    # ✅ 7. 원본 인코딩으로 다시 인코딩
-                    modified_content_bytes = encoding_handler.encode_preserving_original(
-                        modified_content,
-                        detected_encoding
-                    )
-
-                    # ✅ 8. 바이너리로 커밋 준비
-                    file_changes.append({
-                        'path': file_path,
-                        'content_bytes': modified_content_bytes,  # 바이너리!
-                        'action': 'update'
-                    })
-
-                    modified_files.append({
-                        'path': file_path,
-                        'action': 'modified',
-                        'diff_count': len(diffs),
-                        'encoding': detected_encoding,
-                        'modified_content': modified_content,  # 수정된 전체 내용 (확인용)
-                        'diff': diff_text  # Diff 텍스트
-                    })
-
-                    logger.info(f"파일 수정 준비 완료: {file_path} ({len(diffs)}개 변경사항, 인코딩: {detected_encoding})")
-
-                except Exception as e:
-                    logger.error(f"파일 수정 실패 ({file_path}): {str(e)}")
-                    result['errors'].append(f"파일 수정 실패 ({file_path}): {str(e)}")
+            # 파일별 파이프라인을 병렬 실행한 뒤 대상 파일 순서대로 결과 수집
+            file_outcomes = self._run_file_pipelines(
+                files_to_modify, branch_name, material_spec, encoding_handler, prefetched
+            )
+            # 원본 바이트는 더 이상 필요 없으므로 커밋 전에 해제 (커밋 중에는 수정본만 유지)
+            prefetched = None
+            for file_path, outcome, error in file_outcomes:
+                if error is not None:
+                    logger.error(f"파일 수정 실패 ({file_path}): {str(error)}")
+                    result['errors'].append(f"파일 수정 실패 ({file_path}): {str(error)}")
+                elif outcome is not None:
+                    file_change, modified_file = outcome
+                    file_changes.append(file_change)
+                    modified_files.append(modified_file)
 
             # ✅ 4-2. 모든 파일 변경사항을 바이너리로 한 번에 커밋
             if file_changes:
+                report_stage('commit')
                 try:
                     commit_message = f"[{issue.get('key')}] {issue.get('fields', {}).get('summary', 'SDB 기능 추가')}"
 
                     # 바이너리 다중 파일 커밋 (인코딩 유지)
-                    self.bitbucket_api.commit_multiple_files_binary(
-                        branch_name,
-                        file_changes,
-                        commit_message
-                    )
+                    with stage('commit'):
+                        self.bitbucket_api.commit_multiple_files_binary(
+                            branch_name,
+                            file_changes,
+                            commit_message
+                        )
 
                     logger.info(f"바이너리 모드로 커밋 완료: {len(file_changes)}개 파일 (인코딩 유지)")
 
@@ -649,16 +915,18 @@ class IssueProcessor:
             # 5. Pull Request 생성
             if modified_files:
                 logger.info("Step 6: Pull Request 생성 중...")
+                report_stage('pull_request')
                 pr_title = f"[{issue.get('key')}] {issue.get('fields', {}).get('summary', 'SDB 기능 추가')}"
                 pr_description = self._generate_pr_description(issue, modified_files)
                 
                 try:
-                    pr_data = self.bitbucket_api.create_pull_request(
-                        branch_name,
-                        'master',
-                        pr_title,
-                        pr_description
-                    )
+                    with stage('pull_request'):
+                        pr_data = self.bitbucket_api.create_pull_request(
+                            branch_name,
+                            'master',
+                            pr_title,
+                            pr_description
+                        )
                     
                     result['pr_url'] = pr_data.get('links', {}).get('html', {}).get('href')
                     result['status'] = 'completed'
@@ -784,6 +1052,7 @@ class IssueProcessor:
         # 수정된 파일 목록
         file_list = "\n".join([
             f"- {file['path']} ({file['action']})"
+            + (f" ⚠️ 구문 에러 의심 {len(file['syntax_errors'])}개" if file.get('syntax_errors') else "")
             for file in modified_files
         ])
 
@@ -0,0 +1,437 @@
+"""
+비동기 작업 큐 - 웹훅에서 받은 이슈를 큐에 넣고 워커 풀에서 처리
+in-process(memory), 파일 기반(file), Celery 백엔드 지원
+"""
+
+import os
+import json
+import uuid
+import queue
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _finished_before(job: Dict, cutoff: datetime) -> bool:
+    """완료/실패한 작업 중 cutoff 이전에 끝난 작업인지 (대기/실행 중 작업은 보관)"""
+    if job.get('status') in ACTIVE_STATUSES:
+        return False
+    finished_at = job.get('finished_at') or job.get('updated_at')
+    try:
+        return finished_at is not None and datetime.fromisoformat(finished_at) < cutoff
+    except (TypeError, ValueError):
+        return False
+
+
+class MemoryJobStore:
+    """
+    프로세스 메모리에 작업 상태 저장 (오프라인/테스트용)
+
+    끝난 작업은 retention_hours가 지나면 save 시점에 정리 (0이면 보관 기간 제한 없음)
+    """
+
+    def __init__(self, retention_hours: Optional[float] = None):
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if retention_hours is None:
+            retention_hours = float(os.getenv('JOB_RETENTION_HOURS', '24'))
+        self.retention = timedelta(hours=retention_hours) if retention_hours > 0 else None
+
+    def save(self, job: Dict):
+        with self._lock:
+            self._jobs[job['job_id']] = dict(job)
+        self.prune()
+
+    def prune(self) -> int:
+        """보관 기간이 지난 완료/실패 작업 삭제 후 삭제한 수 반환"""
+        if self.retention is None:
+            return 0
+        cutoff = datetime.now() - self.retention
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if _finished_before(job, cutoff)]
+            for job_id in expired:
+                del self._jobs[job_id]
+        if expired:
+            logger.info(f"오래된 작업 {len(expired)}개 정리")
+        return len(expired)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> Optional[Dict]:
+        """작업 필드 일부 갱신 후 갱신된 작업 반환"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job['updated_at'] = _now()
+            updated = dict(job)
+        self._persist(updated)
+        return updated
+
+    def find_active(self, issue_key: str) -> Optional[Dict]:
+        """같은 이슈의 대기/실행 중 작업 찾기 (Jira 재전송 중복 방지, 이 프로세스에서 등록한 작업만)"""
+        if not issue_key:
+            return None
+        with self._lock:
+            for job in self._jobs.values():
+                if job.get('issue_key') == issue_key and job.get('status') in ACTIVE_STATUSES:
+                    return dict(job)
+        return None
+
+    def _persist(self, job: Dict):
+        """하위 클래스에서 영속화 (메모리 저장소는 불필요)"""
+        pass
+
+
+class FileJobStore(MemoryJobStore):
+    """
+    작업 상태를 JSON 파일로 저장 (다른 gunicorn 워커/재시작 후에도 작업 조회 가능)
+
+    중복 이슈 판별(find_active)은 프로세스별이므로 같은 이슈의 재전송이
+    다른 워커로 가면 작업이 하나 더 생성될 수 있음
+    보관 기간이 지난 작업 파일은 DISK_PRUNE_INTERVAL 간격으로 save 시점에 삭제
+    """
+
+    DISK_PRUNE_INTERVAL = 600  # 초
+
+    def __init__(self, jobs_dir: str = 'jobs', retention_hours: Optional[float] = None):
+        super().__init__(retention_hours)
+        self.jobs_dir = jobs_dir
+        self._last_disk_prune = 0.0
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def _job_path(self, job_id: str) -> str:
+        # 경로 조작 방지 (job_id는 uuid hex)
+        safe_id = ''.join(c for c in job_id if c.isalnum() or c in '-_')
+        return os.path.join(self.jobs_dir, f'{safe_id}.json')
+
+    def save(self, job: Dict):
+        super().save(job)
+        self._persist(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = super().get(job_id)
+        if job is not None:
+            return job
+
+        # 다른 프로세스가 생성한 작업일 수 있으므로 디스크 확인
+        job_path = self._job_path(job_id)
+        if not os.path.exists(job_path):
+            return None
+        try:
+            with open(job_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"작업 파일 읽기 실패 ({job_path}): {e}")
+            return None
+
+    def prune(self) -> int:
+        """메모리 정리 후 보관 기간이 지난 작업 파일 삭제 (다른 프로세스가 만든 파일 포함)"""
+        removed = super().prune()
+        now = time.time()
+        if self.retention is None or now - self._last_disk_prune < self.DISK_PRUNE_INTERVAL:
+            return removed
+        self._last_disk_prune = now
+
+        cutoff = datetime.now() - self.retention
+        cutoff_ts = now - self.retention.total_seconds()
+        for entry in os.scandir(self.jobs_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                # 마지막 갱신 이후 보관 기간이 지나지 않은 파일은 읽지 않음
+                if entry.stat().st_mtime >= cutoff_ts:
+                    continue
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+                if _finished_before(job, cutoff):
+                    os.unlink(entry.path)
+                    removed += 1
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"작업 파일 정리 실패 ({entry.path}): {e}")
+        return removed
+
+    def _persist(self, job: Dict):
+        job_path = self._job_path(job['job_id'])
+        tmp_path = f"{job_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(job, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_path, job_path)
+        except OSError as e:
+            logger.error(f"작업 파일 저장 실패 ({job_path}): {e}")
+
+
+class JobQueue:
+    """
+    스레드 워커 풀 기반 작업 큐
+
+    handler(issue, report_stage) 형태의 처리 함수를 받아
+    큐에 들어온 이슈를 순서대로 처리하고 단계/결과를 저장소에 기록
+    """
+
+    def __init__(self, handler: Callable, store: Optional[MemoryJobStore] = None, workers: int = 2):
+        self.handler = handler
+        self.store = store or MemoryJobStore()
+        self.workers = max(1, workers)
+        self._queue: queue.Queue = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        """첫 작업이 들어올 때 워커 스레드 시작 (import 시 부작용 방지)"""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f'job-worker-{i}',
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"작업 큐 워커 {self.workers}개 시작")
+
+    def enqueue(self, issue: Dict) -> Dict:
+        """
+        이슈를 큐에 추가
+
+        Args:
+            issue: Jira 이슈 정보
+
+        Returns:
+            작업 정보 (같은 이슈가 처리 중이면 기존 작업, duplicate=True)
+        """
+        issue_key = issue.get('key')
+        existing = self.store.find_active(issue_key)
+        if existing:
+            logger.info(f"이미 처리 중인 이슈: {issue_key} (job {existing['job_id']})")
+            existing['duplicate'] = True
+            return existing
+
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'issue_key': issue_key,
+            'status': JOB_QUEUED,
+            'stage': JOB_QUEUED,
+            'result': None,
+            'error': None,
+            'created_at': _now(),
+            'updated_at': _now(),
+            'started_at': None,
+            'finished_at': None
+        }
+        self.store.save(job)
+
+        self._ensure_started()
+        self._queue.put((job['job_id'], issue))
+        logger.info(f"작업 큐 등록: {issue_key} (job {job['job_id']}, 대기 {self._queue.qsize()}개)")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def join(self):
+        """큐가 빌 때까지 대기 (테스트/종료용)"""
+        self._queue.join()
+
+    def _worker_loop(self):
+        while True:
+            job_id, issue = self._queue.get()
+            try:
+                self._run_job(job_id, issue)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: str, issue: Dict):
+        self.store.update(job_id, status=JOB_RUNNING, stage='started', started_at=_now())
+
+        def report_stage(stage: str):
+            self.store.update(job_id, stage=stage)
+
+        try:
+            result = self.handler(issue, report_stage)
+            status = JOB_FAILED if isinstance(result, dict) and result.get('status') == 'failed' else JOB_COMPLETED
+            self.store.update(
+                job_id, status=status, stage='finished',
+                result=result, finished_at=_now()
+            )
+            logger.info(f"작업 완료: job {job_id} ({status})")
+        except Exception as e:
+            logger.error(f"작업 처리 중 오류 (job {job_id}): {str(e)}", exc_info=True)
+            self.store.update(
+                job_id, status=JOB_FAILED, stage='finished',
+                error=str(e), finished_at=_now()
+            )
+
+
+class CeleryJobQueue:
+    """
+    Celery 기반 작업 큐 (redis 브로커)
+
+    워커 실행: celery -A app.job_queue:celery_app worker
+    같은 이슈 중복 판별은 하지 않음 (Jira 재전송마다 새 작업 등록)
+    완료된 작업 결과는 CELERY_RESULT_EXPIRES가 지나면 브로커 결과 백엔드에서 삭제
+    등록 시 결과 백엔드에 QUEUED 상태를 먼저 기록하므로, 기록이 없는 작업 ID(PENDING)는 없는 작업으로 처리
+    """
+
+    # 등록 직후 결과 백엔드에 기록하는 상태 (Celery는 모르는 ID도 PENDING으로 보고하므로 구분용)
+    QUEUED_STATE = 'QUEUED'
+
+    # Celery 상태 → 작업 상태
+    STATE_MAP = {
+        QUEUED_STATE: JOB_QUEUED,
+        'RECEIVED': JOB_QUEUED,
+        'STARTED': JOB_RUNNING,
+        'PROGRESS': JOB_RUNNING,
+        'RETRY': JOB_RUNNING,
+        'SUCCESS': JOB_COMPLETED,
+        'FAILURE': JOB_FAILED,
+        'REVOKED': JOB_FAILED
+    }
+
+    def __init__(self):
+        self.celery_app = get_celery_app()
+
+    def enqueue(self, issue: Dict) -> Dict:
+        job_id = uuid.uuid4().hex
+        # 워커가 STARTED를 기록하기 전에 먼저 남겨야 덮어쓰지 않음
+        self.celery_app.backend.store_result(
+            job_id, {'issue_key': issue.get('key'), 'stage': JOB_QUEUED}, self.QUEUED_STATE
+        )
+        self.celery_app.send_task(
+            'app.job_queue.process_issue_task', args=[issue], task_id=job_id
+        )
+        logger.info(f"Celery 작업 등록: {issue.get('key')} (job {job_id})")
+        return {
+            'job_id': job_id,
+            'issue_key': issue.get('key'),
+            'status': JOB_QUEUED,
+            'stage': JOB_QUEUED,
+            'created_at': _now()
+        }
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        async_result = self.celery_app.AsyncResult(job_id)
+        state = async_result.state
+        if state == 'PENDING':
+            # 등록한 적 없거나 결과가 만료된 작업
+            return None
+        info = async_result.info if isinstance(async_result.info, dict) else {}
+        status = self.STATE_MAP.get(state, JOB_RUNNING)
+        # process_issue는 예외를 직접 처리하고 실패 결과를 반환하므로 SUCCESS여도 결과 확인 (JobQueue와 동일)
+        if state == 'SUCCESS' and info.get('status') == 'failed':
+            status = JOB_FAILED
+        job = {
+            'job_id': job_id,
+            'issue_key': info.get('issue_key'),
+            'status': status,
+            'stage': info.get('stage', state.lower()),
+            'result': async_result.result if state == 'SUCCESS' else None,
+            'error': str(async_result.result) if state == 'FAILURE' else None
+        }
+        return job
+
+    def pending_count(self) -> int:
+        return -1  # 브로커 큐 길이는 조회하지 않음
+
+
+_celery_app = None
+
+
+def get_celery_app():
+    """Celery 앱 지연 생성 (celery 미설치 환경에서도 모듈 import 가능)"""
+    global _celery_app
+    if _celery_app is not None:
+        return _celery_app
+
+    from celery import Celery
+
+    broker_url = os.getenv('CELERY_BROKER_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    backend_url = os.getenv('CELERY_RESULT_BACKEND', broker_url)
+
+    celery_app = Celery('sdb_agent', broker=broker_url, backend=backend_url)
+    celery_app.conf.update(
+        task_track_started=True,
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        result_expires=int(os.getenv('CELERY_RESULT_EXPIRES', '86400'))
+    )
+
+    @celery_app.task(bind=True, name='app.job_queue.process_issue_task')
+    def process_issue_task(self, issue):
+        # 워커 프로세스에서 클라이언트 구성 (app.main과 동일 설정)
+        from app.main import issue_processor
+
+        def report_stage(stage):
+            self.update_state(state='PROGRESS', meta={'stage': stage, 'issue_key': issue.get('key')})
+
+        return issue_processor.process_issue(issue, report_stage)
+
+    _celery_app = celery_app
+    return _celery_app
+
+
+def __getattr__(name):
+    # `celery -A app.job_queue:celery_app` 지원
+    if name == 'celery_app':
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_job_queue(handler: Callable, backend: str = 'memory', workers: int = 2,
+                     jobs_dir: str = 'jobs'):
+    """
+    설정에 맞는 작업 큐 생성
+
+    Args:
+        handler: handler(issue, report_stage) 처리 함수
+        backend: 'memory' | 'file' | 'celery'
+        workers: in-process 워커 스레드 수
+        jobs_dir: 파일 백엔드 저장 디렉토리
+
+    Returns:
+        JobQueue 또는 CeleryJobQueue
+    """
+    backend = (backend or 'memory').lower()
+
+    if backend == 'celery':
+        try:
+            return CeleryJobQueue()
+        except ImportError:
+            logger.warning("celery 미설치. in-process 작업 큐로 폴백합니다.")
+            backend = 'memory'
+
+    if backend == 'file':
+        store = FileJobStore(jobs_dir)
+    else:
+        store = MemoryJobStore()
+
+    logger.info(f"작업 큐 백엔드: {backend} (워커 {workers}개)")
+    return JobQueue(handler, store=store, workers=workers)
@@ -4,7 +4,7 @@
 
 import logging
 from typing import Dict, List, Optional
-from app.code_chunker import CodeChunker, TemplateBasedGenerator
+from app.code_chunker import TemplateBasedGenerator, get_code_chunker
 from app.llm_handler import LLMHandler
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ class LargeFileHandler:
 
     def __init__(self, llm_handler: LLMHandler):
         self.llm_handler = llm_handler
-        self.chunker = CodeChunker()
+        self.chunker = get_code_chunker()
         self.template_gen = TemplateBasedGenerator(llm_handler)
 
     def _is_macro_file(self, file_path: str, issue_description: str) -> bool:
@@ -441,8 +441,7 @@ class LargeFileHandler:
                 return self._generate_mock_code(issue_description, similar_examples)
 
             # OpenAI API 호출
-            response = self.llm_handler.client.chat.completions.create(
-                model=self.llm_handler.model,
+            generated_code = self.llm_handler.chat_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -451,8 +450,6 @@ class LargeFileHandler:
                 max_tokens=4000
             )
 
-            generated_code = response.choices[0].message.content
-
             # 코드 블록 추출
             if "```" in generated_code:
                 generated_code = self.llm_handler._extract_code_from_response(generated_code)
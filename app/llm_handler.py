@@ -5,33 +5,53 @@ LLM 핸들러 - OpenAI API를 사용한 코드 생성 및 수정
 import os
 import json
 import logging
+import threading
 from typing import Dict, List, Optional, Any
 from difflib import unified_diff
+from app.cache_store import TieredCache, make_cache_key
+from app.async_llm import get_llm_runtime, estimate_tokens
+from app.metrics import record_llm_usage, record_llm_error, fail_stage
 
 logger = logging.getLogger(__name__)
 
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    LLM 응답 캐시 (프로세스 공유, 메모리 LRU + 디스크)
+
+    LLM_CACHE_ENABLED=false이면 None
+    """
+    global _llm_cache
+    if os.getenv('LLM_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                ttl = float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+                _llm_cache = TieredCache(
+                    'llm_responses',
+                    memory_entries=int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', '128')),
+                    max_bytes=int(os.getenv('LLM_CACHE_MAX_MB', '512')) * 1024 * 1024,
+                    ttl=ttl if ttl > 0 else None
+                )
+    return _llm_cache
+
 
 class LLMHandler:
     """LLM을 사용한 코드 생성 및 수정 핸들러"""
     
     def __init__(self):
         self.api_key = os.getenv('OPENAI_API_KEY')
-        self.client = None
+        # OpenAI 클라이언트는 첫 사용 시 생성 (openai 패키지 import 비용을 워커 기동에서 제외)
+        self._client = None
+        self._client_initialized = False
+        self._client_lock = threading.Lock()
 
         if not self.api_key:
             logger.warning("OpenAI API 키가 설정되지 않았습니다. Mock 모드로 실행합니다.")
-        else:
-            try:
-                from openai import OpenAI
-                # OpenAI 1.x 버전 방식
-                self.client = OpenAI(
-                    api_key=self.api_key,
-                    timeout=60.0  # 60초 타임아웃
-                )
-                logger.info("OpenAI 클라이언트 초기화 완료 (v1.x)")
-            except Exception as e:
-                logger.error(f"OpenAI 클라이언트 초기화 실패: {str(e)}")
-                logger.warning("Mock 모드로 계속 진행합니다")
 
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4o')
 
@@ -41,6 +61,116 @@ class LLMHandler:
         # Few-shot 예제 저장소
         self.few_shot_examples = []
 
+    @property
+    def client(self):
+        """OpenAI 비동기 클라이언트 (API 키가 없거나 생성 실패 시 None → Mock 모드)"""
+        if not self._client_initialized:
+            with self._client_lock:
+                if not self._client_initialized:
+                    self._client = self._create_client()
+                    self._client_initialized = True
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_initialized = True
+
+    def _create_client(self):
+        if not self.api_key:
+            return None
+        try:
+            from openai import AsyncOpenAI
+            # OpenAI 1.x 비동기 클라이언트 (호출은 LLM 런타임 루프에서만 실행)
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=60.0  # 60초 타임아웃
+            )
+            logger.info("OpenAI 비동기 클라이언트 초기화 완료 (v1.x)")
+            return client
+        except Exception as e:
+            logger.error(f"OpenAI 클라이언트 초기화 실패: {str(e)}")
+            logger.warning("Mock 모드로 계속 진행합니다")
+            return None
+
+    def chat_completion(self, messages: List[Dict], temperature: float,
+                        max_tokens: Optional[int] = None, model: Optional[str] = None,
+                        use_cache: bool = True) -> str:
+        """
+        Chat Completion 동기 호출 (achat_completion 래퍼)
+
+        Args:
+            messages: OpenAI 메시지 리스트
+            temperature: 샘플링 온도
+            max_tokens: 최대 토큰 수 (None이면 self.max_tokens)
+            model: 모델명 (None이면 self.model)
+            use_cache: 캐시 사용 여부
+
+        Returns:
+            응답 메시지 내용
+        """
+        return get_llm_runtime().run(
+            self.achat_completion(messages, temperature, max_tokens, model, use_cache)
+        )
+
+    async def achat_completion(self, messages: List[Dict], temperature: float,
+                               max_tokens: Optional[int] = None, model: Optional[str] = None,
+                               use_cache: bool = True) -> str:
+        """
+        Chat Completion 비동기 호출 (응답 캐시 + 전역 동시성/RPM/TPM 제한)
+
+        동일한 (model, temperature, max_tokens, messages) 조합은 캐시된 응답을 반환
+        LLM_CACHE_BYPASS=true 또는 use_cache=False이면 캐시를 읽지 않고 새로 호출
+        어느 이벤트 루프에서 호출해도 실제 API 호출은 공유 LLM 런타임 루프에서 실행
+
+        Returns:
+            응답 메시지 내용
+        """
+        model = model or self.model
+        max_tokens = max_tokens or self.max_tokens
+
+        cache = get_llm_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = make_cache_key(model, temperature, max_tokens, messages)
+            bypass = not use_cache or os.getenv('LLM_CACHE_BYPASS', 'false').lower() == 'true'
+            if not bypass:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"LLM 응답 캐시 적중 ({model}, {len(cached)} characters)")
+                    record_llm_usage(model, cached=True)
+                    return cached
+
+        runtime = get_llm_runtime()
+        try:
+            response = await runtime.run_on_loop(runtime.call(
+                lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ),
+                estimate_tokens(messages, max_tokens)
+            ))
+        except Exception:
+            record_llm_error(model)
+            raise
+        record_llm_usage(model, getattr(response, 'usage', None))
+        content = response.choices[0].message.content
+
+        if cache is not None and content:
+            cache.set(cache_key, content)
+        return content
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """LLM 응답 캐시 통계"""
+        cache = get_llm_cache()
+        return cache.stats() if cache is not None else {}
+
+    def limiter_stats(self) -> Dict[str, Any]:
+        """전역 LLM 동시성/RPM/TPM 제한 상태"""
+        return get_llm_runtime().stats()
+
     def format_code_with_line_numbers(self, content: str, start_line: int) -> str:
         """
         코드에 라인 번호 prefix 추가
@@ -163,7 +293,19 @@ class LLMHandler:
     
     def convert_issue_to_spec(self, issue: Dict) -> str:
         """
-        Jira 이슈(ADF 형식)를 Spec_File.md 형식으로 변환
+        Jira 이슈(ADF 형식)를 Spec_File.md 형식으로 변환 (aconvert_issue_to_spec 동기 래퍼)
+        
+        Args:
+            issue: Jira 이슈 dict (description에 ADF JSON 포함)
+        
+        Returns:
+            Spec 형식의 마크다운 문자열
+        """
+        return get_llm_runtime().run(self.aconvert_issue_to_spec(issue))
+
+    async def aconvert_issue_to_spec(self, issue: Dict) -> str:
+        """
+        Jira 이슈(ADF 형식)를 Spec_File.md 형식으로 변환 (비동기)
         
         Args:
             issue: Jira 이슈 dict (description에 ADF JSON 포함)
@@ -236,23 +378,21 @@ doc/Spec_File.md와 동일한 마크다운 형식의 명세서로 변환하세
 **중요**: JSON이나 코드 블록으로 감싸지 말고, 순수 마크다운만 출력하세요."""
 
             # LLM 호출
-            response = self.client.chat.completions.create(
-                model=self.model,
+            spec_content = await self.achat_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.1,  # 정확한 변환을 위해 낮은 temperature
-                max_tokens=self.max_tokens
+                temperature=0.1  # 정확한 변환을 위해 낮은 temperature
             )
-            
-            spec_content = response.choices[0].message.content
             logger.info(f"Spec 변환 완료: {len(spec_content)} characters")
             
             return spec_content
             
         except Exception as e:
             logger.error(f"Spec 변환 실패: {str(e)}")
+            # 요약으로 계속 진행하지만 spec_conversion 단계는 실패로 집계
+            fail_stage(str(e))
             # Fallback: 간단한 요약 반환
             summary = issue.get('fields', {}).get('summary', '')
             return f"# Material DB 명세서\n\n## 기본 정보\n- 요약: {summary}\n\n(상세 변환 실패)"
@@ -260,7 +400,16 @@ doc/Spec_File.md와 동일한 마크다운 형식의 명세서로 변환하세
     def generate_code_diff(self, file_path: str, current_content: str,
                           issue_description: str, project_context: Dict) -> List[Dict]:
         """
-        파일 수정을 위한 diff 정보 생성 (IDE 스타일)
+        파일 수정을 위한 diff 정보 생성 (agenerate_code_diff 동기 래퍼)
+        """
+        return get_llm_runtime().run(
+            self.agenerate_code_diff(file_path, current_content, issue_description, project_context)
+        )
+
+    async def agenerate_code_diff(self, file_path: str, current_content: str,
+                                  issue_description: str, project_context: Dict) -> List[Dict]:
+        """
+        파일 수정을 위한 diff 정보 생성 (IDE 스타일, 비동기)
 
         Args:
             file_path: 파일 경로
@@ -370,18 +519,14 @@ action 타입:
 """
 
             # OpenAI 1.x 방식
-            response = self.client.chat.completions.create(
-                model=self.model,
+            content = await self.achat_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.1,
-                max_tokens=self.max_tokens
+                temperature=0.1
             )
 
-            content = response.choices[0].message.content
-
             # JSON 응답 파싱
             try:
                 # 마크다운 코드 블록에서 JSON 추출
@@ -518,17 +663,15 @@ action 타입:
 """
             
             # OpenAI 1.x 방식
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response_content = self.chat_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.3,
-                max_tokens=self.max_tokens
+                temperature=0.3
             )
             
-            new_code = self._extract_code_from_response(response.choices[0].message.content)
+            new_code = self._extract_code_from_response(response_content)
             logger.info(f"새 파일 생성 완료: {file_path}")
             return new_code
             
@@ -6,22 +6,31 @@ Jira 이슈 기반 자동 소스코드 수정 및 PR 생성
 import os
 import json
 import logging
-from flask import Flask, request, jsonify
+import threading
+from flask import Flask, Response, request, jsonify
 from datetime import datetime
 
 # 로컬 모듈 임포트
 try:
     from app.bitbucket_api import BitbucketAPI
+    from app.git_mirror_backend import create_repository_backend
     from app.llm_handler import LLMHandler
     from app.issue_processor import IssueProcessor
+    from app.job_queue import create_job_queue
+    from app.metrics import render_metrics
+    from app.async_llm import get_llm_runtime
 except ImportError:
     # 직접 실행시를 위한 상대 경로 임포트
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     from bitbucket_api import BitbucketAPI
+    from git_mirror_backend import create_repository_backend
     from llm_handler import LLMHandler
     from issue_processor import IssueProcessor
+    from job_queue import create_job_queue
+    from metrics import render_metrics
+    from async_llm import get_llm_runtime
 
 # Flask 애플리케이션 초기화
 app = Flask(__name__)
@@ -56,18 +65,79 @@ bitbucket_api = BitbucketAPI(
     repository=REPOSITORY_SLUG
 )
 
-# 토큰 유효성 검증
-if BITBUCKET_ACCESS_TOKEN:
-    is_valid, repo_data = bitbucket_api.validate_token()
+# 토큰 유효성 검증 상태 (import 시점에 네트워크 호출하지 않고 첫 요청 때 백그라운드 검증)
+token_status = {
+    'state': 'pending' if BITBUCKET_ACCESS_TOKEN else 'missing',
+    'repository': None,
+    'checked_at': None
+}
+_token_validation_started = False
+_token_validation_lock = threading.Lock()
+
+if not BITBUCKET_ACCESS_TOKEN:
+    logger.warning("BITBUCKET_ACCESS_TOKEN이 설정되지 않았습니다.")
+
+
+def _validate_token():
+    """Bitbucket 토큰 검증 후 token_status 갱신 (백그라운드 스레드)"""
+    token_status['state'] = 'checking'
+    try:
+        is_valid, repo_data = bitbucket_api.validate_token()
+    except Exception as e:
+        logger.warning(f"Bitbucket 토큰 검증 중 오류: {str(e)}")
+        is_valid, repo_data = False, None
+
     if is_valid:
-        logger.info(f"Bitbucket API 연결 성공! 저장소: {repo_data.get('name', 'Unknown')}")
+        token_status['repository'] = (repo_data or {}).get('name', 'Unknown')
+        token_status['state'] = 'valid'
+        logger.info(f"Bitbucket API 연결 성공! 저장소: {token_status['repository']}")
     else:
+        token_status['state'] = 'invalid'
         logger.warning("Bitbucket 토큰 검증 실패. 일부 기능이 제한될 수 있습니다.")
-else:
-    logger.warning("BITBUCKET_ACCESS_TOKEN이 설정되지 않았습니다.")
+    token_status['checked_at'] = datetime.now().isoformat()
+
+
+def start_token_validation():
+    """토큰 검증을 백그라운드에서 1회 시작 (토큰이 없으면 무시)"""
+    global _token_validation_started
+    if not BITBUCKET_ACCESS_TOKEN or _token_validation_started:
+        return
+    with _token_validation_lock:
+        if _token_validation_started:
+            return
+        _token_validation_started = True
+    threading.Thread(target=_validate_token, name='token-validation', daemon=True).start()
+
+# 파일 읽기/커밋 백엔드 (REPOSITORY_BACKEND: rest(기본) | git_mirror)
+repository_backend = create_repository_backend(
+    bitbucket_api,
+    backend=os.getenv('REPOSITORY_BACKEND', 'rest'),
+    mirror_dir=os.getenv('GIT_MIRROR_DIR'),
+    remote_url=os.getenv('GIT_MIRROR_REMOTE_URL')
+)
 
 llm_handler = LLMHandler()
-issue_processor = IssueProcessor(bitbucket_api, llm_handler)
+issue_processor = IssueProcessor(repository_backend, llm_handler)
+
+# libclang 로드와 공유 CodeChunker 생성을 기동 시점에 미리 수행 (기본값: 첫 추출 시 지연 로드)
+if os.getenv('CLANG_PRELOAD', 'false').lower() == 'true':
+    from app.code_chunker import preload_clang
+    preload_clang()
+
+# 작업 큐 초기화 (웹훅은 큐에 넣고 즉시 응답, 워커가 이슈 처리)
+# JOB_QUEUE_BACKEND: memory(기본) | file | celery
+job_queue = create_job_queue(
+    issue_processor.process_issue,
+    backend=os.getenv('JOB_QUEUE_BACKEND', 'memory'),
+    workers=int(os.getenv('JOB_WORKERS', '2')),
+    jobs_dir=os.getenv('JOB_STORE_DIR', 'jobs')
+)
+
+
+@app.before_request
+def _start_background_tasks():
+    """첫 요청 시 지연 초기화 작업 시작"""
+    start_token_validation()
 
 
 @app.route('/health', methods=['GET'])
@@ -76,10 +146,20 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'test_mode': TEST_MODE
+        'test_mode': TEST_MODE,
+        'pending_jobs': job_queue.pending_count(),
+        'bitbucket_token': dict(token_status),
+        'bitbucket_rate_limit': bitbucket_api.get_rate_limit_stats(),
+        'llm_rate_limit': get_llm_runtime().stats()
     }), 200
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 메트릭 (단계별 지연 시간, LLM 토큰, 에러 수)"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/webhook', methods=['POST'])
 def webhook_handler():
     """
@@ -107,14 +187,16 @@ def webhook_handler():
             if 'SDB' in issue_type or 'SDB 개발' in issue.get('fields', {}).get('summary', ''):
                 logger.info(f"SDB 개발 요청 감지: {issue.get('key')}")
                 
-                # 비동기로 처리 (실제 환경에서는 Celery 등 사용 권장)
-                result = issue_processor.process_issue(issue)
+                # 작업 큐에 등록 후 즉시 응답 (Jira 타임아웃/재전송 방지)
+                job = job_queue.enqueue(issue)
                 
                 return jsonify({
-                    'status': 'processing',
+                    'status': 'queued',
                     'issue_key': issue.get('key'),
-                    'result': result
-                }), 200
+                    'job_id': job['job_id'],
+                    'duplicate': job.get('duplicate', False),
+                    'status_url': f"/jobs/{job['job_id']}"
+                }), 202
             else:
                 logger.info("SDB 개발 요청이 아닙니다. 무시합니다.")
                 return jsonify({'status': 'ignored', 'reason': 'Not SDB issue'}), 200
@@ -126,6 +208,15 @@ def webhook_handler():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """작업 진행 단계 및 결과 조회"""
+    job = job_queue.get_job(job_id)
+    if not job:
+        return jsonify({'error': '작업을 찾을 수 없습니다.', 'job_id': job_id}), 404
+    return jsonify(job), 200
+
+
 if __name__ == '__main__':
     # Railway 프로덕션 환경용 포트 설정
     port = int(os.environ.get('PORT', 5000))
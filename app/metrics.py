@@ -0,0 +1,350 @@
+"""
+단계별 지연 시간/토큰/에러 메트릭
+Prometheus 텍스트 형식(/metrics)으로 노출하고, 이슈별 요약은 처리 결과에 첨부
+"""
+
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Gauge:
+    """현재 값을 나타내는 게이지"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> Optional[float]:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._values.get(key)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values: Dict[Tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._values[key] = data
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data['counts'][i] += 1
+            data['sum'] += value
+            data['count'] += 1
+
+    def count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        data = self._values.get(key)
+        return data['count'] if data else 0
+
+    def collect(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, dict(data, counts=list(data['counts']))) for key, data in self._values.items())
+        for key, data in items:
+            for bound, count in zip(self.buckets, data['counts']):
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{labels} {data['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 및 Prometheus 텍스트 형식 출력"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'sdb_stage_duration_seconds', '이슈 처리 단계별 소요 시간', ['stage']
+))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    'sdb_stage_errors_total', '이슈 처리 단계별 에러 수', ['stage']
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    'sdb_llm_tokens_total', 'OpenAI 토큰 사용량', ['model', 'type']
+))
+LLM_REQUESTS = REGISTRY.register(Counter(
+    'sdb_llm_requests_total', 'LLM 호출 수 (api | cache_hit | error)', ['model', 'result']
+))
+ISSUES_PROCESSED = REGISTRY.register(Counter(
+    'sdb_issues_processed_total', '처리 완료된 이슈 수', ['status']
+))
+BITBUCKET_THROTTLED = REGISTRY.register(Counter(
+    'sdb_bitbucket_throttled_total', 'Bitbucket 429 응답 수'
+))
+BITBUCKET_RETRIES = REGISTRY.register(Counter(
+    'sdb_bitbucket_retries_total', 'Bitbucket 요청 재시도 수 (throttled | server_error | connection_error)', ['reason']
+))
+BITBUCKET_QUOTA_REMAINING = REGISTRY.register(Gauge(
+    'sdb_bitbucket_quota_remaining', 'X-RateLimit-Remaining 기준 남은 Bitbucket 호출 수'
+))
+BITBUCKET_CONCURRENCY_LIMIT = REGISTRY.register(Gauge(
+    'sdb_bitbucket_concurrency_limit', '429에 따라 조정된 Bitbucket 동시 요청 한도'
+))
+
+
+class IssueMetrics:
+    """이슈 1건의 단계별 시간/토큰 기록 (파일 파이프라인 스레드에서 공유)"""
+
+    def __init__(self, issue_key: Optional[str] = None):
+        self.issue_key = issue_key
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: List[Dict[str, Any]] = []
+        self.tokens = {'prompt': 0, 'completion': 0, 'total': 0}
+        self.llm_calls = 0
+        self.llm_cache_hits = 0
+
+    def add_stage(self, stage: str, seconds: float, file_path: Optional[str], error: Optional[str]):
+        with self._lock:
+            self.stages.append({'stage': stage, 'file': file_path, 'seconds': seconds, 'error': error})
+
+    def add_llm_call(self, prompt_tokens: int, completion_tokens: int, cached: bool):
+        with self._lock:
+            if cached:
+                self.llm_cache_hits += 1
+                return
+            self.llm_calls += 1
+            self.tokens['prompt'] += prompt_tokens
+            self.tokens['completion'] += completion_tokens
+            self.tokens['total'] += prompt_tokens + completion_tokens
+
+    def summary(self) -> Dict[str, Any]:
+        """result['metrics']에 첨부할 요약"""
+        with self._lock:
+            stages = list(self.stages)
+            tokens = dict(self.tokens)
+
+        by_stage: Dict[str, Dict[str, Any]] = {}
+        by_file: Dict[str, Dict[str, float]] = {}
+        for entry in stages:
+            stats = by_stage.setdefault(entry['stage'], {'count': 0, 'seconds': 0.0, 'errors': 0})
+            stats['count'] += 1
+            stats['seconds'] += entry['seconds']
+            if entry['error']:
+                stats['errors'] += 1
+            if entry['file']:
+                file_stats = by_file.setdefault(entry['file'], {})
+                file_stats[entry['stage']] = round(file_stats.get(entry['stage'], 0.0) + entry['seconds'], 4)
+        for stats in by_stage.values():
+            stats['seconds'] = round(stats['seconds'], 4)
+
+        return {
+            'total_seconds': round(time.perf_counter() - self.started_at, 4),
+            'stages': by_stage,
+            'files': by_file,
+            'tokens': tokens,
+            'llm_calls': self.llm_calls,
+            'llm_cache_hits': self.llm_cache_hits,
+        }
+
+
+_current_issue: contextvars.ContextVar = contextvars.ContextVar('sdb_issue_metrics', default=None)
+
+
+def current_issue_metrics() -> Optional[IssueMetrics]:
+    return _current_issue.get()
+
+
+@contextmanager
+def issue_metrics(issue_key: Optional[str] = None):
+    """
+    이슈 처리 구간 동안 IssueMetrics를 현재 컨텍스트에 설정
+
+    Yields:
+        IssueMetrics
+    """
+    recorder = IssueMetrics(issue_key)
+    token = _current_issue.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_issue.reset(token)
+
+
+_current_stage: contextvars.ContextVar = contextvars.ContextVar('sdb_stage', default=None)
+
+
+@contextmanager
+def stage(name: str, file_path: Optional[str] = None):
+    """
+    단계 소요 시간 측정 (예외 발생 시 에러 카운트 후 다시 raise)
+
+    예외를 삼키고 기본값을 반환하는 코드는 fail_stage로 에러를 기록
+
+    Args:
+        name: 단계 이름 (예: 'file_fetch', 'llm_call')
+        file_path: 파일별 단계인 경우 파일 경로
+    """
+    start = time.perf_counter()
+    outcome = {'error': None}
+    token = _current_stage.set(outcome)
+    try:
+        yield
+    except Exception as e:
+        outcome['error'] = str(e)
+        raise
+    finally:
+        _current_stage.reset(token)
+        record_stage(name, time.perf_counter() - start, file_path, outcome['error'])
+
+
+def fail_stage(error: str):
+    """
+    현재 stage 구간을 실패로 기록 (예외를 다시 raise하지 않는 경우, stage 밖이면 무시)
+
+    Args:
+        error: 에러 메시지
+    """
+    outcome = _current_stage.get()
+    if outcome is not None:
+        outcome['error'] = error
+
+
+def record_stage(name: str, seconds: float, file_path: Optional[str] = None, error: Optional[str] = None):
+    """
+    이미 측정된 단계 소요 시간 기록 (일괄 조회처럼 다른 곳에서 시간을 잰 경우)
+
+    Args:
+        name: 단계 이름
+        seconds: 소요 시간(초)
+        file_path: 파일별 단계인 경우 파일 경로
+        error: 에러 메시지 (성공이면 None)
+    """
+    STAGE_DURATION.observe(seconds, stage=name)
+    if error is not None:
+        STAGE_ERRORS.inc(stage=name)
+    recorder = _current_issue.get()
+    if recorder is not None:
+        recorder.add_stage(name, seconds, file_path, error)
+
+
+def record_llm_usage(model: str, usage=None, cached: bool = False):
+    """
+    LLM 호출 결과 기록 (OpenAI 응답의 usage 객체 사용)
+
+    Args:
+        model: 모델명
+        usage: response.usage (prompt_tokens, completion_tokens)
+        cached: 응답 캐시 적중 여부
+    """
+    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+    completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+    LLM_REQUESTS.inc(model=model, result='cache_hit' if cached else 'api')
+    if not cached:
+        LLM_TOKENS.inc(prompt_tokens, model=model, type='prompt')
+        LLM_TOKENS.inc(completion_tokens, model=model, type='completion')
+
+    recorder = _current_issue.get()
+    if recorder is not None:
+        recorder.add_llm_call(prompt_tokens, completion_tokens, cached)
+
+
+def record_llm_error(model: str):
+    LLM_REQUESTS.inc(model=model, result='error')
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+    return REGISTRY.render()
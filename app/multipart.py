@@ -0,0 +1,112 @@
+"""
+스트리밍 multipart/form-data 인코더
+파일 내용을 하나의 본문으로 합치지 않고 memoryview 조각 단위로 그대로 전송
+"""
+
+import os
+import uuid
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# 한 번에 소켓으로 넘기는 최대 크기 (memoryview 슬라이스라 복사 없음)
+DEFAULT_CHUNK_SIZE = int(os.getenv('MULTIPART_CHUNK_SIZE', str(256 * 1024)))
+
+
+def _quote(value: str) -> str:
+    """Content-Disposition 값 이스케이프 (requests/urllib3와 같은 HTML5 방식)"""
+    return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class MultipartStream:
+    """
+    multipart/form-data 본문을 조각 단위로 생성하는 iterable
+
+    requests의 data=로 넘기면 본문 전체를 메모리에 만들지 않고 전송
+    - chunked=False: 길이를 미리 계산해 Content-Length로 전송 (기본)
+    - chunked=True: __len__이 없으므로 requests가 Transfer-Encoding: chunked로 전송
+    iter()를 호출할 때마다 처음부터 다시 생성하므로 재시도 시 그대로 재전송 가능
+    """
+
+    def __init__(self, fields: Optional[Dict[str, str]] = None,
+                 files: Optional[Dict[str, Tuple[str, BytesLike, Optional[str]]]] = None,
+                 boundary: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            fields: 일반 필드 {이름: 값} (값이 None이면 생략)
+            files: 파일 필드 {이름: (파일명, 내용, Content-Type 또는 None)}
+            boundary: 경계 문자열 (기본값: 임의 생성)
+            chunk_size: 파일 내용을 나눠 보낼 크기
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = max(1, chunk_size)
+        self._parts: List[Tuple[bytes, memoryview]] = []
+
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            header = self._part_header(name)
+            self._parts.append((header, memoryview(str(value).encode('utf-8'))))
+
+        for name, (filename, content, content_type) in (files or {}).items():
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            header = self._part_header(name, filename, content_type)
+            self._parts.append((header, memoryview(content).cast('B')))
+
+        self._closing = f'--{self.boundary}--\r\n'.encode('ascii')
+        self.length = sum(len(header) + data.nbytes + 2 for header, data in self._parts) + len(self._closing)
+
+    def _part_header(self, name: str, filename: Optional[str] = None,
+                     content_type: Optional[str] = None) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        header = f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n'
+        if content_type:
+            header += f'Content-Type: {content_type}\r\n'
+        return (header + '\r\n').encode('utf-8')
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __iter__(self) -> Iterator[BytesLike]:
+        for header, data in self._parts:
+            yield header
+            for offset in range(0, data.nbytes, self.chunk_size):
+                yield data[offset:offset + self.chunk_size]
+            yield b'\r\n'
+        yield self._closing
+
+    def to_bytes(self) -> bytes:
+        """본문 전체 (테스트/디버깅용, 전송에는 사용하지 않음)"""
+        return b''.join(bytes(chunk) for chunk in self)
+
+
+class SizedMultipartStream(MultipartStream):
+    """길이를 아는 MultipartStream (requests가 Content-Length 헤더로 전송)"""
+
+    def __len__(self) -> int:
+        return self.length
+
+
+def multipart_stream(fields: Optional[Dict[str, str]] = None,
+                     files: Optional[Dict[str, Tuple[str, BytesLike, Optional[str]]]] = None,
+                     chunked: bool = False, **kwargs) -> MultipartStream:
+    """
+    전송 방식에 맞는 MultipartStream 생성
+
+    Args:
+        fields: 일반 필드
+        files: 파일 필드
+        chunked: True면 Transfer-Encoding: chunked, False면 Content-Length 전송
+
+    Returns:
+        MultipartStream
+    """
+    cls = MultipartStream if chunked else SizedMultipartStream
+    return cls(fields, files, **kwargs)
@@ -0,0 +1,235 @@
+"""
+HTTP 클라이언트용 호출 제한 (스레드용, 비동기 클라이언트는 TokenBucket.reserve 사용)
+토큰 버킷, 429 응답에 따라 줄어드는 동시 요청 수(AIMD), Retry-After 파싱, 지터 백오프
+"""
+
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지는 토큰 버킷 (최대 capacity개까지 버스트 허용)
+
+    pause()로 일정 시간 모든 요청을 멈출 수 있음 (Retry-After, 쿼터 소진)
+    rate가 0이면 제한 없음 (pause만 적용)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, waited: float = 0.0) -> float:
+        """
+        대기 없이 토큰 1개 사용 시도 (비동기 클라이언트는 반환값만큼 await 후 다시 호출)
+
+        Args:
+            waited: 지금까지 기다린 시간 (토큰을 얻으면 wait_seconds에 합산)
+
+        Returns:
+            토큰을 얻었으면 0, 아니면 다시 시도하기까지 기다릴 시간(초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate <= 0 or self._tokens >= 1:
+                if self.rate > 0:
+                    self._tokens -= 1
+                self.wait_seconds += waited
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """토큰 1개 사용 (부족하거나 pause 중이면 대기)"""
+        start = time.monotonic()
+        while True:
+            delay = self.reserve(time.monotonic() - start)
+            if delay <= 0:
+                return
+            time.sleep(min(delay, 1.0))
+
+    def pause(self, seconds: float):
+        """지금부터 seconds 동안 모든 요청 대기"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float):
+        """충전 속도 변경 (남은 쿼터에 맞춰 속도를 낮출 때)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    @property
+    def paused_seconds(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 동시 요청 제한
+
+    429를 받으면 허용 동시 요청 수를 절반으로 줄이고(같은 구간의 연속 429는 1회로 취급),
+    성공이 현재 한도만큼 쌓일 때마다 1씩 늘려 max_limit까지 회복
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, cooldown: float = 1.0):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+        return False
+
+    def on_success(self):
+        with self._condition:
+            if self.limit >= self.max_limit:
+                return
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                self.limit += 1
+                self._condition.notify()
+
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._successes = 0
+            previous = self.limit
+            self.limit = max(self.min_limit, self.limit // 2)
+            if self.limit != previous:
+                logger.warning(f"호출 제한 감지: 동시 요청 수 {previous} → {self.limit}")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 → 대기 초 (초 단위 숫자 또는 HTTP 날짜)
+
+    Returns:
+        대기 시간(초) 또는 헤더가 없거나 해석할 수 없으면 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    X-RateLimit-Reset 헤더 → 초기화까지 남은 초
+
+    epoch 초(큰 값)와 남은 초(작은 값) 두 형식 모두 허용
+    """
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """지수 백오프 + full jitter: 0 ~ min(cap, base * 2^attempt) 사이 임의 값"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class QuotaTracker:
+    """X-RateLimit-* 헤더로 파악한 서버 쿼터 상태"""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # time.time() 기준
+        self.near_limit = False
+        self._lock = threading.Lock()
+
+    def update(self, headers) -> bool:
+        """
+        응답 헤더 반영
+
+        Returns:
+            쿼터 헤더가 있었는지 여부
+        """
+        limit = headers.get('X-RateLimit-Limit')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = parse_reset(headers.get('X-RateLimit-Reset'))
+        near_limit = headers.get('X-RateLimit-NearLimit')
+        if limit is None and remaining is None and reset is None and near_limit is None:
+            return False
+
+        with self._lock:
+            try:
+                if limit is not None:
+                    self.limit = int(limit)
+                if remaining is not None:
+                    self.remaining = int(remaining)
+            except ValueError:
+                pass
+            if reset is not None:
+                self.reset_at = time.time() + reset
+            if near_limit is not None:
+                self.near_limit = near_limit.strip().lower() == 'true'
+        return True
+
+    def seconds_to_reset(self) -> Optional[float]:
+        if self.reset_at is None:
+            return None
+        return max(0.0, self.reset_at - time.time())
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'reset_in': round(self.seconds_to_reset(), 1) if self.reset_at is not None else None,
+                'near_limit': self.near_limit,
+            }
@@ -0,0 +1,3 @@
+"""
+추출/패치 핫패스 벤치마크
+"""
@@ -0,0 +1,207 @@
+"""
+추출/패치 핫패스 벤치마크 실행기
+
+사용법:
+    # 1k/17k/100k 라인 합성 파일로 전체 벤치마크 실행 → JSON 저장
+    python -m benchmarks.run_benchmarks --output bench_before.json
+
+    # 두 결과 비교 (중앙값 기준 threshold 이상 느려지면 종료 코드 1)
+    python -m benchmarks.run_benchmarks --compare bench_before.json bench_after.json --threshold 0.15
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_mfc_source, generate_modifications, generate_llm_response
+
+DEFAULT_SIZES = [1000, 17000, 100000]
+RESULT_FORMAT_VERSION = 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def measure(func: Callable[[], object], repeat: int, max_time: float = 30.0) -> Dict:
+    """
+    func를 최대 repeat회 실행한 시간 통계 (초)
+
+    첫 실행은 워밍업으로 버리되, 1회 실행이 느린 케이스(100k 라인 Clang 파싱 등)는
+    첫 실행도 표본으로 쓰고 누적 시간이 max_time을 넘으면 반복을 멈춘다
+
+    Returns:
+        {'min', 'median', 'mean', 'max', 'repeat'}
+    """
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+
+    timings = [first] if first * repeat > max_time else []
+    while len(timings) < repeat and sum(timings) < max_time:
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings),
+        'repeat': len(timings),
+    }
+
+
+def build_cases(size: int) -> Dict[str, Callable[[], object]]:
+    """
+    한 파일 크기에 대한 벤치마크 케이스 (이름 → 인자 없는 호출)
+
+    입력 데이터 생성 비용은 측정에 포함하지 않도록 미리 만들어 둔다
+    """
+    from app.code_chunker import CodeChunker
+    from app.llm_handler import LLMHandler
+    from app.encoding_handler import EncodingHandler
+
+    content = generate_mfc_source(size)
+    encoded = content.encode('cp949')
+    modifications = generate_modifications(content)
+    llm_response = generate_llm_response(content)
+
+    chunker = CodeChunker()
+    llm = LLMHandler()
+
+    cases = {
+        'regex_extract_functions': lambda: chunker._extract_functions_regex(content),
+        'extract_macro_region': lambda: chunker.extract_macro_region(content, 'MATLCODE_STL_'),
+        'apply_diff_to_content': lambda: llm.apply_diff_to_content(content, modifications),
+        'escape_control_chars_in_strings': lambda: llm.escape_control_chars_in_strings(llm_response),
+        'format_code_with_line_numbers': lambda: llm.format_code_with_line_numbers(content, 1),
+        'detect_encoding_with_hint': lambda: EncodingHandler.detect_encoding_with_hint(encoded, 'src/wg_db/MatlDB.cpp'),
+    }
+    if chunker.clang_chunker.available:
+        cases['clang_extract_functions'] = lambda: chunker.clang_chunker.extract_functions(content)
+    return cases
+
+
+def run(sizes: List[int], repeat: int, only: Optional[List[str]] = None,
+        max_time: float = 30.0) -> Dict:
+    """
+    전체 벤치마크 실행
+
+    Returns:
+        JSON 직렬화 가능한 결과 dict
+    """
+    results = {}
+    for size in sizes:
+        cases = build_cases(size)
+        for name, func in cases.items():
+            if only and name not in only:
+                continue
+            stats = measure(func, repeat, max_time)
+            stats['lines_per_second'] = round(size / stats['median']) if stats['median'] else None
+            key = f"{name}[{size}]"
+            results[key] = stats
+            print(f"  {key:<45} median {stats['median'] * 1000:10.2f} ms  (min {stats['min'] * 1000:.2f} ms)")
+
+    return {
+        'version': RESULT_FORMAT_VERSION,
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': repeat,
+            'max_time': max_time,
+        },
+        'results': results,
+    }
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> List[Dict]:
+    """
+    두 결과의 중앙값 비교
+
+    Args:
+        base: 기준 결과
+        new: 비교 대상 결과
+        threshold: 회귀 판정 비율 (0.15 = 15% 이상 느려지면 회귀)
+
+    Returns:
+        케이스별 비교 리스트 (regression 플래그 포함)
+    """
+    rows = []
+    for key, new_stats in new.get('results', {}).items():
+        base_stats = base.get('results', {}).get(key)
+        if not base_stats:
+            continue
+        ratio = new_stats['median'] / base_stats['median'] if base_stats['median'] else 1.0
+        rows.append({
+            'case': key,
+            'base_median': base_stats['median'],
+            'new_median': new_stats['median'],
+            'ratio': ratio,
+            'regression': ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='추출/패치 핫패스 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 파일 라인 수')
+    parser.add_argument('--repeat', type=int, default=5, help='케이스별 최대 반복 횟수')
+    parser.add_argument('--max-time', type=float, default=30.0, help='케이스별 측정 시간 상한(초)')
+    parser.add_argument('--only', nargs='+', help='실행할 케이스 이름')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='두 결과 JSON 비교')
+    parser.add_argument('--threshold', type=float, default=0.15, help='회귀 판정 비율')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        rows = compare(base, new, args.threshold)
+        for row in rows:
+            mark = '❌ 회귀' if row['regression'] else ('✅ 개선' if row['ratio'] < 1.0 - args.threshold else '')
+            print(f"{row['case']:<45} {row['base_median'] * 1000:10.2f} ms → {row['new_median'] * 1000:10.2f} ms  "
+                  f"x{row['ratio']:.2f} {mark}")
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    # 벤치마크는 파싱 비용 자체를 측정하므로 함수 추출 캐시를 끈다
+    os.environ.setdefault('CLANG_CACHE_ENABLED', 'false')
+
+    print(f"벤치마크 실행: sizes={args.sizes}, repeat={args.repeat}")
+    result = run(args.sizes, args.repeat, args.only, args.max_time)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+벤치마크용 MFC 스타일 합성 C++ 소스 생성
+MatlDB.cpp와 같은 구조(매크로 region + GetSteelList_* 함수 반복)를 재현
+"""
+
+import json
+import random
+from typing import Dict, List
+
+HEADER = """// MatlDB.cpp : 재질 DB 구현 파일
+//
+#include "stdafx.h"
+#include "MatlDB.h"
+#include "DBCodeDef.h"
+
+#ifdef _DEBUG
+#define new DEBUG_NEW
+#undef THIS_FILE
+static char THIS_FILE[] = __FILE__;
+#endif
+"""
+
+STEEL_NAMES = ['C235', 'C245', 'C255', 'C275', 'C285', 'C345', 'C355', 'C375', 'C390', 'C440']
+
+
+def _macro_region(count: int) -> List[str]:
+    lines = ['#pragma region /// [ MATL CODE - STEEL ]']
+    for i in range(count):
+        lines.append(f'#define MATLCODE_STL_SP16_2017_tB{i}          _T("SP16.2017t.B{i}(S)")  // 강재 {i}')
+    lines.append('#pragma endregion')
+    return lines
+
+
+def _function(index: int, rng: random.Random) -> List[str]:
+    """GetSteelList_* 형태의 함수 1개 (약 40라인)"""
+    name = f'SP16_2017_tB{index}'
+    lines = [
+        f'BOOL CMatlDB::GetSteelList_{name}(T_UNIT_INDEX UnitIndex, OUT T_MATL_LIST_STEEL& raSteelList)',
+        '{',
+        f'    struct STL_MATL_{name.upper()}',
+        '    {',
+        '        CString csName;',
+        '        double dFy1; double dFy2; double dFy3;',
+        '        double dFu1; double dFu2; double dFu3;',
+        '    };',
+        '',
+        '    // 재질 데이터 테이블 {"이름", 항복강도, 인장강도}',
+        f'    const STL_MATL_{name.upper()} aMatl[] =',
+        '    {',
+    ]
+    for steel in STEEL_NAMES:
+        fy = rng.randint(200, 450)
+        fu = fy + rng.randint(50, 150)
+        lines.append(f'        {{ _T("{steel}"), {fy}.0, {fy - 10}.0, {fy - 20}.0, {fu}.0, {fu - 10}.0, {fu - 20}.0 }},')
+    lines.extend([
+        '    };',
+        '',
+        '    raSteelList.RemoveAll();',
+        '    for (int i = 0; i < _countof(aMatl); i++)',
+        '    {',
+        '        T_MATL_STEEL tData;',
+        '        tData.csName = aMatl[i].csName;',
+        '        tData.dFy = aMatl[i].dFy1;  // 두께 구간 1',
+        '        tData.dFu = aMatl[i].dFu1;',
+        '        if (UnitIndex.nForce != 0) { tData.dFy *= 0.1; }',
+        '        raSteelList.Add(tData);',
+        '    }',
+        '',
+        '    return TRUE;',
+        '}',
+        '',
+    ])
+    return lines
+
+
+def generate_mfc_source(target_lines: int, seed: int = 0) -> str:
+    """
+    target_lines 라인의 합성 MFC 소스 생성 (같은 seed면 동일한 결과)
+
+    Args:
+        target_lines: 목표 라인 수
+        seed: 난수 시드
+
+    Returns:
+        소스 코드 문자열
+    """
+    rng = random.Random(seed)
+    lines = HEADER.splitlines()
+    lines.extend(_macro_region(max(10, target_lines // 200)))
+    lines.append('')
+
+    index = 0
+    while True:
+        function = _function(index, rng)
+        if len(lines) + len(function) > target_lines:
+            break
+        lines.extend(function)
+        index += 1
+
+    # 함수 중간에서 자르지 않고 나머지는 주석으로 채움
+    while len(lines) < target_lines:
+        lines.append(f'// padding {len(lines)}')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_modifications(content: str, count: int = 20) -> List[Dict]:
+    """파일 전체에 고르게 분포된 apply_diff_to_content용 수정사항"""
+    lines = content.splitlines()
+    step = max(len(lines) // count, 1)
+    modifications = []
+    for line_no in range(1, len(lines) + 1, step):
+        modifications.append({
+            'line_start': line_no,
+            'line_end': line_no,
+            'action': 'insert',
+            'old_content': '',
+            'new_content': f'    // 추가된 라인 {line_no}',
+            'description': 'benchmark'
+        })
+        if len(modifications) >= count:
+            break
+    return modifications
+
+
+def generate_llm_response(content: str, count: int = 20) -> str:
+    """escape_control_chars_in_strings 입력용 (문자열 값 안에 실제 개행이 들어간) LLM 응답"""
+    modifications = generate_modifications(content, count)
+    body = json.dumps({'modifications': modifications, 'summary': 'benchmark'}, ensure_ascii=False, indent=2)
+    # LLM이 자주 내보내는 형태: 문자열 값 안의 \n 이스케이프가 실제 개행/탭으로 풀린 응답
+    snippet = '\n'.join(content.splitlines()[:200]).replace('\\', '\\\\').replace('"', '\\"')
+    return body[:-1] + f',\n  "context": "{snippet}"\n}}'
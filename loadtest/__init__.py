@@ -0,0 +1,3 @@
+"""
+Bitbucket/OpenAI 대역 서버를 사용한 오프라인 부하 테스트
+"""
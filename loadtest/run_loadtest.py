@@ -0,0 +1,462 @@
+"""
+오프라인 부하 테스트 실행기
+
+Bitbucket/OpenAI 대역 서버를 띄우고, sample_jira_webhook.json 변형을 목표 속도로 /webhook에 보낸 뒤
+작업(/jobs/<id>)이 끝날 때까지 추적하여 처리량, 단계별 p50/p95/p99 지연, 에러율을 보고
+
+사용법:
+    # 대역 서버 + 에이전트 프로세스를 함께 띄워 초당 2건씩 30초 동안 전송
+    python -m loadtest.run_loadtest --rate 2 --duration 30 --output loadtest_report.json
+
+    # 지연 분포와 장애 주입
+    python -m loadtest.run_loadtest --rate 5 --duration 60 \\
+        --bitbucket-latency lognormal:80:0.5 --bitbucket-endpoint-latency commit=uniform:300:900 \\
+        --openai-latency lognormal:3000:0.4 --openai-throttle-rate 0.05 --bitbucket-error-rate 0.01
+
+    # 이미 떠 있는 에이전트에 전송 (에이전트의 BITBUCKET_URL/OPENAI_BASE_URL은 --stubs-only로 띄운 대역을 가리켜야 함)
+    python -m loadtest.run_loadtest --stubs-only
+    python -m loadtest.run_loadtest --target http://127.0.0.1:5000 --rate 2 --duration 30
+"""
+
+import os
+import sys
+import copy
+import glob
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.stubs import (
+    BitbucketStub, FaultInjector, LatencyModel, OpenAIStub, DEFAULT_LLM_RESPONSE, parse_endpoint_latency
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PAYLOAD = os.path.join(PROJECT_ROOT, 'sample_jira_webhook.json')
+ISSUE_KEY_PREFIX = 'LOADTEST'
+FINISHED_STATUSES = ('completed', 'failed')
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """선형 보간 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """{'count', 'p50', 'p95', 'p99', 'max'} (초, 소수점 4자리)"""
+    def rounded(value):
+        return round(value, 4) if value is not None else None
+
+    return {
+        'count': len(values),
+        'p50': rounded(percentile(values, 50)),
+        'p95': rounded(percentile(values, 95)),
+        'p99': rounded(percentile(values, 99)),
+        'max': rounded(max(values)) if values else None,
+    }
+
+
+def payload_variants(template: Dict, run_id: str) -> Iterator[Dict]:
+    """
+    웹훅 페이로드 변형 (이슈 키/ID/요약만 바꿔 작업 큐 중복 제거에 걸리지 않도록)
+
+    Yields:
+        n번째 웹훅 페이로드
+    """
+    n = 0
+    while True:
+        n += 1
+        payload = copy.deepcopy(template)
+        issue = payload.setdefault('issue', {})
+        fields = issue.setdefault('fields', {})
+        issue['key'] = f"{ISSUE_KEY_PREFIX}-{run_id}-{n}"
+        issue['id'] = str(900000 + n)
+        fields['summary'] = f"{fields.get('summary', 'SDB 개발 요청')} (loadtest #{n})"
+        payload['timestamp'] = int(time.time() * 1000)
+        yield payload
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def agent_env(bitbucket_url: str, openai_url: str, llm_cache: bool = False,
+              llm_rpm_limit: Optional[int] = None, llm_tpm_limit: Optional[int] = None) -> Dict[str, str]:
+    """
+    대역 서버를 가리키는 에이전트 환경 변수
+
+    llm_rpm_limit/llm_tpm_limit가 None이면 에이전트 기본값(LLM_RPM_LIMIT/LLM_TPM_LIMIT) 사용, 0이면 제한 없음
+    """
+    env = {
+        'BITBUCKET_URL': bitbucket_url,
+        'BITBUCKET_ACCESS_TOKEN': 'loadtest-token',
+        'BITBUCKET_WORKSPACE': 'loadtest',
+        'BITBUCKET_REPOSITORY': 'genw_new',
+        'OPENAI_API_KEY': 'loadtest-key',
+        'OPENAI_BASE_URL': f"{openai_url}/v1",
+        'LLM_CACHE_ENABLED': 'true' if llm_cache else 'false',
+        'JOB_QUEUE_BACKEND': 'memory',
+        'REPOSITORY_BACKEND': 'rest',
+    }
+    if llm_rpm_limit is not None:
+        env['LLM_RPM_LIMIT'] = str(llm_rpm_limit)
+    if llm_tpm_limit is not None:
+        env['LLM_TPM_LIMIT'] = str(llm_tpm_limit)
+    return env
+
+
+def fetch_agent_limits(target: str) -> Dict:
+    """
+    에이전트 /health의 자체 호출 제한 통계 (대역 지연과 에이전트 대기를 구분하기 위해 보고서에 첨부)
+
+    Returns:
+        {'llm': LLM RPM/TPM 제한기 통계, 'bitbucket': Bitbucket 호출 제한 통계} 또는 조회 실패 시 빈 dict
+    """
+    try:
+        health = requests.get(f"{target.rstrip('/')}/health", timeout=5).json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning(f"에이전트 /health 조회 실패: {e}")
+        return {}
+    return {'llm': health.get('llm_rate_limit', {}), 'bitbucket': health.get('bitbucket_rate_limit', {})}
+
+
+class AgentProcess:
+    """대역 서버를 바라보는 에이전트(app.main)를 별도 프로세스로 실행"""
+
+    def __init__(self, env: Dict[str, str], port: Optional[int] = None, log_path: Optional[str] = None):
+        self.port = port or _free_port()
+        self.env = dict(os.environ, **env, PORT=str(self.port), PYTHONPATH=PROJECT_ROOT)
+        self.log_path = log_path or os.path.join(tempfile.gettempdir(), f'loadtest_agent_{self.port}.log')
+        self.process = None
+        self._log = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 60.0) -> 'AgentProcess':
+        self._log = open(self.log_path, 'wb')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'app.main'], cwd=PROJECT_ROOT, env=self.env,
+            stdout=self._log, stderr=subprocess.STDOUT
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"에이전트가 시작 중 종료됨 (로그: {self.log_path})")
+            try:
+                if requests.get(f"{self.url}/health", timeout=1).ok:
+                    return self
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"에이전트가 {timeout:.0f}초 안에 응답하지 않음 (로그: {self.log_path})")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+class LoadGenerator:
+    """
+    개방 루프(open-loop) 부하 생성기
+
+    응답 지연과 관계없이 rate(초당 건수) 간격으로 웹훅을 보내고, 각 작업을 완료될 때까지 폴링
+    """
+
+    def __init__(self, target: str, payload: Dict, rate: float, duration: float,
+                 job_timeout: float = 300.0, poll_interval: float = 0.2, max_in_flight: int = 256):
+        self.target = target.rstrip('/')
+        self.payload = payload
+        self.rate = rate
+        self.duration = duration
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+        self.max_in_flight = max_in_flight
+        self.samples: List[Dict] = []
+        self.send_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _run_one(self, payload: Dict, scheduled_at: float) -> Dict:
+        """웹훅 1건 전송 → 작업 완료까지 추적"""
+        sample = {'issue_key': payload['issue']['key'], 'lag': time.monotonic() - scheduled_at}
+        session = self._session()
+        start = time.monotonic()
+        try:
+            response = session.post(f"{self.target}/webhook", json=payload, timeout=30)
+            sample['webhook_status'] = response.status_code
+            sample['webhook_seconds'] = time.monotonic() - start
+            body = response.json() if response.content else {}
+        except (requests.exceptions.RequestException, ValueError) as e:
+            sample['webhook_status'] = None
+            sample['webhook_seconds'] = time.monotonic() - start
+            sample['error'] = f"webhook: {e}"
+            return sample
+
+        job_id = body.get('job_id')
+        if response.status_code != 202 or not job_id:
+            sample['error'] = f"webhook: HTTP {response.status_code} {body}"
+            return sample
+
+        deadline = start + self.job_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            try:
+                job = session.get(f"{self.target}/jobs/{job_id}", timeout=30).json()
+            except (requests.exceptions.RequestException, ValueError):
+                continue
+            if job.get('status') in FINISHED_STATUSES:
+                sample['job_status'] = job['status']
+                sample['job_seconds'] = time.monotonic() - start
+                result = job.get('result') or {}
+                metrics = result.get('metrics') or {}
+                sample['stages'] = {name: stats.get('seconds', 0.0)
+                                    for name, stats in (metrics.get('stages') or {}).items()}
+                sample['processing_seconds'] = metrics.get('total_seconds')
+                sample['tokens'] = (metrics.get('tokens') or {}).get('total', 0)
+                errors = result.get('errors') or ([job['error']] if job.get('error') else [])
+                if job['status'] == 'failed' or errors:
+                    sample['error'] = '; '.join(str(error) for error in errors)[:500] or 'job failed'
+                return sample
+
+        sample['job_status'] = 'timeout'
+        sample['error'] = f"job: {self.job_timeout:.0f}초 안에 끝나지 않음"
+        return sample
+
+    def run(self) -> List[Dict]:
+        variants = payload_variants(self.payload, time.strftime('%H%M%S'))
+        total = max(1, int(round(self.rate * self.duration)))
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        futures = []
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='loadtest') as executor:
+            start = time.monotonic()
+            for i in range(total):
+                scheduled_at = start + i * interval
+                delay = scheduled_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self._run_one, next(variants), scheduled_at))
+            self.send_seconds = time.monotonic() - start
+            self.samples = [future.result() for future in futures]
+            self.wall_seconds = time.monotonic() - start
+        return self.samples
+
+
+def build_report(samples: List[Dict], wall_seconds: float, rate: float, send_seconds: Optional[float] = None,
+                 stubs: Optional[Dict] = None, agent_limits: Optional[Dict] = None) -> Dict:
+    """
+    부하 테스트 결과 요약
+
+    Returns:
+        {'requests', 'throughput', 'webhook', 'jobs', 'stages', 'errors', 'stubs', 'agent_limits'}
+    """
+    sent = len(samples)
+    accepted = [s for s in samples if s.get('webhook_status') == 202]
+    finished = [s for s in samples if s.get('job_status') in FINISHED_STATUSES]
+    completed = [s for s in finished if s['job_status'] == 'completed' and not s.get('error')]
+
+    stage_values: Dict[str, List[float]] = {}
+    for sample in finished:
+        for name, seconds in sample.get('stages', {}).items():
+            stage_values.setdefault(name, []).append(seconds)
+
+    errors: Dict[str, int] = {}
+    for sample in samples:
+        if sample.get('error'):
+            kind = sample['error'].split(':', 1)[0] if sample['error'].startswith(('webhook', 'job')) else 'issue'
+            errors[kind] = errors.get(kind, 0) + 1
+
+    def rate_of(count):
+        return round(count / sent, 4) if sent else 0.0
+
+    return {
+        'requests': {'target_rate': rate, 'sent': sent, 'wall_seconds': round(wall_seconds, 2),
+                     'achieved_rate': round(sent / send_seconds, 3) if send_seconds else None,
+                     'max_schedule_lag': round(max((s['lag'] for s in samples), default=0.0), 4)},
+        'throughput': {
+            'jobs_completed': len(completed),
+            'jobs_per_second': round(len(completed) / wall_seconds, 3) if wall_seconds else None,
+            'llm_tokens': sum(s.get('tokens') or 0 for s in finished),
+        },
+        'webhook': dict(summarize([s['webhook_seconds'] for s in samples if 'webhook_seconds' in s]),
+                        error_rate=rate_of(sent - len(accepted))),
+        'jobs': dict(summarize([s['job_seconds'] for s in finished]),
+                     processing=summarize([s['processing_seconds'] for s in finished
+                                           if s.get('processing_seconds') is not None]),
+                     failure_rate=rate_of(len(finished) - len(completed)),
+                     timeout_rate=rate_of(sum(1 for s in samples if s.get('job_status') == 'timeout'))),
+        'stages': {name: summarize(values) for name, values in sorted(stage_values.items())},
+        'errors': {'by_kind': errors, 'error_rate': rate_of(sum(errors.values())),
+                   'examples': [s['error'] for s in samples if s.get('error')][:5]},
+        'stubs': stubs or {},
+        'agent_limits': agent_limits or {},
+    }
+
+
+def format_report(report: Dict) -> str:
+    """사람이 읽기 쉬운 표 형식"""
+    def ms(value):
+        return f"{value * 1000:9.1f}" if value is not None else f"{'-':>9}"
+
+    requests_info = report['requests']
+    lines = [
+        f"전송 {requests_info['sent']}건 / {requests_info['wall_seconds']}초 "
+        f"(목표 {requests_info['target_rate']}/s, 실제 {requests_info['achieved_rate']}/s)",
+        f"완료 {report['throughput']['jobs_completed']}건, 처리량 {report['throughput']['jobs_per_second']} jobs/s, "
+        f"에러율 {report['errors']['error_rate']:.1%}",
+        '',
+        f"{'구간':<24}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    rows = [('webhook', report['webhook']), ('job (end-to-end)', report['jobs'])]
+    rows += [(f"stage:{name}", stats) for name, stats in report['stages'].items()]
+    for name, stats in rows:
+        lines.append(f"{name:<24}{stats['count']:>7} {ms(stats['p50'])} {ms(stats['p95'])} "
+                     f"{ms(stats['p99'])} {ms(stats['max'])}")
+    for service, stats in report['stubs'].items():
+        lines.append(f"{service}: 요청 {stats['requests']}, 주입 {stats['injected']}")
+    # 에이전트 자체 제한으로 기다린 시간 (단계 지연이 대역 지연인지 자체 대기인지 구분)
+    llm_limits = report.get('agent_limits', {}).get('llm')
+    if llm_limits:
+        lines.append(f"agent LLM 제한 (rpm {llm_limits.get('rpm_limit')}, tpm {llm_limits.get('tpm_limit')}): "
+                     f"대기 {llm_limits.get('waits')}회 / {llm_limits.get('wait_seconds')}초")
+    bitbucket_limits = report.get('agent_limits', {}).get('bitbucket')
+    if bitbucket_limits:
+        lines.append(f"agent Bitbucket 제한 (초당 {bitbucket_limits.get('request_rate')}): "
+                     f"대기 {bitbucket_limits.get('wait_seconds')}초, 429 {bitbucket_limits.get('throttled')}회")
+    return '\n'.join(lines)
+
+
+def cleanup_spec_files():
+    """에이전트가 doc/에 남긴 부하 테스트 이슈의 Spec 파일 삭제"""
+    for path in glob.glob(os.path.join(PROJECT_ROOT, 'doc', f'{ISSUE_KEY_PREFIX}-*_spec.md')):
+        os.remove(path)
+
+
+def _stub_kwargs(args, service: str) -> Dict:
+    prefix = service.replace('-', '_')
+    return {
+        'latency': LatencyModel.parse(getattr(args, f'{prefix}_latency'), seed=args.seed),
+        'endpoint_latency': parse_endpoint_latency(getattr(args, f'{prefix}_endpoint_latency'), seed=args.seed),
+        'faults': FaultInjector(
+            error_rate=getattr(args, f'{prefix}_error_rate'),
+            throttle_rate=getattr(args, f'{prefix}_throttle_rate'),
+            retry_after=args.retry_after, seed=args.seed
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bitbucket/OpenAI 대역 서버를 사용한 오프라인 부하 테스트')
+    parser.add_argument('--rate', type=float, default=1.0, help='초당 웹훅 전송 수')
+    parser.add_argument('--duration', type=float, default=30.0, help='전송 시간(초)')
+    parser.add_argument('--payload', default=DEFAULT_PAYLOAD, help='웹훅 페이로드 템플릿 JSON')
+    parser.add_argument('--target', help='이미 실행 중인 에이전트 주소 (없으면 에이전트 프로세스를 직접 실행)')
+    parser.add_argument('--stubs-only', action='store_true', help='대역 서버만 띄우고 에이전트용 환경 변수를 출력')
+    parser.add_argument('--job-timeout', type=float, default=300.0, help='작업 1건 최대 대기 시간(초)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--seed', type=int, default=None, help='지연/장애 난수 시드')
+    parser.add_argument('--file-lines', type=int, default=2000, help='Bitbucket 대역이 돌려주는 합성 소스 줄 수')
+    parser.add_argument('--llm-response', help='OpenAI 대역이 돌려줄 고정 응답 파일 (기본: 1줄 insert diff)')
+    parser.add_argument('--llm-cache', action='store_true', help='에이전트 LLM 응답 캐시 사용')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='429 주입 시 Retry-After(초)')
+    parser.add_argument('--keep-specs', action='store_true', help='에이전트가 doc/에 만든 Spec 파일 유지')
+    parser.add_argument('--llm-rpm-limit', type=int, default=None,
+                        help='에이전트 LLM_RPM_LIMIT (기본: 에이전트 기본값, 0이면 제한 없음)')
+    parser.add_argument('--llm-tpm-limit', type=int, default=None,
+                        help='에이전트 LLM_TPM_LIMIT (기본: 에이전트 기본값, 0이면 제한 없음)')
+    for service in ('bitbucket', 'openai'):
+        parser.add_argument(f'--{service}-latency', help='지연 분포 (예: fixed:50, uniform:20:80, lognormal:200:0.5)')
+        parser.add_argument(f'--{service}-endpoint-latency', action='append',
+                            help='엔드포인트별 지연 (예: commit=uniform:300:900), 여러 번 지정 가능')
+        parser.add_argument(f'--{service}-error-rate', type=float, default=0.0, help='5xx 주입 비율')
+        parser.add_argument(f'--{service}-throttle-rate', type=float, default=0.0, help='429 주입 비율')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with open(args.payload, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    llm_response = DEFAULT_LLM_RESPONSE
+    if args.llm_response:
+        with open(args.llm_response, 'r', encoding='utf-8') as f:
+            llm_response = f.read()
+
+    bitbucket = BitbucketStub(file_lines=args.file_lines, **_stub_kwargs(args, 'bitbucket')).start()
+    openai = OpenAIStub(response=llm_response, **_stub_kwargs(args, 'openai')).start()
+    env = agent_env(bitbucket.url, openai.url, llm_cache=args.llm_cache,
+                    llm_rpm_limit=args.llm_rpm_limit, llm_tpm_limit=args.llm_tpm_limit)
+    agent = None
+    try:
+        if args.stubs_only:
+            print('\n'.join(f"export {name}={value}" for name, value in env.items()))
+            print('대역 서버 실행 중 (Ctrl+C로 종료)')
+            while True:
+                time.sleep(3600)
+
+        target = args.target
+        if not target:
+            agent = AgentProcess(env).start()
+            target = agent.url
+            logger.info(f"에이전트 실행: {target} (로그: {agent.log_path})")
+
+        generator = LoadGenerator(target, payload, args.rate, args.duration, job_timeout=args.job_timeout)
+        samples = generator.run()
+        report = build_report(samples, generator.wall_seconds, args.rate, generator.send_seconds,
+                              stubs={'bitbucket': bitbucket.stats(), 'openai': openai.stats()},
+                              agent_limits=fetch_agent_limits(target))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if agent is not None:
+            agent.stop()
+        bitbucket.stop()
+        openai.stop()
+        if not args.keep_specs:
+            cleanup_spec_files()
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return 1 if report['errors']['error_rate'] > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
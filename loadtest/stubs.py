@@ -0,0 +1,386 @@
+"""
+부하 테스트용 로컬 대역 서버
+BitbucketAPI가 사용하는 Bitbucket 2.0 엔드포인트와 OpenAI chat.completions를 흉내내며,
+지연 분포/에러·429 주입/고정 응답을 설정할 수 있음
+"""
+
+import re
+import json
+import math
+import time
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import generate_mfc_source
+
+DEFAULT_LLM_RESPONSE = json.dumps({
+    'modifications': [{
+        'line_start': 1,
+        'line_end': 1,
+        'action': 'insert',
+        'old_content': '',
+        'new_content': '// loadtest',
+        'description': 'loadtest'
+    }],
+    'summary': 'loadtest'
+}, ensure_ascii=False)
+
+
+class LatencyModel:
+    """
+    응답 지연 분포 (밀리초)
+
+    문자열 형식:
+        fixed:50            항상 50ms
+        uniform:20:80       20~80ms 균등 분포
+        normal:100:20       평균 100ms, 표준편차 20ms (0 미만은 0)
+        lognormal:200:0.5   중앙값 200ms, sigma 0.5 (긴 꼬리)
+        exp:100             평균 100ms 지수 분포
+    """
+
+    KINDS = ('fixed', 'uniform', 'normal', 'lognormal', 'exp')
+
+    def __init__(self, kind: str = 'fixed', a: float = 0.0, b: float = 0.0, seed: Optional[int] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"지원하지 않는 지연 분포: {kind} ({', '.join(self.KINDS)})")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: Optional[str], seed: Optional[int] = None) -> 'LatencyModel':
+        if not spec:
+            return cls('fixed', 0.0)
+        kind, *params = spec.split(':')
+        values = [float(value) for value in params] + [0.0, 0.0]
+        return cls(kind, values[0], values[1], seed=seed)
+
+    def sample(self) -> float:
+        """지연 시간 1개 (초)"""
+        with self._lock:
+            if self.kind == 'fixed':
+                ms = self.a
+            elif self.kind == 'uniform':
+                ms = self._rng.uniform(self.a, self.b)
+            elif self.kind == 'normal':
+                ms = self._rng.gauss(self.a, self.b)
+            elif self.kind == 'lognormal':
+                ms = self._rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+            else:
+                ms = self._rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        return max(0.0, ms) / 1000.0
+
+    def __repr__(self):
+        return f"LatencyModel({self.kind}, {self.a}, {self.b})"
+
+
+class FaultInjector:
+    """
+    요청 일부를 실패시키는 설정
+
+    error_rate 비율은 error_status(기본 503), throttle_rate 비율은 429(Retry-After 포함)로 응답
+    """
+
+    def __init__(self, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 1.0, error_status: int = 503, seed: Optional[int] = None):
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def pick(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        """주입할 (상태 코드, 헤더) 또는 정상 처리면 None"""
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return 429, {'Retry-After': f"{self.retry_after:g}"}
+        if roll < self.throttle_rate + self.error_rate:
+            return self.error_status, {}
+        return None
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """공통 처리: 요청 기록 → 지연 → 장애 주입 → 서비스별 route"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b'', content_type: str = 'application/json',
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data, headers: Optional[Dict[str, str]] = None):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), headers=headers)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return body
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self, method: str):
+        stub = self.server.stub
+        body = self._read_body() if method == 'POST' else b''
+        endpoint = stub.classify(method, urlsplit(self.path).path)
+        stub.record(endpoint)
+
+        time.sleep(stub.latency_for(endpoint).sample())
+        fault = stub.faults.pick()
+        if fault is not None:
+            status, headers = fault
+            stub.record(endpoint, injected=status)
+            self._send_json(status, {'type': 'error', 'error': {'message': 'injected by loadtest'}}, headers)
+            return
+        stub.route(self, method, endpoint, body)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class StubServer:
+    """백그라운드 스레드에서 도는 대역 서버 기반 클래스"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None, faults: Optional[FaultInjector] = None,
+                 endpoint_latency: Optional[Dict[str, LatencyModel]] = None, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency or LatencyModel()
+        self.endpoint_latency = endpoint_latency or {}
+        self.faults = faults or FaultInjector()
+        self.host = host
+        self.port = port
+        self.counts: Counter = Counter()
+        self.injected: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def classify(self, method: str, path: str) -> str:
+        """요청을 통계/지연 설정용 엔드포인트 이름으로 분류"""
+        raise NotImplementedError
+
+    def route(self, handler: _StubHandler, method: str, endpoint: str, body: bytes):
+        raise NotImplementedError
+
+    def latency_for(self, endpoint: str) -> LatencyModel:
+        return self.endpoint_latency.get(endpoint, self.latency)
+
+    def record(self, endpoint: str, injected: Optional[int] = None):
+        with self._lock:
+            if injected is None:
+                self.counts[endpoint] += 1
+            else:
+                self.injected[f"{endpoint}:{injected}"] += 1
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubServer':
+        self._server = ThreadingHTTPServer((self.host, self.port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.1},
+                                        name=f'{type(self).__name__}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {'requests': dict(self.counts), 'injected': dict(self.injected)}
+
+
+class BitbucketStub(StubServer):
+    """
+    Bitbucket 2.0 대역 (BitbucketAPI가 사용하는 엔드포인트)
+
+    - GET  /2.0/repositories/{ws}/{repo}                  저장소 정보 (토큰 검증)
+    - GET  .../refs/branches/{branch}, POST .../refs/branches
+    - GET  .../src/{ref}/{path}                           files에 있으면 그 내용, 없으면 합성 MFC 소스
+    - POST .../src                                        커밋 (parents 불일치 시 409)
+    - POST .../pullrequests
+    """
+
+    def __init__(self, files: Optional[Dict[str, bytes]] = None, file_lines: int = 2000,
+                 missing_paths: Optional[Callable[[str], bool]] = None, **kwargs):
+        """
+        Args:
+            files: 고정 파일 내용 {경로: 바이트}
+            file_lines: files에 없는 경로에 돌려줄 합성 소스 줄 수 (0이면 404)
+            missing_paths: True를 돌려주는 경로는 404
+        """
+        super().__init__(**kwargs)
+        self.files = dict(files or {})
+        self.file_lines = file_lines
+        self.missing_paths = missing_paths or (lambda path: False)
+        self.heads: Dict[str, str] = {'master': 'a' * 40}
+        self.commit_count = 0
+        self.pr_count = 0
+        self._synthetic: Optional[bytes] = None
+
+    def classify(self, method: str, path: str) -> str:
+        if '/refs/branches' in path:
+            return 'create_branch' if method == 'POST' else 'get_branch'
+        if path.endswith('/src') and method == 'POST':
+            return 'commit'
+        if '/src/' in path:
+            return 'get_file'
+        if path.endswith('/pullrequests'):
+            return 'create_pull_request'
+        return 'repository'
+
+    def _file_content(self, file_path: str) -> Optional[bytes]:
+        if file_path in self.files:
+            return self.files[file_path]
+        if self.file_lines <= 0 or self.missing_paths(file_path):
+            return None
+        if self._synthetic is None:
+            self._synthetic = generate_mfc_source(self.file_lines).encode('cp949', errors='replace')
+        return self._synthetic
+
+    def route(self, handler: _StubHandler, method: str, endpoint: str, body: bytes):
+        path = urlsplit(handler.path).path
+        if endpoint == 'get_branch':
+            branch = path.split('/refs/branches/', 1)[1]
+            with self._lock:
+                commit_hash = self.heads.get(branch)
+            if commit_hash is None:
+                handler._send_json(404, {'type': 'error', 'error': {'message': 'branch not found'}})
+            else:
+                handler._send_json(200, {'name': branch, 'target': {'hash': commit_hash}})
+        elif endpoint == 'create_branch':
+            data = json.loads(body or b'{}')
+            with self._lock:
+                self.heads[data['name']] = data['target']['hash']
+            handler._send_json(201, {'name': data['name'], 'target': data['target']})
+        elif endpoint == 'get_file':
+            file_path = path.split('/src/', 1)[1].split('/', 1)[-1]
+            content = self._file_content(file_path)
+            if content is None:
+                handler._send_json(404, {'type': 'error', 'error': {'message': 'file not found'}})
+            else:
+                handler._send(200, content, 'application/octet-stream')
+        elif endpoint == 'commit':
+            self._commit(handler, path, body)
+        elif endpoint == 'create_pull_request':
+            data = json.loads(body or b'{}')
+            with self._lock:
+                self.pr_count += 1
+                pr_id = self.pr_count
+            handler._send_json(201, {
+                'id': pr_id, 'title': data.get('title'),
+                'links': {'html': {'href': f"{self.url}/pull-requests/{pr_id}"}}
+            })
+        else:
+            handler._send_json(200, {'name': path.rstrip('/').rsplit('/', 1)[-1], 'full_name': path})
+
+    def _commit(self, handler: _StubHandler, path: str, body: bytes):
+        branch = _form_field(body, 'branch')
+        parent = _form_field(body, 'parents')
+        with self._lock:
+            if parent and parent != self.heads.get(branch):
+                conflict = True
+            else:
+                conflict = False
+                self.commit_count += 1
+                new_hash = f"{self.commit_count:040x}"
+                self.heads[branch] = new_hash
+        if conflict:
+            handler._send_json(409, {'type': 'error', 'error': {'message': 'parents mismatch'}})
+            return
+        handler._send(201, b'', headers={'Location': f"{self.url}{path.rsplit('/src', 1)[0]}/commit/{new_hash}"})
+
+
+def _form_field(body: bytes, name: str) -> Optional[str]:
+    """multipart 본문에서 일반 필드 값 추출"""
+    match = re.search(rb'name="' + name.encode() + rb'"\r\n\r\n([^\r]*)\r\n', body)
+    return match.group(1).decode('utf-8') if match else None
+
+
+class OpenAIStub(StubServer):
+    """
+    OpenAI chat.completions 대역 (POST /v1/chat/completions)
+
+    response가 문자열이면 항상 그 내용을, 함수면 요청 본문(dict)을 받아 만든 내용을 응답
+    토큰 사용량은 글자 수 / 4로 추정
+    """
+
+    def __init__(self, response=DEFAULT_LLM_RESPONSE, **kwargs):
+        super().__init__(**kwargs)
+        self.response = response
+
+    def classify(self, method: str, path: str) -> str:
+        return 'chat_completions' if path.endswith('/chat/completions') else 'other'
+
+    def route(self, handler: _StubHandler, method: str, endpoint: str, body: bytes):
+        if endpoint != 'chat_completions':
+            handler._send_json(404, {'error': {'message': 'not found'}})
+            return
+        request = json.loads(body or b'{}')
+        content = self.response(request) if callable(self.response) else self.response
+        prompt_chars = sum(len(str(message.get('content', ''))) for message in request.get('messages', []))
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion_tokens = max(1, len(content) // 4)
+        handler._send_json(200, {
+            'id': f"chatcmpl-loadtest-{time.monotonic_ns()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'gpt-4o'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        })
+
+
+def parse_endpoint_latency(specs, seed: Optional[int] = None) -> Dict[str, LatencyModel]:
+    """['get_file=lognormal:80:0.6', ...] → {엔드포인트: LatencyModel}"""
+    result = {}
+    for spec in specs or []:
+        endpoint, _, model = spec.partition('=')
+        result[endpoint.strip()] = LatencyModel.parse(model, seed=seed)
+    return result
@@ -0,0 +1,175 @@
+"""
+AsyncBitbucketAPI 테스트 (httpx.MockTransport로 Bitbucket 2.0 엔드포인트 흉내)
+"""
+
+import re
+import json
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from app import bitbucket_api
+from app.async_bitbucket_api import AsyncBitbucketAPI
+from app.cache_store import BlobStore
+
+
+class FakeBitbucket:
+    """요청을 기록하고 최소한의 Bitbucket 응답을 돌려주는 MockTransport 핸들러"""
+
+    def __init__(self):
+        self.requests = []
+        self.heads = {'master': 'a' * 40}
+        self.files = {'src/wg_db/MatlDB.cpp': b'int main() {}\n'}
+        self.fail_queue = []
+        self.commit_count = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        body = await request.aread()
+        self.requests.append((request.method, request.url.path, request.headers, body))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            return self._respond(request, body)
+        finally:
+            self.active -= 1
+
+    def _respond(self, request, body):
+        if self.fail_queue:
+            status, headers = self.fail_queue.pop(0)
+            return httpx.Response(status, headers=headers, json={'type': 'error'})
+
+        path = request.url.path
+        if request.method == 'GET' and '/refs/branches/' in path:
+            branch = path.split('/refs/branches/', 1)[1]
+            if branch not in self.heads:
+                return httpx.Response(404, json={'type': 'error'})
+            return httpx.Response(200, json={'name': branch, 'target': {'hash': self.heads[branch]}})
+        if request.method == 'GET' and '/src/' in path:
+            file_path = path.split('/src/', 1)[1].split('/', 1)[1]
+            content = self.files.get(file_path)
+            return httpx.Response(404) if content is None else httpx.Response(200, content=content)
+        if request.method == 'POST' and path.endswith('/refs/branches'):
+            data = json.loads(body)
+            self.heads[data['name']] = data['target']['hash']
+            return httpx.Response(201, json=data)
+        if request.method == 'POST' and path.endswith('/src'):
+            branch = _form_field(body, 'branch')
+            parent = _form_field(body, 'parents')
+            if parent and parent != self.heads.get(branch):
+                return httpx.Response(409, json={'type': 'error'})
+            self.commit_count += 1
+            new_hash = f"{self.commit_count:040x}"
+            self.heads[branch] = new_hash
+            return httpx.Response(201, headers={'Location': f"https://bitbucket/2.0/commit/{new_hash}"})
+        if request.method == 'POST' and path.endswith('/pullrequests'):
+            return httpx.Response(201, json=dict(json.loads(body), id=7))
+        return httpx.Response(200, json={'name': 'genw_new'})
+
+
+def _form_field(body, name):
+    match = re.search(rb'name="' + name.encode() + rb'"\r\n\r\n([^\r]*)\r\n', body)
+    return match.group(1).decode() if match else None
+
+
+@pytest.fixture(autouse=True)
+def file_cache(tmp_path, monkeypatch):
+    cache = BlobStore('bitbucket_files', directory=str(tmp_path))
+    monkeypatch.setattr(bitbucket_api, '_file_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def server():
+    return FakeBitbucket()
+
+
+def _api(server, **kwargs):
+    return AsyncBitbucketAPI(
+        'https://bitbucket.test', 'user', 'token', 'mit_dev', 'genw_new',
+        http2=False, rate_limit=0, transport=httpx.MockTransport(server), **kwargs
+    )
+
+
+class TestAsyncBitbucketAPI:
+    """비동기 클라이언트 기본 동작"""
+
+    def test_issue_flow(self, server):
+        async def flow():
+            async with _api(server) as api:
+                valid, repo = await api.validate_token()
+                await api.create_branch('feature/GEN-1')
+                content = await api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'feature/GEN-1')
+                commit = await api.commit_multiple_files_binary('feature/GEN-1', [
+                    {'path': 'src/wg_db/MatlDB.cpp', 'content_bytes': content + b'// new\n', 'action': 'update'}
+                ], '[GEN-1] msg')
+                pr = await api.create_pull_request('feature/GEN-1', 'master', 'title', 'desc')
+                return valid, repo, content, commit, pr
+
+        valid, repo, content, commit, pr = asyncio.run(flow())
+
+        assert valid and repo['name'] == 'genw_new'
+        assert content == b'int main() {}\n'
+        assert pr['id'] == 7
+        assert server.heads['feature/GEN-1'] == f"{1:040x}"
+        # 브랜치 생성 시 받은 해시를 파일 조회와 커밋 부모로 재사용
+        ref_gets = [r for r in server.requests if r[0] == 'GET' and '/refs/branches/' in r[1]]
+        assert len(ref_gets) == 1
+        commit_request = next(r for r in server.requests if r[1].endswith('/src'))
+        assert int(commit_request[2]['Content-Length']) == len(commit_request[3])
+        assert commit_request[2]['Authorization'] == 'Bearer token'
+
+    def test_bulk_fetch_is_concurrent_and_bounded(self, server):
+        server.files.update({f'src/f{i}.cpp': b'x' * i for i in range(20)})
+
+        async def fetch():
+            async with _api(server, pool_size=4) as api:
+                return await api.get_files_raw([f'src/f{i}.cpp' for i in range(20)] + ['src/none.cpp'])
+
+        result = asyncio.run(fetch())
+
+        assert result['src/f3.cpp'] == b'xxx'
+        assert result['src/none.cpp'] is None
+        assert set(result.timings) == set(result)
+        assert server.peak == 4
+
+    def test_retry_after_then_success(self, server):
+        server.fail_queue = [(429, {'Retry-After': '0.1'})]
+
+        async def fetch():
+            async with _api(server) as api:
+                content = await api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'a' * 40)
+                return content, api.get_connection_stats()
+
+        content, stats = asyncio.run(fetch())
+        assert content == b'int main() {}\n'
+        assert stats['rate_limit']['throttled'] == 1
+
+    def test_stale_parent_refreshes(self, server):
+        async def flow():
+            async with _api(server) as api:
+                await api.create_branch('feature/GEN-1')
+                server.heads['feature/GEN-1'] = 'b' * 40  # 다른 사용자의 커밋
+                return await api.commit_file_binary('feature/GEN-1', 'a.cpp', b'a', 'msg')
+
+        asyncio.run(flow())
+        commits = [r for r in server.requests if r[1].endswith('/src')]
+        assert len(commits) == 2
+        assert _form_field(commits[1][3], 'parents') == 'b' * 40
+
+    def test_interleaves_issues_on_one_loop(self, server):
+        async def flow():
+            async with _api(server) as api:
+                await asyncio.gather(*(api.create_branch(f'feature/GEN-{i}') for i in range(10)))
+
+        asyncio.run(flow())
+        assert all(f'feature/GEN-{i}' in server.heads for i in range(10))
+        assert server.peak > 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
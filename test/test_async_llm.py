@@ -0,0 +1,174 @@
+"""
+비동기 LLM 경로 및 전역 동시성/RPM/TPM 제한 테스트 (가짜 AsyncOpenAI 클라이언트 사용)
+"""
+
+import time
+import json
+import asyncio
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app import async_llm
+from app.async_llm import LLMRuntime, RateLimiter, estimate_tokens
+from app.llm_handler import LLMHandler
+
+
+class SlowAsyncCompletions:
+    """동시 실행 수를 기록하는 가짜 chat.completions"""
+
+    def __init__(self, delay=0.1, total_tokens=None):
+        self.delay = delay
+        self.total_tokens = total_tokens
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    async def create(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        content = json.dumps({'modifications': [], 'summary': 'ok'})
+        usage = SimpleNamespace(total_tokens=self.total_tokens) if self.total_tokens else None
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    runtime = LLMRuntime(max_concurrency=3)
+    monkeypatch.setattr(async_llm, '_runtime', runtime)
+    monkeypatch.setenv('LLM_CACHE_ENABLED', 'false')
+    return runtime
+
+
+@pytest.fixture
+def handler(monkeypatch, runtime):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    handler = LLMHandler()
+    completions = SlowAsyncCompletions()
+    handler.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return handler, completions
+
+
+def _messages(i):
+    return [{'role': 'user', 'content': f'prompt {i}'}]
+
+
+class TestRateLimiter:
+    """RPM/TPM 제한기 테스트"""
+
+    def test_rpm_limit_waits_for_window(self):
+        limiter = RateLimiter(rpm=2, window=0.2)
+
+        async def scenario():
+            start = time.monotonic()
+            for _ in range(3):
+                await limiter.acquire(1)
+            return time.monotonic() - start
+
+        assert asyncio.run(scenario()) >= 0.18
+        assert limiter.stats()['waits'] == 1
+
+    def test_tpm_limit_and_usage_correction(self):
+        limiter = RateLimiter(tpm=100, window=0.2)
+
+        async def scenario():
+            event = await limiter.acquire(90)
+            limiter.record_usage(event, 10)  # 실제 사용량이 적으면 바로 다음 예약 가능
+            start = time.monotonic()
+            await limiter.acquire(80)
+            return time.monotonic() - start
+
+        assert asyncio.run(scenario()) < 0.1
+        assert limiter.stats()['tokens_in_window'] == 90
+
+    def test_waiter_wakes_when_usage_corrected(self):
+        """대기 중인 요청은 앞선 예약이 실제 사용량으로 줄어들면 구간 만료 전에 통과"""
+        limiter = RateLimiter(tpm=100, window=30)
+
+        async def scenario():
+            event = await limiter.acquire(90)
+            waiter = asyncio.ensure_future(limiter.acquire(50))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            start = time.monotonic()
+            limiter.record_usage(event, 20)
+            await asyncio.wait_for(waiter, timeout=2)
+            return time.monotonic() - start
+
+        assert asyncio.run(scenario()) < 0.5
+        assert limiter.stats()['tokens_in_window'] == 70
+        assert limiter.stats()['waits'] == 1
+
+    def test_oversized_request_does_not_block_forever(self):
+        limiter = RateLimiter(tpm=10, window=0.2)
+        asyncio.run(limiter.acquire(1000))
+        assert limiter.stats()['requests_in_window'] == 1
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens([{'role': 'user', 'content': 'a' * 400}], 50) == 150
+
+
+class TestAsyncLLMHandler:
+    """AsyncOpenAI 경로 테스트"""
+
+    def test_sync_wrapper_from_threads_is_bounded(self, handler, runtime):
+        llm, completions = handler
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda i: llm.chat_completion(_messages(i), temperature=0.1), range(8)
+            ))
+
+        assert len(results) == 8
+        assert completions.calls == 8
+        assert 1 < completions.peak <= runtime.max_concurrency
+
+    def test_async_variants_from_caller_loop(self, handler):
+        llm, completions = handler
+        issue = {'key': 'GEN-1', 'fields': {'summary': 'SDB', 'description': 'desc'}}
+
+        async def scenario():
+            return await asyncio.gather(
+                llm.aconvert_issue_to_spec(issue),
+                llm.agenerate_code_diff('a.cpp', 'int a;\n', 'desc', {}),
+                llm.agenerate_code_diff('b.cpp', 'int b;\n', 'desc', {}),
+            )
+
+        spec, diff_a, diff_b = asyncio.run(scenario())
+        assert spec
+        assert diff_a == [] and diff_b == []
+        assert completions.calls == 3
+        assert completions.peak > 1
+
+    def test_sync_api_inside_runtime_loop_is_rejected(self, runtime):
+        async def nested():
+            return runtime.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError):
+            runtime.submit(nested()).result(5)
+
+    def test_usage_recorded_in_limiter(self, handler, runtime):
+        llm, completions = handler
+        completions.total_tokens = 42
+        llm.chat_completion(_messages(0), temperature=0.1)
+
+        stats = llm.limiter_stats()
+        assert stats['tokens_in_window'] == 42
+        assert stats['in_flight'] == 0
+
+    def test_mock_mode_without_client(self, monkeypatch, runtime):
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        llm = LLMHandler()
+        issue = {'key': 'GEN-1', 'fields': {'summary': 'SDB', 'description': 'desc'}}
+        assert '기본 정보' in llm.convert_issue_to_spec(issue)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,70 @@
+"""
+벤치마크 실행기 테스트 (작은 합성 파일로 동작만 확인)
+"""
+
+import json
+import pytest
+from benchmarks import run_benchmarks
+from benchmarks.synthetic import generate_mfc_source, generate_modifications
+from app.code_chunker import CodeChunker
+
+
+class TestSyntheticSource:
+    """합성 MFC 소스 생성 테스트"""
+
+    def test_exact_line_count_and_deterministic(self):
+        content = generate_mfc_source(1000)
+        assert len(content.splitlines()) == 1000
+        assert content == generate_mfc_source(1000)
+        assert content != generate_mfc_source(1000, seed=1)
+
+    def test_contains_extractable_functions_and_region(self):
+        content = generate_mfc_source(1000)
+        chunker = CodeChunker()
+        functions = chunker._extract_functions_regex(content)
+        assert len(functions) > 10
+        assert all(f['name'].startswith('GetSteelList_') for f in functions)
+        assert chunker.extract_macro_region(content, 'MATLCODE_STL_')['relevant_macros']
+
+    def test_modifications_in_range(self):
+        content = generate_mfc_source(1000)
+        modifications = generate_modifications(content, count=20)
+        assert len(modifications) == 20
+        assert all(1 <= m['line_start'] <= 1000 for m in modifications)
+
+
+class TestRunner:
+    """측정/비교 로직 테스트"""
+
+    def test_run_small_size(self):
+        result = run_benchmarks.run([300], repeat=1, only=['regex_extract_functions', 'apply_diff_to_content'])
+        assert set(result['results']) == {'regex_extract_functions[300]', 'apply_diff_to_content[300]'}
+        stats = result['results']['regex_extract_functions[300]']
+        assert stats['repeat'] == 1
+        assert stats['min'] <= stats['median'] <= stats['max']
+        json.dumps(result)
+
+    def test_measure_stops_at_max_time(self):
+        calls = []
+        stats = run_benchmarks.measure(lambda: calls.append(1), repeat=1000, max_time=0.0)
+        assert stats['repeat'] == 1
+        assert len(calls) == 1  # 느린 첫 실행은 워밍업 없이 표본으로 사용
+
+    def test_compare_flags_regression(self, tmp_path):
+        base = {'results': {'a[1000]': {'median': 1.0}, 'b[1000]': {'median': 1.0}}}
+        new = {'results': {'a[1000]': {'median': 1.3}, 'b[1000]': {'median': 0.5}, 'c[1000]': {'median': 1.0}}}
+
+        rows = {row['case']: row for row in run_benchmarks.compare(base, new, threshold=0.15)}
+        assert rows['a[1000]']['regression'] is True
+        assert rows['b[1000]']['regression'] is False
+        assert 'c[1000]' not in rows
+
+        base_path, new_path = tmp_path / 'base.json', tmp_path / 'new.json'
+        base_path.write_text(json.dumps(base))
+        new_path.write_text(json.dumps(new))
+        assert run_benchmarks.main(['--compare', str(base_path), str(new_path)]) == 1
+        assert run_benchmarks.main(['--compare', str(base_path), str(base_path)]) == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
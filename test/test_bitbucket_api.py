@@ -0,0 +1,585 @@
+"""
+BitbucketAPI 테스트 (로컬 HTTP 서버로 Bitbucket 2.0 엔드포인트 흉내)
+"""
+
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from app import bitbucket_api
+from app.bitbucket_api import BitbucketAPI, glob_to_regex
+from app.cache_store import BlobStore
+
+
+class FakeBitbucketHandler(BaseHTTPRequestHandler):
+    """keep-alive를 지원하는 최소 Bitbucket 응답기"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in dict(self.server.extra_headers, **(headers or {})).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _injected_failure(self):
+        """fail_queue에 넣어 둔 (상태 코드, 헤더)로 응답"""
+        with self.server.lock:
+            if not self.server.fail_queue:
+                return False
+            status, headers = self.server.fail_queue.pop(0)
+        self._send(status, b'{"type": "error"}', headers=headers)
+        return True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(('GET', self.path, dict(self.headers)))
+        if self._injected_failure():
+            return
+        if '/refs/branches/' in self.path:
+            branch = self.path.split('/refs/branches/', 1)[1]
+            if branch in server.missing_branches:
+                self._send(404, b'{"type": "error"}')
+                return
+            body = json.dumps({'name': branch, 'target': {'hash': server.heads.get(branch, 'a' * 40)}})
+            self._send(200, body.encode())
+        elif '/src/' in self.path:
+            path = self.path.split('/src/', 1)[1].split('?', 1)[0]
+            ref, file_path = path.split('/', 1)
+            if file_path.endswith('/') or file_path == '' or _is_directory(server.files, file_path):
+                self._send_listing(file_path.strip('/'))
+                return
+            content = server.files.get(file_path)
+            if content is None:
+                self._send(404, b'{"type": "error"}')
+            else:
+                self._send(200, content, 'application/octet-stream')
+        else:
+            self._send(200, json.dumps({'name': 'genw_new'}).encode())
+
+    def _send_listing(self, directory):
+        """server.files로 만든 디렉토리 목록을 pagelen/page 단위로 응답"""
+        server = self.server
+        query = parse_qs(urlsplit(self.path).query)
+        pagelen = int(query.get('pagelen', ['10'])[0])
+        page = int(query.get('page', ['1'])[0])
+        if 'q' in query:
+            server.queries.append(query['q'][0])
+
+        prefix = f"{directory}/" if directory else ''
+        entries = {}
+        for file_path, content in server.files.items():
+            if not file_path.startswith(prefix):
+                continue
+            name = file_path[len(prefix):].split('/', 1)[0]
+            child = prefix + name
+            if child == file_path:
+                entries[child] = {'type': 'commit_file', 'path': child, 'size': len(content)}
+            else:
+                entries[child] = {'type': 'commit_directory', 'path': child}
+        if not entries:
+            self._send(404, b'{"type": "error"}')
+            return
+
+        values = [entries[key] for key in sorted(entries)]
+        body = {'pagelen': pagelen, 'page': page, 'values': values[(page - 1) * pagelen:page * pagelen]}
+        if page * pagelen < len(values):
+            query['page'] = [str(page + 1)]
+            host, port = server.server_address
+            body['next'] = f"http://{host}:{port}{urlsplit(self.path).path}?{urlencode(query, doseq=True)}"
+        self._send(200, json.dumps(body).encode())
+
+    def _read_chunked(self):
+        body = b''
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                return body
+            body += self.rfile.read(size)
+            self.rfile.readline()
+
+    def do_POST(self):
+        server = self.server
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = self._read_chunked()
+        else:
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length) if length else b''
+        with server.lock:
+            server.requests.append(('POST', self.path, dict(self.headers)))
+            server.bodies.append(body)
+        if self._injected_failure():
+            return
+        with server.lock:
+
+            if self.path.endswith('/refs/branches'):
+                data = json.loads(body)
+                server.heads[data['name']] = data['target']['hash']
+                self._send(201, json.dumps(data).encode())
+                return
+
+            if self.path.endswith('/src'):
+                branch = _form_field(body, 'branch')
+                parent = _form_field(body, 'parents')
+                if parent and parent != server.heads.get(branch):
+                    self._send(409, b'{"type": "error", "error": {"message": "parents mismatch"}}')
+                    return
+                server.commit_count += 1
+                new_hash = f"{server.commit_count:040x}"
+                server.heads[branch] = new_hash
+                self._send(201, b'', headers={
+                    'Location': f"http://bitbucket/2.0/repositories/ws/genw_new/commit/{new_hash}"
+                })
+                return
+
+        self._send(201, b'')
+
+
+def _is_directory(files, path):
+    return any(file_path.startswith(path.rstrip('/') + '/') for file_path in files)
+
+
+def _form_field(body, name):
+    """multipart 본문에서 일반 필드 값 추출"""
+    match = re.search(rb'name="' + name.encode() + rb'"\r\n\r\n([^\r]*)\r\n', body)
+    return match.group(1).decode() if match else None
+
+
+@pytest.fixture(autouse=True)
+def file_cache(tmp_path, monkeypatch):
+    cache = BlobStore('bitbucket_files', directory=str(tmp_path))
+    monkeypatch.setattr(bitbucket_api, '_file_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def bitbucket_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBitbucketHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.bodies = []
+    server.commit_count = 0
+    server.missing_branches = set()
+    server.fail_queue = []
+    server.extra_headers = {}
+    server.queries = []
+    server.heads = {'master': 'a' * 40}
+    server.files = {'src/wg_db/MatlDB.cpp': b'int main() {}\n'}
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(bitbucket_server):
+    host, port = bitbucket_server.server_address
+    client = BitbucketAPI(
+        url=f"http://{host}:{port}",
+        username='user',
+        access_token='token',
+        workspace='ws',
+        repository='genw_new',
+        pool_size=4
+    )
+    yield client
+    client.close()
+
+
+class TestConnectionPooling:
+    """커넥션 풀/keep-alive 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def no_file_cache(self, monkeypatch):
+        # 매번 실제 다운로드가 일어나도록 파일 캐시 비활성화
+        monkeypatch.setenv('BITBUCKET_FILE_CACHE_ENABLED', 'false')
+
+    def test_connections_are_reused(self, api):
+        for _ in range(5):
+            assert api.get_file_content_raw('src/wg_db/MatlDB.cpp') == b'int main() {}\n'
+
+        # 브랜치 해시 조회 1회 + 다운로드 5회
+        stats = api.get_connection_stats()
+        assert stats['requests'] == 6
+        assert stats['connections_opened'] == 1
+        assert stats['connections_reused'] == 5
+
+    def test_gzip_and_keepalive_headers(self, api, bitbucket_server):
+        api.validate_token()
+        headers = bitbucket_server.requests[-1][2]
+        assert 'gzip' in headers.get('Accept-Encoding', '')
+        assert headers.get('Authorization') == 'Bearer token'
+
+    def test_concurrent_requests_respect_pool_size(self, api):
+        api.get_branch_head('master')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: api.get_file_content_raw('src/wg_db/MatlDB.cpp'), range(32)
+            ))
+
+        assert all(r == b'int main() {}\n' for r in results)
+        stats = api.get_connection_stats()
+        assert stats['requests'] == 33
+        assert stats['connections_opened'] <= api.pool_size
+
+    def test_missing_file_returns_none(self, api):
+        assert api.get_file_content_raw('src/none.cpp') is None
+
+
+
+def _ref_gets(server):
+    return [path for method, path, _ in server.requests if method == 'GET' and '/refs/branches/' in path]
+
+
+def _commit_posts(server):
+    return [path for method, path, _ in server.requests if method == 'POST' and path.endswith('/src')]
+
+
+class TestRefCache:
+    """브랜치 해시 캐시 테스트"""
+
+    def test_issue_flow_needs_one_ref_lookup(self, api, bitbucket_server):
+        api.create_branch('feature/GEN-1')
+        api.commit_multiple_files_binary(
+            'feature/GEN-1', [{'path': 'a.cpp', 'content_bytes': b'a'}], 'multi')
+        api.commit_file_binary('feature/GEN-1', 'b.cpp', b'b', 'single')
+        api.commit_file('feature/GEN-1', 'c.cpp', 'c', 'text')
+        api.commit_multiple_files('feature/GEN-1', [{'path': 'd.cpp', 'content': 'd'}], 'multi text')
+
+        assert len(_ref_gets(bitbucket_server)) == 1
+        assert len(_commit_posts(bitbucket_server)) == 4
+        stats = api.get_connection_stats()
+        assert stats['ref_lookups'] == 1
+        assert stats['ref_cache_hits'] == 4
+
+    def test_commit_response_updates_parent(self, api, bitbucket_server):
+        api.create_branch('feature/GEN-1')
+        api.commit_file_binary('feature/GEN-1', 'a.cpp', b'a', 'first')
+        api.commit_file_binary('feature/GEN-1', 'b.cpp', b'b', 'second')
+
+        # 두 번째 커밋의 부모는 첫 커밋 응답(Location)의 해시
+        assert b'name="parents"\r\n\r\n' + f"{1:040x}".encode() in bitbucket_server.bodies[-1]
+        assert bitbucket_server.heads['feature/GEN-1'] == f"{2:040x}"
+
+    def test_stale_parent_refreshes_and_retries(self, api, bitbucket_server):
+        api.create_branch('feature/GEN-1')
+        # 다른 클라이언트가 브랜치에 먼저 커밋
+        bitbucket_server.heads['feature/GEN-1'] = 'b' * 40
+
+        api.commit_multiple_files_binary(
+            'feature/GEN-1', [{'path': 'a.cpp', 'content_bytes': b'payload'}], 'multi')
+
+        assert len(_commit_posts(bitbucket_server)) == 2
+        assert len(_ref_gets(bitbucket_server)) == 2
+        # 재시도 요청에도 파일 본문이 그대로 전송됨
+        assert b'payload' in bitbucket_server.bodies[-1]
+        assert b'b' * 40 in bitbucket_server.bodies[-1]
+
+    def test_explicit_parent_is_not_retried(self, api, bitbucket_server):
+        with pytest.raises(Exception):
+            api.commit_file('master', 'a.cpp', 'a', 'msg', parent_commit='c' * 40)
+        assert len(_commit_posts(bitbucket_server)) == 1
+        assert _ref_gets(bitbucket_server) == []
+
+    def test_expired_entry_is_refetched(self, bitbucket_server):
+        host, port = bitbucket_server.server_address
+        client = BitbucketAPI(f"http://{host}:{port}", 'user', 'token', 'ws', 'genw_new', ref_cache_ttl=0)
+        try:
+            client.create_branch('feature/GEN-1')
+            client.commit_file_binary('feature/GEN-1', 'a.cpp', b'a', 'first')
+            client.commit_file_binary('feature/GEN-1', 'b.cpp', b'b', 'second')
+            assert len(_ref_gets(bitbucket_server)) == 3
+        finally:
+            client.close()
+
+
+def _src_gets(server):
+    return [path for method, path, _ in server.requests if method == 'GET' and '/src/' in path]
+
+
+class TestFileCache:
+    """커밋 해시 기준 파일 캐시 테스트"""
+
+    def test_fetches_by_commit_hash(self, api, bitbucket_server):
+        api.get_file_content_raw('src/wg_db/MatlDB.cpp')
+        assert _src_gets(bitbucket_server) == [f"/2.0/repositories/ws/genw_new/src/{'a' * 40}/src/wg_db/MatlDB.cpp"]
+
+    def test_repeat_reads_cost_one_ref_lookup(self, bitbucket_server, file_cache):
+        host, port = bitbucket_server.server_address
+        for _ in range(3):
+            # 새 클라이언트(새 워커)여도 디스크 캐시 재사용
+            client = BitbucketAPI(f"http://{host}:{port}", 'user', 'token', 'ws', 'genw_new')
+            assert client.get_file_content_raw('src/wg_db/MatlDB.cpp') == b'int main() {}\n'
+            client.close()
+
+        assert len(_src_gets(bitbucket_server)) == 1
+        assert len(_ref_gets(bitbucket_server)) == 3
+        assert file_cache.stats()['hits'] == 2
+
+    def test_new_commit_downloads_again(self, api, bitbucket_server):
+        api.get_file_content_raw('src/wg_db/MatlDB.cpp')
+        bitbucket_server.heads['master'] = 'b' * 40
+        bitbucket_server.files['src/wg_db/MatlDB.cpp'] = b'int main() { return 1; }\n'
+        api.invalidate_ref('master')
+
+        assert api.get_file_content_raw('src/wg_db/MatlDB.cpp') == b'int main() { return 1; }\n'
+        assert len(_src_gets(bitbucket_server)) == 2
+
+    def test_identical_content_stored_once(self, file_cache):
+        file_cache.put('repo/' + 'a' * 40 + '/x.cpp', b'same')
+        file_cache.put('repo/' + 'b' * 40 + '/x.cpp', b'same')
+
+        assert file_cache.get('repo/' + 'b' * 40 + '/x.cpp') == b'same'
+        # blob 1개 + 참조 2개
+        assert file_cache.stats()['disk_bytes'] == len(b'same') + 2 * 64
+
+    def test_evicted_blob_is_a_miss(self, tmp_path):
+        cache = BlobStore('files', directory=str(tmp_path), max_bytes=300)
+        cache.put('first', b'x' * 200)
+        cache.put('second', b'y' * 200)
+
+        assert cache.get('first') is None
+        assert cache.get('second') == b'y' * 200
+
+    def test_missing_branch_returns_none(self, api, bitbucket_server):
+        bitbucket_server.missing_branches = {'nope'}
+        assert api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'nope') is None
+
+
+
+class TestBulkFetch:
+    """get_files_raw 일괄 조회 테스트"""
+
+    def test_returns_mapping_with_timings(self, api, bitbucket_server):
+        bitbucket_server.files['src/wg_db/MatlDB.h'] = b'#pragma once\n'
+        paths = ['src/wg_db/MatlDB.cpp', 'src/wg_db/MatlDB.h', 'src/none.cpp', 'src/wg_db/MatlDB.cpp']
+
+        result = api.get_files_raw(paths)
+
+        assert list(result) == ['src/wg_db/MatlDB.cpp', 'src/wg_db/MatlDB.h', 'src/none.cpp']
+        assert result['src/wg_db/MatlDB.h'] == b'#pragma once\n'
+        assert result['src/none.cpp'] is None
+        assert set(result.timings) == set(result)
+        assert result.errors == {}
+        assert result.commit_hash == 'a' * 40
+        # 브랜치 해시 조회는 한 번만
+        assert len(_ref_gets(bitbucket_server)) == 1
+
+    def test_concurrency_bounded_by_pool(self, api, bitbucket_server):
+        for i in range(20):
+            bitbucket_server.files[f'src/f{i}.cpp'] = b'x'
+
+        result = api.get_files_raw([f'src/f{i}.cpp' for i in range(20)], max_workers=16)
+
+        assert all(result[f'src/f{i}.cpp'] == b'x' for i in range(20))
+        assert api.get_connection_stats()['connections_opened'] <= api.pool_size
+
+    def test_errors_reported_per_path(self, api, monkeypatch):
+        original = api.get_file_content_raw
+
+        def flaky(file_path, branch="master"):
+            if file_path == 'src/broken.cpp':
+                raise RuntimeError("connection reset")
+            return original(file_path, branch)
+
+        monkeypatch.setattr(api, 'get_file_content_raw', flaky)
+        result = api.get_files_raw(['src/wg_db/MatlDB.cpp', 'src/broken.cpp'])
+
+        assert result['src/wg_db/MatlDB.cpp'] == b'int main() {}\n'
+        assert 'src/broken.cpp' not in result
+        assert isinstance(result.errors['src/broken.cpp'], RuntimeError)
+
+
+class TestRateLimiting:
+    """429/Retry-After/쿼터 헤더 처리 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def fast_backoff(self, monkeypatch):
+        monkeypatch.setenv('BITBUCKET_RETRY_BASE_DELAY', '0.01')
+
+    def test_retry_after_honored(self, api, bitbucket_server):
+        bitbucket_server.fail_queue = [(429, {'Retry-After': '0.2'})] * 2
+
+        start = time.monotonic()
+        assert api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'a' * 40) == b'int main() {}\n'
+
+        assert time.monotonic() - start >= 0.4
+        stats = api.get_rate_limit_stats()
+        assert stats['throttled'] == 2
+        assert stats['retries'] == 2
+        # 연속 429는 쿨다운 안에서 한 번만 축소
+        assert stats['concurrency_limit'] == api.pool_size // 2
+
+    def test_throttled_commit_resends_body(self, api, bitbucket_server):
+        api.create_branch('feature/GEN-1')
+        bitbucket_server.fail_queue = [(429, {'Retry-After': '0'})]
+
+        api.commit_file_binary('feature/GEN-1', 'a.cpp', b'payload', 'msg')
+
+        commit_bodies = [body for body in bitbucket_server.bodies if b'payload' in body]
+        assert len(commit_bodies) == 2
+        # multipart 경계 문자열만 다르고 내용은 동일 (스트림을 처음부터 다시 생성해 재전송)
+        without_boundary = [re.sub(rb'--[0-9a-f]{32}', b'', body) for body in commit_bodies]
+        assert without_boundary[0] == without_boundary[1]
+
+    def test_long_retry_after_fails_fast(self, api, bitbucket_server):
+        bitbucket_server.fail_queue = [(429, {'Retry-After': '3600'})]
+
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.HTTPError):
+            api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'a' * 40)
+        assert time.monotonic() - start < 5
+
+    def test_server_errors_retried_only_for_idempotent(self, api, bitbucket_server):
+        bitbucket_server.fail_queue = [(503, {})]
+        assert api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'a' * 40) == b'int main() {}\n'
+
+        bitbucket_server.fail_queue = [(503, {})]
+        with pytest.raises(requests.exceptions.HTTPError):
+            api.commit_file_binary('master', 'a.cpp', b'a', 'msg', parent_commit='a' * 40)
+        assert len(_commit_posts(bitbucket_server)) == 1
+
+    def test_quota_headers_tracked_and_paced(self, api, bitbucket_server):
+        bitbucket_server.extra_headers = {
+            'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '50', 'X-RateLimit-Reset': '100'
+        }
+        api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'a' * 40)
+
+        stats = api.get_connection_stats()['rate_limit']
+        assert stats['limit'] == 1000
+        assert stats['remaining'] == 50
+        assert 0 < stats['reset_in'] <= 100
+        # 남은 50회를 100초에 나눠 사용
+        assert stats['request_rate'] == pytest.approx(0.5, rel=0.05)
+
+        from app import metrics
+        assert metrics.BITBUCKET_QUOTA_REMAINING.value() == 50
+
+
+class TestStreamingCommit:
+    """스트리밍 multipart 커밋 테스트"""
+
+    @pytest.fixture
+    def changes(self):
+        return [{'path': f'src/wg_db/File{i:02d}.cpp', 'content_bytes': f'// {i}\r\n'.encode() * 100, 'action': 'update'}
+                for i in range(30)]
+
+    def _commit_request(self, server):
+        posts = [(path, headers) for method, path, headers in server.requests if method == 'POST']
+        index = next(i for i, (path, _) in enumerate(posts) if path.endswith('/src'))
+        return posts[index][1], server.bodies[index]
+
+    def test_many_files_in_one_request(self, api, bitbucket_server, changes):
+        api.commit_multiple_files_binary('master', changes, 'many files')
+
+        headers, body = self._commit_request(bitbucket_server)
+        assert len(_commit_posts(bitbucket_server)) == 1
+        assert int(headers['Content-Length']) == len(body)
+        assert _form_field(body, 'message') == 'many files'
+        for change in changes:
+            assert f'filename="{change["path"]}"'.encode() in body
+            assert change['content_bytes'] in body
+
+    def test_chunked_transfer(self, api, bitbucket_server, changes):
+        api.upload_chunked = True
+        api.commit_multiple_files_binary('master', changes[:3], 'chunked')
+
+        headers, body = self._commit_request(bitbucket_server)
+        assert headers['Transfer-Encoding'] == 'chunked'
+        assert 'Content-Length' not in headers
+        assert _form_field(body, 'branch') == 'master'
+        assert changes[2]['content_bytes'] in body
+
+    def test_text_commit_encoded_as_utf8(self, api, bitbucket_server):
+        api.commit_file('master', 'README.md', '한글 내용', 'text')
+
+        _, body = self._commit_request(bitbucket_server)
+        assert '한글 내용'.encode('utf-8') in body
+
+
+def _listing_gets(server):
+    return [path for method, path, _ in server.requests
+            if method == 'GET' and '/src/' in path and path.split('?', 1)[0].endswith('/')]
+
+
+class TestTreeWalker:
+    """페이지네이션을 따라가는 저장소 트리 순회 테스트"""
+
+    @pytest.fixture
+    def tree(self, bitbucket_server):
+        files = {f'src/wg_db/File{i:02d}.cpp': b'x' for i in range(25)}
+        files.update({
+            'src/wg_db/DBCodeDef.h': b'#define A 1\n',
+            'src/wg_db/sub/Deep.cpp': b'y',
+            'src/wg_ui/View.cpp': b'z',
+            'src/other/Skip.cpp': b's',
+            'docs/readme.md': b'd',
+        })
+        bitbucket_server.files = files
+        return files
+
+    def test_glob_matching(self):
+        matcher = glob_to_regex('src/wg_*/**/*.cpp')
+        assert matcher.match('src/wg_db/MatlDB.cpp')
+        assert matcher.match('src/wg_db/sub/Deep.cpp')
+        assert not matcher.match('src/other/Skip.cpp')
+        assert not matcher.match('src/wg_db/DBCodeDef.h')
+        assert not matcher.match('src/wg_db/MatlDB.cpp.bak')
+
+    def test_pattern_walk_follows_pages(self, api, bitbucket_server, tree):
+        paths = [entry['path'] for entry in api.walk_tree(ref='master', pattern='src/wg_*/**/*.cpp', pagelen=10)]
+
+        expected = {path for path in tree if path.endswith('.cpp') and path.startswith('src/wg_')}
+        assert sorted(paths) == sorted(expected)
+        assert len(paths) == len(set(paths))
+        # 확장자 조건은 서버 측 필터로 전달
+        assert bitbucket_server.queries[0] == 'type="commit_directory" OR path ~ ".cpp"'
+
+    def test_unmatched_directories_not_requested(self, api, bitbucket_server, tree):
+        list(api.walk_tree(ref='master', pattern='src/wg_*/**/*.cpp', pagelen=10))
+
+        requested = _listing_gets(bitbucket_server)
+        assert not any('/src/other/' in path or '/docs/' in path for path in requested)
+        # 고정 접두 디렉토리(src)부터 시작하고, 브랜치는 커밋 해시로 한 번만 해석
+        assert not any(path.split('?', 1)[0].endswith('/' + 'a' * 40 + '/') for path in requested)
+        assert len(_ref_gets(bitbucket_server)) == 1
+
+    def test_walk_is_lazy(self, api, bitbucket_server, tree):
+        walker = api.walk_tree(ref='a' * 40, pattern='src/wg_*/**/*.cpp', pagelen=5, prefetch=1)
+        first = next(walker)
+        requested = len(_listing_gets(bitbucket_server))
+        walker.close()
+
+        assert first['path'].endswith('.cpp')
+        # 25개 이상의 파일이 있어도 첫 항목까지는 몇 페이지만 요청
+        assert requested <= 4
+
+    def test_include_dirs(self, api, tree):
+        entries = list(api.walk_tree('src/wg_db', ref='a' * 40, include_dirs=True))
+        assert {'type': 'commit_directory', 'path': 'src/wg_db/sub'} in entries
+        assert len(entries) == 28
+
+    def test_directory_listing_returns_all_pages(self, api, bitbucket_server, tree):
+        listing = api.get_directory_listing('src/wg_db', 'a' * 40)
+        assert len(listing) == 27
+        # 서버 기본 페이지 크기 10 → 3페이지
+        assert len(_src_gets(bitbucket_server)) == 3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
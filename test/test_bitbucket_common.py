@@ -0,0 +1,113 @@
+"""
+BitbucketClientBase 테스트 (동기/비동기 클라이언트가 공유하는 캐시/429·쿼터/커밋 응답 로직)
+"""
+
+import json
+import time
+
+import pytest
+from app.bitbucket_api import BitbucketAPI
+from app.bitbucket_common import BitbucketClientBase
+
+
+class FakeResponse:
+    """requests/httpx 응답 중 공통 로직이 사용하는 속성만 흉내"""
+
+    def __init__(self, status_code=200, headers=None, body=None, text=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        if text is None:
+            text = json.dumps(body) if body is not None else ''
+        self.text = text
+        self.content = text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class Client(BitbucketClientBase):
+    def __init__(self, **kwargs):
+        self._init_client_state(**kwargs)
+
+
+class TestRefCache:
+    """브랜치 해시 캐시 테스트"""
+
+    def test_commit_location_then_body(self):
+        client = Client(ref_cache_ttl=60, rate_limit=0)
+        client._update_ref_from_commit('main', FakeResponse(headers={'Location': '/commit/' + 'b' * 40}))
+        assert client._cached_ref('main') == 'b' * 40
+
+        client._update_ref_from_commit('main', FakeResponse(body={'hash': 'c' * 40}))
+        assert client._cached_ref('main') == 'c' * 40
+
+        # 해시를 알 수 없으면 다음 커밋에서 다시 조회
+        client._update_ref_from_commit('main', FakeResponse())
+        assert client._cached_ref('main') is None
+
+    def test_ttl_expiry_and_disabled(self):
+        client = Client(ref_cache_ttl=0.05, rate_limit=0)
+        client._remember_ref('main', 'a' * 40)
+        time.sleep(0.06)
+        assert client._cached_ref('main') is None
+
+        disabled = Client(ref_cache_ttl=0, rate_limit=0)
+        disabled._remember_ref('main', 'a' * 40)
+        assert disabled._cached_ref('main') is None
+
+    def test_parse_branch_head(self):
+        assert Client._parse_branch_head(FakeResponse(body={'target': {'hash': 'd' * 40}}), 'main') == 'd' * 40
+        with pytest.raises(Exception, match="'main'"):
+            Client._parse_branch_head(FakeResponse(text='<html>'), 'main')
+
+
+class TestThrottleAndQuota:
+    """429/쿼터 처리 테스트"""
+
+    def test_retry_after_pauses_or_gives_up(self):
+        client = Client(rate_limit=0)
+        assert client._on_throttled(FakeResponse(429, {'Retry-After': '0.05'}), 0) == 0.05
+        client.max_retry_wait = 10
+        assert client._on_throttled(FakeResponse(429, {'Retry-After': '60'}), 0) is None
+        assert client._rate_limit_snapshot()['throttled'] == 2
+
+    def test_quota_paces_and_restores_rate(self):
+        client = Client(rate_limit=10)
+        reset = str(int(time.time()) + 100)
+        client._observe_quota(FakeResponse(headers={
+            'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '50', 'X-RateLimit-Reset': reset
+        }))
+        assert 0.4 <= client._rate_limiter.rate <= 0.6
+
+        client._observe_quota(FakeResponse(headers={
+            'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '900', 'X-RateLimit-Reset': reset
+        }))
+        assert client._rate_limiter.rate == 10
+
+    def test_sync_client_also_reduces_concurrency(self):
+        api = BitbucketAPI('https://example', 'user', 'token', 'ws', 'repo', pool_size=8, rate_limit=0)
+        api._on_throttled(FakeResponse(429, {'Retry-After': '0'}), 0)
+        assert api.get_rate_limit_stats()['concurrency_limit'] == 4
+
+
+class TestCommitHelpers:
+    """커밋 본문/응답 처리 테스트"""
+
+    def test_commit_result(self):
+        assert Client._commit_result(FakeResponse(body={'hash': 'e' * 40})) == {'hash': 'e' * 40}
+        assert Client._commit_result(FakeResponse())['status'] == 'success'
+        broken = Client._commit_result(FakeResponse(201, text='not json'))
+        assert broken['status_code'] == 201
+        assert 'parse_error' in broken
+
+    def test_binary_commit_files(self):
+        files = Client._binary_commit_files([
+            {'path': 'a.cpp', 'content_bytes': b'a'},
+            {'path': 'b.cpp', 'content_bytes': None},
+            {'path': 'c.cpp', 'content_bytes': b'c', 'action': 'delete'},
+        ])
+        assert files == {'a.cpp': ('a.cpp', b'a', 'application/octet-stream')}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,115 @@
+"""
+캐시 저장소 및 Clang 함수 추출 캐시 테스트
+"""
+
+import time
+import pytest
+from app import code_chunker
+from app.cache_store import LRUCache, DiskCache, TieredCache, make_cache_key, content_hash
+from app.code_chunker import ClangASTChunker
+
+
+SAMPLE_CPP = """
+BOOL CMatlDB::GetSteelList_SP16_2017_tB4(T_UNIT_INDEX UnitIndex, OUT T_MATL_LIST_STEEL& raSteelList)
+{
+    return TRUE;
+}
+
+BOOL CMatlDB::GetSteelList_SP16_2017_tB5(T_UNIT_INDEX UnitIndex, OUT T_MATL_LIST_STEEL& raSteelList)
+{
+    return FALSE;
+}
+"""
+
+
+class TestCacheStore:
+    """LRU/디스크/2단계 캐시 테스트"""
+
+    def test_make_cache_key_stable(self):
+        assert make_cache_key('a', [1, 2], {'b': 1}) == make_cache_key('a', [1, 2], {'b': 1})
+        assert make_cache_key('a') != make_cache_key('b')
+        assert content_hash('abc') == content_hash(b'abc')
+
+    def test_lru_eviction(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # a를 최근 사용으로
+        assert cache.set('c', 3) == 1
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+
+    def test_tiered_cache_survives_new_instance(self, tmp_path):
+        first = TieredCache('ns', directory=str(tmp_path))
+        first.set('key', [{'name': 'f', 'line_start': 1}])
+
+        second = TieredCache('ns', directory=str(tmp_path))
+        assert second.get('key') == [{'name': 'f', 'line_start': 1}]
+        assert second.get('key') == [{'name': 'f', 'line_start': 1}]
+
+        stats = second.stats()
+        assert stats['disk_hits'] == 1
+        assert stats['memory_hits'] == 1
+        assert stats['misses'] == 0
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = TieredCache('ns', directory=str(tmp_path), ttl=0.05)
+        cache.set('key', 'value')
+        assert cache.get('key') == 'value'
+        time.sleep(0.1)
+        assert cache.get('key') is None
+        assert cache.stats()['misses'] == 1
+
+    def test_disk_size_eviction(self, tmp_path):
+        disk = DiskCache(str(tmp_path), max_bytes=2500)
+        for i in range(5):
+            disk.set(f"{i:02d}key", b'x' * 1000)
+            time.sleep(0.01)
+
+        assert disk.total_bytes <= 2500
+        assert disk.get('04key') is not None
+        assert disk.get('00key') is None
+
+
+class TestFunctionCache:
+    """Clang 함수 추출 캐시 테스트"""
+
+    @pytest.fixture
+    def chunker(self, tmp_path, monkeypatch):
+        chunker = ClangASTChunker()
+        if not chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setattr(code_chunker, '_function_cache', TieredCache('clang_functions', directory=str(tmp_path)))
+        return chunker
+
+    def test_second_extraction_skips_parse(self, chunker, monkeypatch):
+        first = chunker.extract_functions(SAMPLE_CPP)
+        assert len(first) == 2
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("캐시 적중 시 재파싱하면 안 됨")
+
+        monkeypatch.setattr(chunker.index, 'parse', fail_parse)
+        second = chunker.extract_functions(SAMPLE_CPP)
+
+        assert [(f['name'], f['line_start'], f['line_end']) for f in second] == \
+               [(f['name'], f['line_start'], f['line_end']) for f in first]
+        assert second[0]['content'] == first[0]['content']
+        assert chunker.cache_stats()['memory_hits'] == 1
+
+    def test_changed_content_invalidates(self, chunker):
+        chunker.extract_functions(SAMPLE_CPP)
+        modified = SAMPLE_CPP.replace('return FALSE;', 'int a = 0;\n    return FALSE;')
+        functions = chunker.extract_functions(modified)
+
+        assert functions[1]['line_end'] == 11
+        assert chunker.cache_stats()['misses'] == 2
+
+    def test_cache_disabled(self, chunker, monkeypatch):
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        assert code_chunker.get_function_cache() is None
+        assert len(chunker.extract_functions(SAMPLE_CPP)) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
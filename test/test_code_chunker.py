@@ -0,0 +1,405 @@
+"""
+함수 경계 색인(FunctionBoundaryIndex) 및 Clang 함수 위치 매핑 테스트
+"""
+
+import tempfile
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from app import code_chunker
+from app.cache_store import TieredCache
+from app.code_chunker import (
+    ClangASTChunker, CodeChunker, FunctionBoundaryIndex, new_syntax_errors, scan_brace_depths
+)
+
+
+OVERLOADED_CPP = """
+BOOL CMatlDB::SetValue(int nValue)
+{
+    m_nValue = nValue;
+    return TRUE;
+}
+
+BOOL CMatlDB::SetValue(double dValue)
+{
+    if (dValue > 0) {
+        m_dValue = dValue;
+    }
+    return TRUE;
+}
+
+static int Helper(int a)
+{
+    return a + 1;
+}
+"""
+
+LITERAL_BRACES_CPP = """
+void CMatlDB::Dump()
+{
+    // 닫는 중괄호 } 는 주석이므로 무시
+    CString str = _T("{ 문자열 안의 \\" { 중괄호");
+    char c = '}';
+    /* 블록 주석 {
+       여러 줄 } */
+    const char* raw = R"json({"a": {"b": 1}})json";
+}
+
+BOOL CMatlDB::Next()
+{
+    return TRUE;
+}
+"""
+
+DECLARATIONS_CPP = """
+class CShape
+{
+public:
+    CShape() = default;
+    virtual double Area() const = 0;
+    int Count() const { return m_nCount; }
+    int m_nCount;
+};
+
+void Prototype(int a);
+
+namespace geometry
+{
+double Scale(double value) // 배율; 주석 안의 세미콜론
+{
+    return value * 2;
+}
+}
+
+void Prototype(int a)
+{
+    (void)a;
+}
+"""
+
+
+class TestBraceDepths:
+    """주석/문자열을 건너뛰는 중괄호 깊이 계산 테스트"""
+
+    def test_literals_and_comments_ignored(self):
+        lines = LITERAL_BRACES_CPP.splitlines()
+        depth, close_of = scan_brace_depths(lines)
+
+        assert close_of[3] == 10
+        assert [depth[n] for n in range(3, 11)] == [1, 1, 1, 1, 1, 1, 1, 0]
+        assert close_of[13] == 15
+
+    def test_depth_array_per_line(self):
+        index = FunctionBoundaryIndex(OVERLOADED_CPP.splitlines())
+        assert index.depth_at(1) == 0
+        assert index.depth_at(9) == 1
+        assert index.depth_at(10) == 2
+        assert index.depth_at(14) == 0
+        assert index.depth_at(999) == 0
+
+    def test_regex_fallback_uses_lexer(self):
+        functions = CodeChunker()._extract_functions_regex(LITERAL_BRACES_CPP)
+
+        assert [(f['name'], f['line_start'], f['line_end']) for f in functions] == [
+            ('Dump', 2, 10), ('Next', 12, 15)
+        ]
+        assert functions[0]['content'].endswith('}')
+
+
+class TestFunctionBoundaryIndex:
+    """원본 한 번 순회로 만든 색인 테스트 (libclang 불필요)"""
+
+    def test_function_end_matches_braces(self):
+        index = FunctionBoundaryIndex(OVERLOADED_CPP.splitlines())
+        assert index.function_end(2) == 6
+        assert index.function_end(8) == 14
+        assert index.function_end(16) == 19
+        assert index.function_end(100) is None
+
+    def test_overloads_resolved_by_nearest_candidate(self):
+        index = FunctionBoundaryIndex(OVERLOADED_CPP.splitlines())
+        assert index.find_signature('CMatlDB', 'SetValue') == 2
+        assert index.find_signature('CMatlDB', 'SetValue', near=9) == 8
+        assert index.find_signature(None, 'Helper') == 16
+        assert index.find_signature('CMatlDB', 'Missing') is None
+
+    def test_extent_validation(self):
+        index = FunctionBoundaryIndex(OVERLOADED_CPP.splitlines())
+        assert index.is_function_extent(8, 14) is True
+        assert index.is_function_extent(8, 11) is False
+        assert index.is_function_extent(0, 6) is False
+
+
+class TestClangFunctionLocations:
+    """Clang extent → 원본 라인 매핑 테스트"""
+
+    @pytest.fixture
+    def chunker(self, monkeypatch):
+        chunker = ClangASTChunker()
+        if not chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        return chunker
+
+    def test_overloads_get_distinct_ranges(self, chunker):
+        functions = chunker.extract_functions(OVERLOADED_CPP)
+
+        assert [(f['name'], f['line_start'], f['line_end']) for f in functions] == [
+            ('SetValue', 2, 6), ('SetValue', 8, 14), ('Helper', 16, 19)
+        ]
+        assert 'double dValue' in functions[1]['content']
+
+    def test_prelude_offset_applied(self, chunker):
+        # CMatlDB 선언이 없으므로 전처리가 클래스 스텁을 앞에 붙임
+        assert chunker._build_parse_prelude(OVERLOADED_CPP)
+        functions = chunker.extract_functions(OVERLOADED_CPP)
+        lines = OVERLOADED_CPP.splitlines()
+
+        for function in functions:
+            assert function['name'] in lines[function['line_start'] - 1]
+            assert lines[function['line_end'] - 1].strip() == '}'
+
+    def test_parses_in_memory(self, chunker, monkeypatch):
+        def no_temp_files(*args, **kwargs):
+            raise AssertionError("임시 파일을 만들면 안 됨")
+
+        monkeypatch.setattr(tempfile, 'NamedTemporaryFile', no_temp_files)
+        monkeypatch.setattr(tempfile, 'mkstemp', no_temp_files)
+        parse_calls = []
+        original_parse = chunker.index.parse
+
+        def recording_parse(path, **kwargs):
+            parse_calls.append((path, kwargs.get('unsaved_files')))
+            return original_parse(path, **kwargs)
+
+        monkeypatch.setattr(chunker.index, 'parse', recording_parse)
+        assert len(chunker.extract_functions(OVERLOADED_CPP)) == 3
+
+        path, unsaved_files = parse_calls[0]
+        assert path == code_chunker.CLANG_VIRTUAL_SOURCE
+        assert unsaved_files[0][0] == path
+        assert unsaved_files[0][1].endswith(OVERLOADED_CPP)
+
+    def test_fast_parse_matches_full_parse(self, chunker, monkeypatch):
+        def table(functions):
+            return [(f['name'], f['line_start'], f['line_end'], f['class_name'], f['signature']) for f in functions]
+
+        fast = chunker.extract_functions(DECLARATIONS_CPP)
+        monkeypatch.setenv('CLANG_FAST_PARSE', 'false')
+        full = chunker.extract_functions(DECLARATIONS_CPP)
+
+        # 선언(프로토타입, = default, = 0)은 제외하고 정의만, 클래스/네임스페이스 안까지
+        assert [(name, start, end) for name, start, end, _, _ in table(fast)] == [
+            ('Count', 7, 7), ('Scale', 15, 18), ('Prototype', 21, 24)
+        ]
+        assert table(fast) == table(full)
+
+    def test_fast_parse_skips_bodies(self, chunker, monkeypatch):
+        options = []
+        original_parse = chunker.index.parse
+
+        def recording_parse(path, **kwargs):
+            options.append(kwargs.get('options', 0))
+            return original_parse(path, **kwargs)
+
+        monkeypatch.setattr(chunker.index, 'parse', recording_parse)
+        chunker.extract_functions(OVERLOADED_CPP)
+        assert options[0] & chunker.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+
+    def test_content_only_for_targets(self, chunker):
+        functions = chunker.extract_functions(OVERLOADED_CPP, targets=['Helper'])
+
+        assert [f['name'] for f in functions] == ['SetValue', 'SetValue', 'Helper']
+        assert 'content' not in functions[0]
+        assert functions[2]['content'].splitlines()[0] == 'static int Helper(int a)'
+
+    def test_index_built_once_per_file(self, chunker, monkeypatch):
+        built = []
+        original_init = FunctionBoundaryIndex.__init__
+
+        def counting_init(self, lines):
+            built.append(len(lines))
+            original_init(self, lines)
+
+        monkeypatch.setattr(code_chunker.FunctionBoundaryIndex, '__init__', counting_init)
+        assert len(chunker.extract_functions(OVERLOADED_CPP)) == 3
+        assert len(built) == 1
+
+
+class TestSharedChunker:
+    """프로세스 공유 CodeChunker/Index 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_singleton(self, monkeypatch):
+        monkeypatch.setattr(code_chunker, '_shared_chunker', None)
+
+    def test_single_instance_across_threads(self):
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(code_chunker.get_code_chunker())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(chunker) for chunker in seen}) == 1
+
+    def test_index_reused_per_thread(self):
+        clang_chunker = code_chunker.get_code_chunker().clang_chunker
+        if not clang_chunker.available:
+            pytest.skip("libclang 사용 불가")
+        assert clang_chunker.index is clang_chunker.index
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(clang_chunker.index))
+        thread.start()
+        thread.join()
+        assert other[0] is not clang_chunker.index
+
+    def test_callers_share_instance(self, monkeypatch):
+        from app.llm_handler import LLMHandler
+        from app.issue_processor import IssueProcessor
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        created = []
+        original_init = CodeChunker.__init__
+
+        def counting_init(self):
+            created.append(self)
+            original_init(self)
+
+        monkeypatch.setattr(CodeChunker, '__init__', counting_init)
+        processor = IssueProcessor(None, LLMHandler())
+        for _ in range(3):
+            processor._extract_relevant_methods(OVERLOADED_CPP, ['SetValue'], 'MatlDB.cpp')
+        assert processor.large_file_handler.chunker is code_chunker.get_code_chunker()
+        assert len(created) == 1
+
+    def test_preload_reports_cost(self):
+        stats = code_chunker.preload_clang()
+        assert stats['available'] == (code_chunker.load_libclang() is not None)
+        assert stats['preload_ms'] >= 0
+        assert code_chunker._shared_chunker is not None
+
+
+class TestExtractFunctionsMany:
+    """여러 파일 병렬 추출(프로세스 풀) 테스트"""
+
+    ITEMS = [('a/Overloaded.cpp', OVERLOADED_CPP), ('b/Literal.cpp', LITERAL_BRACES_CPP)]
+
+    @pytest.fixture
+    def chunker(self, tmp_path, monkeypatch):
+        chunker = CodeChunker()
+        if not chunker.clang_chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setattr(code_chunker, '_function_cache', TieredCache('clang_functions', directory=str(tmp_path)))
+        yield chunker
+        code_chunker.shutdown_extraction_pool()
+
+    def _tables(self, results):
+        return [[(f['name'], f['line_start'], f['line_end']) for f in functions] for functions in results]
+
+    def test_in_process_when_single_worker(self, chunker, monkeypatch):
+        monkeypatch.setenv('CLANG_PROCESS_WORKERS', '1')
+        assert code_chunker.get_extraction_pool() is None
+
+        results = chunker.extract_functions_many(self.ITEMS, {'a/Overloaded.cpp': ['Helper']})
+        assert self._tables(results) == [
+            [('SetValue', 2, 6), ('SetValue', 8, 14), ('Helper', 16, 19)],
+            [('Dump', 2, 10), ('Next', 12, 15)]
+        ]
+        assert ['content' in f for f in results[0]] == [False, False, True]
+        assert all('content' in f for f in results[1])
+
+    def test_process_pool_matches_in_process(self, chunker, monkeypatch):
+        monkeypatch.setenv('CLANG_PROCESS_WORKERS', '2')
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        expected = [chunker.extract_functions(content, path) for path, content in self.ITEMS]
+        monkeypatch.delenv('CLANG_CACHE_ENABLED')
+
+        results = chunker.extract_functions_many(self.ITEMS)
+        assert results == expected
+
+        # 부모 캐시에 저장되므로 두 번째 호출은 워커로 보내지 않음
+        pool = code_chunker.get_extraction_pool()
+        monkeypatch.setattr(pool, 'submit', lambda *args, **kwargs: pytest.fail("캐시 적중 시 워커 호출 불필요"))
+        assert chunker.extract_functions_many(self.ITEMS) == expected
+
+    def test_broken_pool_falls_back(self, chunker, monkeypatch):
+        class BrokenPool:
+            def submit(self, *args, **kwargs):
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+        monkeypatch.setattr(code_chunker, 'get_extraction_pool', lambda: BrokenPool())
+        results = chunker.extract_functions_many(self.ITEMS)
+        assert self._tables(results)[1] == [('Dump', 2, 10), ('Next', 12, 15)]
+
+
+class TestSyntaxCheck:
+    """diff 적용 후 Clang 구문 검사 (reparse) 테스트"""
+
+    BASE_CPP = """#include "stdafx.h"
+#include "MatlDB.h"
+
+int Helper(int a)
+{
+    return a + 1;
+}
+
+int Caller()
+{
+    undefined_call();
+    return Helper(1);
+}
+"""
+
+    @pytest.fixture
+    def chunker(self, tmp_path, monkeypatch):
+        chunker = ClangASTChunker()
+        if not chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setattr(code_chunker, '_function_cache', TieredCache('clang_functions', directory=str(tmp_path)))
+        return chunker
+
+    def test_missing_includes_do_not_hide_errors(self, chunker):
+        result = chunker.check_syntax(self.BASE_CPP)
+        assert result['reparsed'] is False
+        assert result['errors'] == [{'line': 11, 'message': "use of undeclared identifier 'undefined_call'"}]
+
+    def test_reparse_reports_only_new_errors(self, chunker, monkeypatch):
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        modified = self.BASE_CPP.replace('return a + 1;', '// 추가된 줄\n    return a + 1')
+
+        before = chunker.check_syntax(self.BASE_CPP)
+        after = chunker.check_syntax(modified, base_content=self.BASE_CPP)
+        assert after['reparsed'] is True
+        assert after['error_count'] == 2
+
+        added = new_syntax_errors(before, after)
+        assert added == [{'line': 7, 'message': "expected ';' after return statement"}]
+        # reparse 결과는 새로 파싱한 결과와 같아야 함
+        assert ClangASTChunker().check_syntax(modified)['errors'] == after['errors']
+
+    def test_live_translation_units_capped_and_released(self, chunker, monkeypatch):
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        monkeypatch.setattr(code_chunker, 'LIVE_TRANSLATION_UNITS', 1)
+        chunker.check_syntax(self.BASE_CPP)
+        chunker.check_syntax(self.BASE_CPP + '\n// 다른 내용\n')
+        assert len(chunker._local.translation_units) == 1
+
+        assert chunker.release_translation_units() == 1
+        assert chunker.release_translation_units() == 0
+
+    def test_result_cached_by_content(self, chunker, monkeypatch):
+        first = chunker.check_syntax(self.BASE_CPP)
+        monkeypatch.setattr(chunker._local, 'translation_units', None)
+        monkeypatch.setattr(ClangASTChunker, 'index', property(lambda self: pytest.fail("캐시 적중 시 파싱 불필요")))
+        assert chunker.check_syntax(self.BASE_CPP) == first
+
+    def test_new_errors_without_results(self):
+        assert new_syntax_errors(None, {'errors': [{'line': 1, 'message': 'x'}]}) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
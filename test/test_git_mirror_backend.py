@@ -0,0 +1,187 @@
+"""
+GitMirrorBackend 테스트 (네트워크 없이 로컬 bare 저장소를 원격으로 사용)
+"""
+
+import os
+import subprocess
+
+import pytest
+from app.bitbucket_api import BitbucketAPI
+from app.git_mirror_backend import GitMirrorBackend, PushRejectedError, create_repository_backend
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME='tester', GIT_AUTHOR_EMAIL='tester@example.com',
+    GIT_COMMITTER_NAME='tester', GIT_COMMITTER_EMAIL='tester@example.com',
+)
+
+# CP949로 저장된 MFC 소스 (인코딩 변환 없이 그대로 커밋되어야 함)
+MATLDB_CPP = '// 재질 DB\r\nBOOL CMatlDB::MakeMatlData() { return TRUE; }\r\n'.encode('cp949')
+
+
+def _git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, env=GIT_ENV, check=True,
+                          capture_output=True).stdout.decode().strip()
+
+
+def _write(work, path, data):
+    full_path = os.path.join(work, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'wb') as f:
+        f.write(data)
+
+
+def _push_change(work, path, data, branch='master'):
+    """다른 사용자의 커밋을 원격에 push"""
+    _git(work, 'fetch', 'origin')
+    _git(work, 'checkout', '-q', '-B', branch, f'origin/{branch}')
+    _write(work, path, data)
+    _git(work, 'add', path)
+    _git(work, 'commit', '-q', '-m', f'update {path}')
+    _git(work, 'push', '-q', 'origin', f'HEAD:refs/heads/{branch}')
+    return _git(work, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def remote(tmp_path):
+    remote_dir = str(tmp_path / 'remote.git')
+    work = str(tmp_path / 'work')
+    subprocess.run(['git', 'init', '--bare', '-q', remote_dir], check=True)
+    subprocess.run(['git', 'init', '-q', work], check=True)
+    _git(work, 'remote', 'add', 'origin', remote_dir)
+    _git(work, 'checkout', '-q', '-b', 'master')
+    _write(work, 'src/wg_db/MatlDB.cpp', MATLDB_CPP)
+    _write(work, 'src/wg_db/DBCodeDef.h', b'#define MATLCODE_STL_A 1\n')
+    _write(work, 'tools/build.sh', b'#!/bin/sh\necho build\n')
+    os.chmod(os.path.join(work, 'tools/build.sh'), 0o755)
+    _git(work, 'add', '.')
+    _git(work, 'commit', '-q', '-m', 'initial')
+    _git(work, 'push', '-q', 'origin', 'HEAD:refs/heads/master')
+    return {'dir': remote_dir, 'work': work}
+
+
+@pytest.fixture
+def backend(remote, tmp_path):
+    return GitMirrorBackend(remote['dir'], str(tmp_path / 'mirror'), fetch_interval=3600)
+
+
+def _remote_file(remote, branch, path):
+    return subprocess.run(['git', '--git-dir', remote['dir'], 'show', f'{branch}:{path}'],
+                          check=True, capture_output=True).stdout
+
+
+class TestReads:
+    """오브젝트 저장소에서 파일 읽기"""
+
+    def test_read_blob_bytes(self, backend):
+        assert backend.get_file_content_raw('src/wg_db/MatlDB.cpp') == MATLDB_CPP
+        assert backend.get_file_content_raw('src/none.cpp') is None
+
+    def test_bulk_read_single_fetch(self, backend, remote):
+        result = backend.get_files_raw(['src/wg_db/MatlDB.cpp', 'src/none.cpp', 'src/wg_db/DBCodeDef.h'])
+
+        assert result['src/wg_db/MatlDB.cpp'] == MATLDB_CPP
+        assert result['src/none.cpp'] is None
+        assert result['src/wg_db/DBCodeDef.h'] == b'#define MATLCODE_STL_A 1\n'
+        assert result.commit_hash == _git(remote['work'], 'rev-parse', 'HEAD')
+        assert set(result.timings) == set(result)
+        assert backend.get_stats()['fetches'] == 1
+
+    def test_directory_path_is_not_a_file(self, backend):
+        assert backend.get_file_content_raw('src/wg_db') is None
+
+    def test_incremental_fetch_on_new_issue(self, backend, remote):
+        backend.get_file_content_raw('src/wg_db/DBCodeDef.h')
+        new_head = _push_change(remote['work'], 'src/wg_db/DBCodeDef.h', b'#define MATLCODE_STL_B 2\n')
+
+        # 이슈 시작(브랜치 생성) 시 원격 변경사항을 fetch
+        branch = backend.create_branch('feature/GEN-1')
+        assert branch['target']['hash'] == new_head
+        assert backend.get_file_content_raw('src/wg_db/DBCodeDef.h', 'feature/GEN-1') == b'#define MATLCODE_STL_B 2\n'
+        assert _git(remote['work'], 'ls-remote', 'origin', 'refs/heads/feature/GEN-1').startswith(new_head)
+
+
+class TestCommits:
+    """로컬 커밋 생성 및 push"""
+
+    def test_commit_multiple_files_single_push(self, backend, remote):
+        base = backend.create_branch('feature/GEN-1')['target']['hash']
+        new_cpp = MATLDB_CPP + '// 추가\r\n'.encode('cp949')
+
+        commit = backend.commit_multiple_files_binary('feature/GEN-1', [
+            {'path': 'src/wg_db/MatlDB.cpp', 'content_bytes': new_cpp, 'action': 'update'},
+            {'path': 'src/wg_db/New.h', 'content_bytes': b'#pragma once\n', 'action': 'create'},
+        ], '[GEN-1] 재질 추가')
+
+        assert commit['parents'] == [{'hash': base}]
+        assert _git(remote['work'], 'ls-remote', 'origin', 'refs/heads/feature/GEN-1').startswith(commit['hash'])
+        assert _remote_file(remote, 'feature/GEN-1', 'src/wg_db/MatlDB.cpp') == new_cpp
+        assert _remote_file(remote, 'feature/GEN-1', 'src/wg_db/New.h') == b'#pragma once\n'
+        # 변경하지 않은 파일과 master는 그대로
+        assert _remote_file(remote, 'feature/GEN-1', 'src/wg_db/DBCodeDef.h') == b'#define MATLCODE_STL_A 1\n'
+        assert _remote_file(remote, 'master', 'src/wg_db/MatlDB.cpp') == MATLDB_CPP
+        message = subprocess.run(['git', '--git-dir', remote['dir'], 'log', '-1', '--format=%s', 'feature/GEN-1'],
+                                 check=True, capture_output=True).stdout.decode('utf-8').strip()
+        assert message == '[GEN-1] 재질 추가'
+
+    def test_file_mode_preserved(self, backend, remote):
+        backend.create_branch('feature/GEN-1')
+        backend.commit_file_binary('feature/GEN-1', 'tools/build.sh', b'#!/bin/sh\necho new\n', 'update script')
+
+        tree = subprocess.run(['git', '--git-dir', remote['dir'], 'ls-tree', 'feature/GEN-1', 'tools/build.sh'],
+                              check=True, capture_output=True).stdout.decode()
+        assert tree.startswith('100755 ')
+
+    def test_consecutive_commits_chain(self, backend, remote):
+        backend.create_branch('feature/GEN-1')
+        first = backend.commit_file_binary('feature/GEN-1', 'a.txt', b'a', 'a')
+        second = backend.commit_file_binary('feature/GEN-1', 'b.txt', b'b', 'b')
+
+        assert second['parents'] == [{'hash': first['hash']}]
+        assert backend.get_stats()['fetches'] == 1
+
+    def test_stale_parent_refetches_and_retries(self, backend, remote):
+        backend.create_branch('feature/GEN-1')
+        _push_change(remote['work'], 'other.txt', b'other', branch='feature/GEN-1')
+
+        commit = backend.commit_file_binary('feature/GEN-1', 'mine.txt', b'mine', 'mine')
+
+        assert backend.get_stats()['push_retries'] == 1
+        assert _remote_file(remote, 'feature/GEN-1', 'other.txt') == b'other'
+        assert _remote_file(remote, 'feature/GEN-1', 'mine.txt') == b'mine'
+        assert _git(remote['work'], 'ls-remote', 'origin', 'refs/heads/feature/GEN-1').startswith(commit['hash'])
+
+    def test_explicit_parent_not_retried(self, backend, remote):
+        base = backend.create_branch('feature/GEN-1')['target']['hash']
+        _push_change(remote['work'], 'other.txt', b'other', branch='feature/GEN-1')
+
+        with pytest.raises(PushRejectedError):
+            backend.commit_file_binary('feature/GEN-1', 'mine.txt', b'mine', 'mine', parent_commit=base)
+
+    def test_empty_changes_skip_commit(self, backend):
+        assert backend.commit_multiple_files_binary('master', [{'path': 'a', 'action': 'delete'}], 'x') == {}
+
+
+class TestBackendSelection:
+    """REPOSITORY_BACKEND 설정에 따른 백엔드 선택"""
+
+    @pytest.fixture
+    def bitbucket_api(self):
+        return BitbucketAPI('https://api.bitbucket.org', 'user', 'token', 'mit_dev', 'genw_new')
+
+    def test_rest_is_default(self, bitbucket_api):
+        assert create_repository_backend(bitbucket_api) is bitbucket_api
+
+    def test_git_mirror_is_lazy(self, bitbucket_api, tmp_path):
+        mirror_dir = tmp_path / 'mirror'
+        backend = create_repository_backend(bitbucket_api, 'git_mirror', mirror_dir=str(mirror_dir))
+
+        assert isinstance(backend, GitMirrorBackend)
+        assert backend.remote_url == 'https://bitbucket.org/mit_dev/genw_new.git'
+        assert backend.bitbucket_api is bitbucket_api
+        # 생성 시점에는 git/네트워크 작업 없음
+        assert not mirror_dir.exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,302 @@
+"""
+IssueProcessor 워크플로우 테스트 (Bitbucket/OpenAI 없이 가짜 클라이언트 사용)
+"""
+
+import time
+import threading
+import pytest
+from app.llm_handler import LLMHandler
+from app.issue_processor import IssueProcessor
+from app.bitbucket_api import FileFetchResult
+from app.target_files_config import get_target_files
+
+
+SAMPLE_CPP = """// sample
+BOOL CMatlDB::GetSteelList_SP16_2017_tB4(T_UNIT_INDEX UnitIndex, OUT T_MATL_LIST_STEEL& raSteelList)
+{
+    return TRUE;
+}
+"""
+
+
+class FakeBitbucketAPI:
+    """process_issue가 사용하는 Bitbucket 메서드만 흉내"""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.commits = []
+        self.lock = threading.Lock()
+
+    def create_branch(self, branch_name, from_branch="master"):
+        return {'name': branch_name}
+
+    def get_file_content_raw(self, file_path, branch="master"):
+        if file_path in self.missing:
+            return None
+        return SAMPLE_CPP.encode('utf-8')
+
+    def commit_multiple_files_binary(self, branch, file_changes, message, parent_commit=None):
+        with self.lock:
+            self.commits.append([c['path'] for c in file_changes])
+        return {}
+
+    def create_pull_request(self, source_branch, destination_branch, title, description):
+        return {'links': {'html': {'href': 'https://example/pr/1'}}}
+
+
+class BulkFakeBitbucketAPI(FakeBitbucketAPI):
+    """get_files_raw를 지원하는 가짜 Bitbucket (일괄 조회 호출 기록)"""
+
+    def __init__(self, missing=()):
+        super().__init__(missing)
+        self.bulk_calls = []
+        self.single_calls = []
+
+    def get_file_content_raw(self, file_path, branch="master"):
+        self.single_calls.append(file_path)
+        return super().get_file_content_raw(file_path, branch)
+
+    def get_files_raw(self, paths, ref="master", max_workers=None):
+        paths = list(paths)
+        self.bulk_calls.append(paths)
+        result = FileFetchResult(ref, 'a' * 40)
+        for path in paths:
+            result[path] = None if path in self.missing else (SAMPLE_CPP + f"// {path}\n").encode('utf-8')
+            result.timings[path] = 0.01
+        return result
+
+
+@pytest.fixture
+def issue():
+    return {'key': 'GEN-1', 'fields': {'summary': 'SDB 개발 요청', 'description': ''}}
+
+
+def _make_processor(monkeypatch, bitbucket_api, workers):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    processor = IssueProcessor(bitbucket_api, LLMHandler(), max_file_workers=workers)
+    monkeypatch.setattr(processor, '_save_spec_file', lambda key, content: 'spec.md')
+    return processor
+
+
+class TestParallelFilePipelines:
+    """파일별 파이프라인 병렬 실행 테스트"""
+
+    def test_parallel_llm_calls_overlap(self, monkeypatch, issue):
+        """LLM 호출이 겹쳐서 실행되어 전체 시간이 단축됨"""
+        bitbucket_api = FakeBitbucketAPI()
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=4)
+
+        active = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def slow_llm(prompt, file_path):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.2)
+            with lock:
+                active['now'] -= 1
+            return []
+
+        monkeypatch.setattr(processor, '_call_llm_with_prompt', slow_llm)
+
+        result = processor.process_issue(issue)
+
+        assert active['peak'] > 1
+        assert result['status'] == 'completed'
+        # 결과 순서는 TARGET_FILES 순서와 동일
+        expected = [f['path'] for f in get_target_files()]
+        assert [f['path'] for f in result['modified_files']] == expected
+        assert bitbucket_api.commits == [expected]
+
+    def test_errors_are_deterministic(self, monkeypatch, issue):
+        """실패 파일의 에러는 완료 순서와 무관하게 대상 파일 순서로 기록"""
+        target_paths = [f['path'] for f in get_target_files()]
+        failing = {target_paths[1], target_paths[3]}
+        delays = {target_paths[1]: 0.2, target_paths[3]: 0.0}
+
+        bitbucket_api = FakeBitbucketAPI()
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=4)
+
+        def flaky_llm(prompt, file_path):
+            if file_path in failing:
+                time.sleep(delays[file_path])
+                raise RuntimeError(f"LLM 실패 {file_path}")
+            return []
+
+        monkeypatch.setattr(processor, '_call_llm_with_prompt', flaky_llm)
+
+        result = processor.process_issue(issue)
+
+        assert result['errors'] == [
+            f"파일 수정 실패 ({target_paths[1]}): LLM 실패 {target_paths[1]}",
+            f"파일 수정 실패 ({target_paths[3]}): LLM 실패 {target_paths[3]}",
+        ]
+        assert [f['path'] for f in result['modified_files']] == [target_paths[0], target_paths[2]]
+
+    def test_serial_mode_and_missing_files(self, monkeypatch, issue):
+        """workers=1이면 순차 실행, 없는 파일은 건너뜀"""
+        target_paths = [f['path'] for f in get_target_files()]
+        bitbucket_api = FakeBitbucketAPI(missing=[target_paths[0]])
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=1)
+
+        threads = set()
+
+        def record_thread(prompt, file_path):
+            threads.add(threading.current_thread().name)
+            return []
+
+        monkeypatch.setattr(processor, '_call_llm_with_prompt', record_thread)
+
+        result = processor.process_issue(issue)
+
+        assert threads == {threading.current_thread().name}
+        assert [f['path'] for f in result['modified_files']] == target_paths[1:]
+        assert result['errors'] == []
+
+
+
+class TestSyntaxCheck:
+    """diff 적용 후 구문 검사 테스트"""
+
+    def test_new_syntax_errors_reported(self, monkeypatch, issue):
+        from app.code_chunker import get_code_chunker
+        if not get_code_chunker().clang_chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        monkeypatch.setenv('CLANG_SYNTAX_CHECK', 'true')
+
+        target_paths = [f['path'] for f in get_target_files()]
+        processor = _make_processor(monkeypatch, FakeBitbucketAPI(), workers=1)
+
+        def broken_llm(prompt, file_path):
+            if file_path != target_paths[0]:
+                return []
+            # 세미콜론 누락
+            return [{'action': 'replace', 'line_start': 4, 'line_end': 4, 'new_content': '    return TRUE'}]
+
+        monkeypatch.setattr(processor, '_call_llm_with_prompt', broken_llm)
+
+        result = processor.process_issue(issue)
+
+        syntax_errors = [f['syntax_errors'] for f in result['modified_files']]
+        assert syntax_errors[0] == [{'line': 4, 'message': "expected ';' after return statement"}]
+        assert all(errors == [] for errors in syntax_errors[1:])
+        assert result['metrics']['stages']['syntax_check']['count'] == len(target_paths)
+
+    def test_disabled(self, monkeypatch, issue):
+        monkeypatch.setenv('CLANG_SYNTAX_CHECK', 'false')
+        processor = _make_processor(monkeypatch, FakeBitbucketAPI(), workers=1)
+        assert processor._check_modified_syntax(SAMPLE_CPP, 'int x = ;', 'a.cpp') == []
+
+    def test_disabled_by_default(self, monkeypatch):
+        from app.code_chunker import ClangASTChunker
+        monkeypatch.delenv('CLANG_SYNTAX_CHECK', raising=False)
+        monkeypatch.setattr(ClangASTChunker, 'check_syntax', lambda *args, **kwargs: pytest.fail("검사하면 안 됨"))
+        processor = _make_processor(monkeypatch, FakeBitbucketAPI(), workers=1)
+        assert processor._check_modified_syntax(SAMPLE_CPP, 'int x = ;', 'a.cpp') == []
+
+    def test_translation_units_released(self, monkeypatch):
+        from app.code_chunker import get_code_chunker
+        clang_chunker = get_code_chunker().clang_chunker
+        if not clang_chunker.available:
+            pytest.skip("libclang 사용 불가")
+        monkeypatch.setenv('CLANG_SYNTAX_CHECK', 'true')
+        monkeypatch.setenv('CLANG_CACHE_ENABLED', 'false')
+        processor = _make_processor(monkeypatch, FakeBitbucketAPI(), workers=1)
+
+        processor._check_modified_syntax(SAMPLE_CPP, SAMPLE_CPP.replace('return TRUE;', 'return TRUE'), 'a.cpp')
+        assert not clang_chunker._local.translation_units
+
+
+class TestBulkFileFetch:
+    """대상 파일 일괄 조회 테스트"""
+
+    def test_all_target_files_fetched_in_one_round(self, monkeypatch, issue):
+        bitbucket_api = BulkFakeBitbucketAPI()
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=4)
+
+        result = processor.process_issue(issue)
+
+        targets = get_target_files()
+        expected = []
+        for file_info in targets:
+            expected.append(file_info['path'])
+            if file_info.get('alternative_path'):
+                expected.append(file_info['alternative_path'])
+        assert bitbucket_api.bulk_calls == [expected]
+        assert bitbucket_api.single_calls == []
+        assert result['metrics']['stages']['file_fetch']['count'] == len(targets)
+
+    def test_alternative_path_used_when_missing(self, monkeypatch, issue):
+        bitbucket_api = BulkFakeBitbucketAPI(missing={'src/wg_db/MatlDB.cpp'})
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=2)
+
+        files_to_modify, prefetched = processor._fetch_target_files(get_target_files(), 'feature/GEN-1')
+
+        assert 'wg_db/MatlDB.h' in files_to_modify
+        assert 'src/wg_db/MatlDB.cpp' not in files_to_modify
+        assert prefetched['wg_db/MatlDB.h'].endswith(b'// wg_db/MatlDB.h\n')
+
+    def test_plain_dict_prefetched(self, monkeypatch):
+        """timings가 없는 일반 dict 조회 결과도 사용 가능"""
+        from app.encoding_handler import EncodingHandler
+
+        bitbucket_api = BulkFakeBitbucketAPI()
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=1)
+        path = get_target_files()[0]['path']
+
+        outcome = processor._prepare_file_change(
+            path, 'feature/GEN-1', 'spec', EncodingHandler(), {path: SAMPLE_CPP.encode('utf-8')}
+        )
+        assert outcome[1]['path'] == path
+        assert bitbucket_api.single_calls == []
+
+    def test_functions_extracted_in_one_batch(self, monkeypatch, issue):
+        """대상 파일 함수 추출은 파이프라인 시작 전 extract_functions_many 한 번으로 처리"""
+        from app.code_chunker import CodeChunker
+
+        calls = []
+        original = CodeChunker.extract_functions_many
+
+        def recording(self, items, targets=None):
+            calls.append([path for path, _ in items])
+            return original(self, items, targets)
+
+        monkeypatch.setattr(CodeChunker, 'extract_functions_many', recording)
+        processor = _make_processor(monkeypatch, BulkFakeBitbucketAPI(), workers=4)
+
+        # 파이프라인에는 일괄 추출한 테이블이 전달됨
+        handed = {}
+        extract_relevant = processor._extract_relevant_methods
+
+        def recording_relevant(file_content, target_functions, file_path="", all_functions=None):
+            handed[file_path] = all_functions is not None
+            return extract_relevant(file_content, target_functions, file_path, all_functions)
+
+        monkeypatch.setattr(processor, '_extract_relevant_methods', recording_relevant)
+
+        result = processor.process_issue(issue)
+
+        expected = [f['path'] for f in get_target_files()
+                    if not processor._is_macro_file(f['path'], f.get('functions', []))]
+        assert calls == [expected]
+        assert {path for path, batched in handed.items() if batched} == set(expected)
+        assert result['errors'] == []
+        assert result['metrics']['stages']['bulk_ast_extraction']['count'] == 1
+
+    def test_falls_back_to_single_fetch(self, monkeypatch, issue):
+        bitbucket_api = BulkFakeBitbucketAPI()
+
+        def failing_bulk(paths, ref="master", max_workers=None):
+            raise RuntimeError("ref lookup failed")
+
+        monkeypatch.setattr(bitbucket_api, 'get_files_raw', failing_bulk)
+        processor = _make_processor(monkeypatch, bitbucket_api, workers=2)
+
+        result = processor.process_issue(issue)
+        assert result['status'] == 'completed'
+        assert sorted(bitbucket_api.single_calls) == sorted(f['path'] for f in get_target_files())
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,267 @@
+"""
+작업 큐 테스트
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from app import job_queue as job_queue_module
+from app.job_queue import (
+    JobQueue, MemoryJobStore, FileJobStore, CeleryJobQueue, create_job_queue,
+    JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+)
+
+
+def _issue(key='GEN-1'):
+    return {'key': key, 'fields': {'summary': 'SDB 개발 요청'}}
+
+
+class TestJobQueue:
+    """JobQueue 클래스 테스트"""
+
+    def test_enqueue_returns_immediately(self):
+        """처리 시간과 무관하게 즉시 반환"""
+        release = threading.Event()
+
+        def handler(issue, report_stage):
+            release.wait(5)
+            return {'status': 'completed'}
+
+        job_queue = JobQueue(handler, workers=1)
+        start = time.time()
+        job = job_queue.enqueue(_issue())
+        assert time.time() - start < 0.5
+        assert job['status'] == 'queued'
+
+        release.set()
+        job_queue.join()
+        assert job_queue.get_job(job['job_id'])['status'] == JOB_COMPLETED
+
+    def test_stage_and_result_recorded(self):
+        """단계 보고와 결과 저장"""
+        seen_stage = threading.Event()
+        release = threading.Event()
+
+        def handler(issue, report_stage):
+            report_stage('spec_conversion')
+            seen_stage.set()
+            release.wait(5)
+            return {'status': 'completed', 'issue_key': issue['key']}
+
+        job_queue = JobQueue(handler, workers=1)
+        job = job_queue.enqueue(_issue())
+
+        assert seen_stage.wait(5)
+        running = job_queue.get_job(job['job_id'])
+        assert running['status'] == JOB_RUNNING
+        assert running['stage'] == 'spec_conversion'
+
+        release.set()
+        job_queue.join()
+        finished = job_queue.get_job(job['job_id'])
+        assert finished['result']['issue_key'] == 'GEN-1'
+        assert finished['finished_at'] is not None
+
+    def test_handler_exception_marks_failed(self):
+        """처리 중 예외는 failed 상태로 기록"""
+        def handler(issue, report_stage):
+            raise RuntimeError("boom")
+
+        job_queue = JobQueue(handler, workers=1)
+        job = job_queue.enqueue(_issue())
+        job_queue.join()
+
+        failed = job_queue.get_job(job['job_id'])
+        assert failed['status'] == JOB_FAILED
+        assert 'boom' in failed['error']
+
+    def test_failed_result_status(self):
+        """process_issue가 failed 결과를 반환하면 작업도 failed"""
+        job_queue = JobQueue(lambda issue, report_stage: {'status': 'failed'}, workers=1)
+        job = job_queue.enqueue(_issue())
+        job_queue.join()
+        assert job_queue.get_job(job['job_id'])['status'] == JOB_FAILED
+
+    def test_duplicate_active_issue(self):
+        """Jira 재전송으로 같은 이슈가 다시 오면 기존 작업 반환"""
+        release = threading.Event()
+
+        def handler(issue, report_stage):
+            release.wait(5)
+            return {'status': 'completed'}
+
+        job_queue = JobQueue(handler, workers=1)
+        first = job_queue.enqueue(_issue('GEN-7'))
+        second = job_queue.enqueue(_issue('GEN-7'))
+
+        assert second['job_id'] == first['job_id']
+        assert second['duplicate'] is True
+
+        release.set()
+        job_queue.join()
+
+    def test_unknown_job(self):
+        job_queue = JobQueue(lambda issue, report_stage: {}, workers=1)
+        assert job_queue.get_job('missing') is None
+
+
+class TestJobStores:
+    """작업 저장소 테스트"""
+
+    def test_file_store_shared_across_instances(self, tmp_path):
+        """파일 저장소는 다른 프로세스(인스턴스)에서도 조회 가능"""
+        job_queue = create_job_queue(
+            lambda issue, report_stage: {'status': 'completed'},
+            backend='file', workers=1, jobs_dir=str(tmp_path)
+        )
+        job = job_queue.enqueue(_issue())
+        job_queue.join()
+
+        other_store = FileJobStore(str(tmp_path))
+        loaded = other_store.get(job['job_id'])
+        assert loaded['status'] == JOB_COMPLETED
+        assert loaded['issue_key'] == 'GEN-1'
+
+    def test_file_store_rejects_path_traversal(self, tmp_path):
+        store = FileJobStore(str(tmp_path))
+        assert store.get('../../etc/passwd') is None
+
+    def test_memory_store_update_missing(self):
+        assert MemoryJobStore().update('missing', status='running') is None
+
+    def _finished_job(self, job_id, hours_ago):
+        finished_at = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+        return {'job_id': job_id, 'issue_key': job_id, 'status': JOB_COMPLETED,
+                'created_at': finished_at, 'updated_at': finished_at, 'finished_at': finished_at}
+
+    def test_memory_store_prunes_finished_jobs(self):
+        store = MemoryJobStore(retention_hours=1)
+        store.save(self._finished_job('old', hours_ago=2))
+        store.save({'job_id': 'running', 'issue_key': 'GEN-9', 'status': 'running',
+                    'finished_at': None, 'updated_at': '2000-01-01T00:00:00'})
+        store.save(self._finished_job('recent', hours_ago=0))
+
+        assert store.get('old') is None
+        assert store.get('running') is not None
+        assert store.get('recent') is not None
+
+    def test_file_store_prunes_old_files(self, tmp_path):
+        store = FileJobStore(str(tmp_path), retention_hours=1)
+        store.save(self._finished_job('old', hours_ago=2))
+        # 다른 프로세스가 남긴 파일도 마지막 갱신 시각 기준으로 정리
+        old_path = tmp_path / 'old.json'
+        stale = time.time() - 3 * 3600
+        os.utime(old_path, (stale, stale))
+
+        other = FileJobStore(str(tmp_path), retention_hours=1)
+        other.save(self._finished_job('recent', hours_ago=0))
+
+        assert not old_path.exists()
+        assert (tmp_path / 'recent.json').exists()
+        assert other.get('old') is None
+
+    def test_retention_disabled(self):
+        store = MemoryJobStore(retention_hours=0)
+        store.save(self._finished_job('old', hours_ago=1000))
+        assert store.get('old') is not None
+
+
+class FakeCeleryApp:
+    """CeleryJobQueue가 사용하는 결과 백엔드/AsyncResult만 흉내 (기록 없는 ID는 PENDING)"""
+
+    class Backend:
+        def __init__(self):
+            self.results = {}
+
+        def store_result(self, task_id, result, state):
+            self.results[task_id] = (state, result)
+
+    class Result:
+        def __init__(self, app, task_id):
+            self.state, self.result = app.backend.results.get(task_id, ('PENDING', None))
+            self.info = self.result
+
+    def __init__(self):
+        self.backend = self.Backend()
+        self.sent = []
+
+    def send_task(self, name, args, task_id):
+        self.sent.append(task_id)
+
+    def AsyncResult(self, task_id):
+        return self.Result(self, task_id)
+
+
+class TestCeleryJobQueue:
+    """Celery 상태 → 작업 상태 변환 테스트 (celery 없이 가짜 앱 사용)"""
+
+    @pytest.fixture
+    def celery_queue(self, monkeypatch):
+        celery_app = FakeCeleryApp()
+        monkeypatch.setattr(job_queue_module, 'get_celery_app', lambda: celery_app)
+        return CeleryJobQueue(), celery_app
+
+    def test_enqueued_job_found(self, celery_queue):
+        queue, celery_app = celery_queue
+        job = queue.enqueue(_issue())
+
+        assert celery_app.sent == [job['job_id']]
+        found = queue.get_job(job['job_id'])
+        assert found['status'] == JOB_QUEUED
+        assert found['issue_key'] == 'GEN-1'
+
+    def test_unknown_job_is_none(self, celery_queue):
+        queue, _ = celery_queue
+        assert queue.get_job('never-issued') is None
+
+    def test_failed_result_reported_as_failed(self, celery_queue):
+        queue, celery_app = celery_queue
+        job_id = queue.enqueue(_issue())['job_id']
+
+        celery_app.backend.store_result(job_id, {'status': 'failed', 'issue_key': 'GEN-1'}, 'SUCCESS')
+        assert queue.get_job(job_id)['status'] == JOB_FAILED
+
+        celery_app.backend.store_result(job_id, {'status': 'completed', 'issue_key': 'GEN-1'}, 'SUCCESS')
+        assert queue.get_job(job_id)['status'] == JOB_COMPLETED
+
+
+class TestWebhookEndpoints:
+    """웹훅 → 작업 큐 → /jobs 조회 흐름"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        import app.main as main
+        job_queue = JobQueue(
+            lambda issue, report_stage: {'status': 'completed', 'issue_key': issue['key']},
+            workers=1
+        )
+        monkeypatch.setattr(main, 'job_queue', job_queue)
+        return main.app.test_client(), job_queue
+
+    def test_webhook_returns_202_and_job_status(self, client):
+        test_client, job_queue = client
+        payload = {
+            'webhookEvent': 'jira:issue_created',
+            'issue': {'key': 'GEN-11075', 'fields': {'issuetype': {'name': 'SDB 개발 요청'}, 'summary': 'SDB'}}
+        }
+
+        response = test_client.post('/webhook', json=payload)
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body['status'] == 'queued'
+
+        job_queue.join()
+        status = test_client.get(body['status_url'])
+        assert status.status_code == 200
+        assert status.get_json()['status'] == JOB_COMPLETED
+
+    def test_unknown_job_404(self, client):
+        test_client, _ = client
+        assert test_client.get('/jobs/unknown').status_code == 404
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,114 @@
+"""
+LLM 응답 캐시 테스트 (가짜 OpenAI 클라이언트 사용)
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from app import llm_handler as llm_module
+from app.cache_store import TieredCache
+from app.llm_handler import LLMHandler
+
+
+class FakeCompletions:
+    """chat.completions.create 호출 횟수를 기록하는 가짜 API"""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def llm_cache(tmp_path, monkeypatch):
+    cache = TieredCache('llm_responses', directory=str(tmp_path))
+    monkeypatch.setattr(llm_module, '_llm_cache', cache)
+    monkeypatch.delenv('LLM_CACHE_ENABLED', raising=False)
+    monkeypatch.delenv('LLM_CACHE_BYPASS', raising=False)
+    return cache
+
+
+@pytest.fixture
+def handler(monkeypatch, llm_cache):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    handler = LLMHandler()
+    completions = FakeCompletions(json.dumps({'modifications': [], 'summary': 'ok'}))
+    handler.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return handler, completions
+
+
+MESSAGES = [{'role': 'user', 'content': 'hello'}]
+
+
+class TestLLMResponseCache:
+    """chat_completion 캐시 동작 테스트"""
+
+    def test_identical_call_hits_cache(self, handler):
+        llm, completions = handler
+        first = llm.chat_completion(MESSAGES, temperature=0.1)
+        second = llm.chat_completion(MESSAGES, temperature=0.1)
+
+        assert first == second
+        assert len(completions.calls) == 1
+        stats = llm.cache_stats()
+        assert stats['memory_hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_key_includes_parameters(self, handler):
+        llm, completions = handler
+        llm.chat_completion(MESSAGES, temperature=0.1)
+        llm.chat_completion(MESSAGES, temperature=0.2)
+        llm.chat_completion(MESSAGES, temperature=0.1, max_tokens=100)
+        llm.chat_completion(MESSAGES, temperature=0.1, model='gpt-4o-mini')
+        llm.chat_completion([{'role': 'user', 'content': 'other'}], temperature=0.1)
+
+        assert len(completions.calls) == 5
+
+    def test_bypass_flag(self, handler, monkeypatch):
+        llm, completions = handler
+        llm.chat_completion(MESSAGES, temperature=0.1)
+        llm.chat_completion(MESSAGES, temperature=0.1, use_cache=False)
+        monkeypatch.setenv('LLM_CACHE_BYPASS', 'true')
+        llm.chat_completion(MESSAGES, temperature=0.1)
+
+        assert len(completions.calls) == 3
+
+    def test_cache_disabled(self, handler, monkeypatch):
+        llm, completions = handler
+        monkeypatch.setenv('LLM_CACHE_ENABLED', 'false')
+        llm.chat_completion(MESSAGES, temperature=0.1)
+        llm.chat_completion(MESSAGES, temperature=0.1)
+
+        assert len(completions.calls) == 2
+        assert llm.cache_stats() == {}
+
+    def test_persisted_across_processes(self, handler, monkeypatch, tmp_path):
+        llm, completions = handler
+        llm.chat_completion(MESSAGES, temperature=0.1)
+
+        # 재시작 후 새 캐시 인스턴스에서도 디스크에서 적중
+        monkeypatch.setattr(llm_module, '_llm_cache', TieredCache('llm_responses', directory=str(tmp_path)))
+        llm.chat_completion(MESSAGES, temperature=0.1)
+
+        assert len(completions.calls) == 1
+        assert llm.cache_stats()['disk_hits'] == 1
+
+    def test_call_sites_use_cache(self, handler):
+        """convert_issue_to_spec / generate_code_diff 재실행 시 LLM 호출 없음"""
+        llm, completions = handler
+        issue = {'key': 'GEN-1', 'fields': {'summary': 'SDB', 'description': 'desc'}}
+
+        for _ in range(2):
+            llm.convert_issue_to_spec(issue)
+            llm.generate_code_diff('a.cpp', 'int a;\n', 'desc', {})
+
+        assert len(completions.calls) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
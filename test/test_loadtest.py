@@ -0,0 +1,160 @@
+"""
+부하 테스트 하네스 테스트 (대역 서버, 리포트 계산, 짧은 실제 실행)
+"""
+
+import json
+import time
+
+import pytest
+import requests
+from app import bitbucket_api
+from app.bitbucket_api import BitbucketAPI
+from loadtest import run_loadtest
+from loadtest.stubs import BitbucketStub, FaultInjector, LatencyModel, OpenAIStub
+
+
+@pytest.fixture(autouse=True)
+def no_file_cache(monkeypatch):
+    monkeypatch.setattr(bitbucket_api, '_file_cache', None)
+    monkeypatch.setenv('BITBUCKET_FILE_CACHE_ENABLED', 'false')
+
+
+class TestLatencyAndFaults:
+    """지연 분포/장애 주입 설정 테스트"""
+
+    def test_parse_and_sample(self):
+        assert LatencyModel.parse(None).sample() == 0.0
+        assert LatencyModel.parse('fixed:50').sample() == pytest.approx(0.05)
+
+        uniform = LatencyModel.parse('uniform:20:80', seed=1)
+        samples = [uniform.sample() for _ in range(200)]
+        assert all(0.02 <= value <= 0.08 for value in samples)
+
+        lognormal = LatencyModel.parse('lognormal:100:0.5', seed=1)
+        samples = sorted(lognormal.sample() for _ in range(1000))
+        assert samples[500] == pytest.approx(0.1, rel=0.15)
+
+        with pytest.raises(ValueError):
+            LatencyModel.parse('pareto:1')
+
+    def test_fault_rates(self):
+        faults = FaultInjector(error_rate=0.1, throttle_rate=0.2, retry_after=2, seed=3)
+        picks = [faults.pick() for _ in range(5000)]
+        throttled = [pick for pick in picks if pick and pick[0] == 429]
+        errors = [pick for pick in picks if pick and pick[0] == 503]
+
+        assert 0.17 < len(throttled) / 5000 < 0.23
+        assert 0.07 < len(errors) / 5000 < 0.13
+        assert throttled[0][1] == {'Retry-After': '2'}
+
+
+class TestStubs:
+    """대역 서버가 실제 클라이언트와 동작하는지 확인"""
+
+    def test_bitbucket_stub_with_client(self):
+        with BitbucketStub(file_lines=50) as stub:
+            api = BitbucketAPI(stub.url, 'user', 'token', 'ws', 'genw_new', rate_limit=0)
+            api.create_branch('feature/LT-1')
+            content = api.get_file_content_raw('src/wg_db/MatlDB.cpp', 'feature/LT-1')
+            api.commit_multiple_files_binary('feature/LT-1', [
+                {'path': 'src/wg_db/MatlDB.cpp', 'content_bytes': content + b'// x\r\n', 'action': 'update'}
+            ], 'msg')
+            pr = api.create_pull_request('feature/LT-1', 'master', 'title', 'desc')
+
+            assert len(content.splitlines()) == 50
+            assert stub.heads['feature/LT-1'] == f"{1:040x}"
+            assert pr['id'] == 1
+            assert stub.stats()['requests']['commit'] == 1
+
+    def test_injected_throttle_is_retried(self):
+        with BitbucketStub(faults=FaultInjector(throttle_rate=1.0, retry_after=0)) as stub:
+            api = BitbucketAPI(stub.url, 'user', 'token', 'ws', 'genw_new', rate_limit=0, max_retries=1)
+            with pytest.raises(requests.exceptions.HTTPError):
+                api.get_branch_head('master')
+            assert stub.stats()['injected'] == {'get_branch:429': 2}
+
+    def test_openai_stub_latency_and_response(self):
+        with OpenAIStub(response='{"modifications": []}', latency=LatencyModel.parse('fixed:100')) as stub:
+            start = time.monotonic()
+            response = requests.post(f"{stub.url}/v1/chat/completions",
+                                     json={'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': 'x' * 400}]})
+            elapsed = time.monotonic() - start
+
+        body = response.json()
+        assert elapsed >= 0.1
+        assert body['choices'][0]['message']['content'] == '{"modifications": []}'
+        assert body['usage']['prompt_tokens'] == 100
+
+
+class TestReport:
+    """백분위수/리포트 계산 테스트"""
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert run_loadtest.percentile(values, 50) == pytest.approx(50.5)
+        assert run_loadtest.percentile(values, 99) == pytest.approx(99.01)
+        assert run_loadtest.percentile([], 50) is None
+
+    def test_payload_variants_unique_keys(self):
+        variants = run_loadtest.payload_variants({'issue': {'key': 'SDB-1', 'fields': {'summary': 's'}}}, 'r1')
+        first, second = next(variants), next(variants)
+        assert first['issue']['key'] != second['issue']['key']
+        assert first['issue']['key'].startswith(run_loadtest.ISSUE_KEY_PREFIX)
+
+    def test_build_report(self):
+        samples = [
+            {'lag': 0.0, 'webhook_status': 202, 'webhook_seconds': 0.01, 'job_status': 'completed',
+             'job_seconds': 2.0, 'processing_seconds': 1.5, 'stages': {'llm_call': 1.0}, 'tokens': 10},
+            {'lag': 0.0, 'webhook_status': 202, 'webhook_seconds': 0.02, 'job_status': 'failed',
+             'job_seconds': 1.0, 'stages': {'llm_call': 0.5}, 'error': 'LLM 실패'},
+            {'lag': 0.1, 'webhook_status': 500, 'webhook_seconds': 0.03, 'error': 'webhook: HTTP 500'},
+        ]
+        report = run_loadtest.build_report(samples, wall_seconds=2.0, rate=1.5, send_seconds=2.0)
+
+        assert report['throughput']['jobs_completed'] == 1
+        assert report['webhook']['error_rate'] == pytest.approx(1 / 3, abs=1e-3)
+        assert report['jobs']['failure_rate'] == pytest.approx(1 / 3, abs=1e-3)
+        assert report['stages']['llm_call']['count'] == 2
+        assert report['errors']['by_kind'] == {'issue': 1, 'webhook': 1}
+        json.dumps(report)
+        assert 'stage:llm_call' in run_loadtest.format_report(report)
+
+    def test_agent_env_llm_limits(self):
+        env = run_loadtest.agent_env('http://bb', 'http://llm')
+        assert 'LLM_RPM_LIMIT' not in env and 'LLM_TPM_LIMIT' not in env
+
+        env = run_loadtest.agent_env('http://bb', 'http://llm', llm_rpm_limit=0, llm_tpm_limit=2000)
+        assert env['LLM_RPM_LIMIT'] == '0'
+        assert env['LLM_TPM_LIMIT'] == '2000'
+
+    def test_agent_limits_reported(self):
+        agent_limits = {
+            'llm': {'rpm_limit': 500, 'tpm_limit': 2000, 'waits': 3, 'wait_seconds': 4.5},
+            'bitbucket': {'request_rate': 10.0, 'wait_seconds': 0.2, 'throttled': 0},
+        }
+        report = run_loadtest.build_report([], wall_seconds=1.0, rate=1.0, agent_limits=agent_limits)
+
+        assert report['agent_limits']['llm']['waits'] == 3
+        text = run_loadtest.format_report(report)
+        assert 'agent LLM 제한' in text and '대기 3회 / 4.5초' in text
+        assert 'agent Bitbucket 제한' in text
+
+
+class TestEndToEnd:
+    """대역 서버 + 에이전트 프로세스로 짧게 실제 실행"""
+
+    def test_short_run(self, tmp_path):
+        output = tmp_path / 'report.json'
+        exit_code = run_loadtest.main(['--rate', '4', '--duration', '0.5', '--file-lines', '200',
+                                       '--job-timeout', '60', '--output', str(output)])
+        report = json.loads(output.read_text(encoding='utf-8'))
+
+        assert exit_code == 0
+        assert report['throughput']['jobs_completed'] == 2
+        assert {'spec_conversion', 'branch_creation', 'llm_call', 'commit'} <= set(report['stages'])
+        assert report['stubs']['bitbucket']['requests']['commit'] == 2
+        assert report['agent_limits']['llm']['tpm_limit'] > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
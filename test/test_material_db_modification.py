@@ -20,6 +20,7 @@ import sys
 import json
 import logging
 import re
+import time
 from datetime import datetime
 from difflib import unified_diff
 import html
@@ -482,7 +483,50 @@ def get_context_lines(file_content: str, target_line: int,
     return (before_context, after_context)
 
 
-def extract_relevant_methods(file_content: str, target_functions: list, file_path: str = "") -> tuple:
+def is_macro_file(file_path: str, target_functions: list) -> bool:
+    """매크로 정의 파일인지 감지 (파일명 또는 대상 패턴)"""
+    return (
+        "DBCodeDef.h" in file_path or  # 파일명으로 감지
+        any("MATLCODE" in f for f in target_functions) or  # 함수명에 MATLCODE 포함
+        any("#pragma region" in f for f in target_functions)  # pragma region 패턴 포함
+    )
+
+
+def extract_target_functions(bitbucket_api: BitbucketAPI, branch: str, prefetched: dict = None) -> dict:
+    """
+    TARGET_FILES 중 함수 파일을 모두 읽은 뒤 Clang 추출을 프로세스 풀에서 한 번에 병렬 실행
+
+    Args:
+        bitbucket_api: Bitbucket API 클라이언트
+        branch: 브랜치 이름
+        prefetched: 대상 파일 일괄 조회 결과 (선택사항)
+
+    Returns:
+        {TARGET_FILES 경로: {'path': 실제 경로, 'content': 파일 내용, 'functions': 전체 함수 리스트}}
+        (매크로 파일과 읽지 못한 파일은 제외)
+    """
+    loaded = {}
+    for file_info in TARGET_FILES:
+        if is_macro_file(file_info["path"], file_info["functions"]):
+            continue
+        path = file_info["path"]
+        content = read_file_content(bitbucket_api, path, branch, prefetched)
+        if content is None and "alternative_path" in file_info:
+            path = file_info["alternative_path"]
+            content = read_file_content(bitbucket_api, path, branch, prefetched)
+        if content is not None:
+            loaded[file_info["path"]] = {"path": path, "content": content}
+
+    start = time.time()
+    tables = CodeChunker().extract_functions_many([(entry["path"], entry["content"]) for entry in loaded.values()])
+    for entry, functions in zip(loaded.values(), tables):
+        entry["functions"] = functions
+    logger.info(f"Clang AST 병렬 추출: {len(loaded)}개 파일, {time.time() - start:.2f}초")
+    return loaded
+
+
+def extract_relevant_methods(file_content: str, target_functions: list, file_path: str = "",
+                             all_functions: list = None) -> tuple:
     """
     파일에서 관련 함수/매크로 영역 추출
     
@@ -490,18 +534,13 @@ def extract_relevant_methods(file_content: str, target_functions: list, file_pat
         file_content: 파일 전체 내용
         target_functions: 찾아야 할 함수 이름 또는 매크로 패턴 리스트
         file_path: 파일 경로 (매크로 파일 감지용)
+        all_functions: 미리 추출한 전체 함수 리스트 (extract_target_functions 결과, 없으면 여기서 추출)
         
     Returns:
         (추출된 함수 리스트, 전체 함수 리스트)
     """
     # 🎯 개선: 파일명으로 매크로 파일 감지
-    is_macro_file = (
-        "DBCodeDef.h" in file_path or  # 파일명으로 감지
-        any("MATLCODE" in f for f in target_functions) or  # 함수명에 MATLCODE 포함
-        any("#pragma region" in f for f in target_functions)  # pragma region 패턴 포함
-    )
-    
-    if is_macro_file:
+    if is_macro_file(file_path, target_functions):
         logger.info(f"Step 2-1: 매크로 정의 파일 감지 - 패턴 기반 추출 사용 (파일: {file_path})")
         
         # 매크로 접두사 추출 (우선순위: target_functions → 파일 분석 → 기본값)
@@ -557,10 +596,11 @@ def extract_relevant_methods(file_content: str, target_functions: list, file_pat
             return [], []
     
     # 일반 함수 파일은 기존 Clang AST 사용
-    chunker = CodeChunker()
-    
-    logger.info("Step 2-1: Clang AST로 함수 추출 중...")
-    all_functions = chunker.extract_functions(file_content)
+    if all_functions is None:
+        chunker = CodeChunker()
+
+        logger.info("Step 2-1: Clang AST로 함수 추출 중...")
+        all_functions = chunker.extract_functions(file_content)
     
     if not all_functions:
         logger.warning("함수 추출 실패. 전체 파일을 사용합니다.")
@@ -886,9 +926,38 @@ def build_modification_prompt(file_info: dict, current_content: str,
     return prompt
 
 
+def read_file_content(bitbucket_api: BitbucketAPI, file_path: str, branch: str,
+                      prefetched: dict = None) -> str:
+    """
+    파일 내용 가져오기 (일괄 조회 결과가 있으면 사용)
+
+    Args:
+        bitbucket_api: Bitbucket API 클라이언트
+        file_path: 파일 경로
+        branch: 브랜치 이름
+        prefetched: get_files_raw 결과 (선택사항)
+
+    Returns:
+        파일 내용 또는 None
+    """
+    if prefetched is None or file_path not in prefetched:
+        return bitbucket_api.get_file_content(file_path, branch)
+
+    content_bytes = prefetched[file_path]
+    if content_bytes is None:
+        return None
+
+    from app.encoding_handler import EncodingHandler
+    encoding_handler = EncodingHandler()
+    encoding = encoding_handler.detect_encoding_with_hint(content_bytes, file_path)
+    content, _ = encoding_handler.decode_with_fallback(content_bytes, encoding)
+    return content
+
+
 def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMHandler,
                                   file_info: dict, material_spec: str,
-                                  branch: str = "master", dry_run: bool = True) -> dict:
+                                  branch: str = "master", dry_run: bool = True,
+                                  prefetched: dict = None, extracted: dict = None) -> dict:
     """
     단일 파일 수정 테스트
     
@@ -899,6 +968,8 @@ def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMH
         material_spec: Material DB Spec 내용
         branch: 브랜치 이름
         dry_run: True면 실제 커밋하지 않고 결과만 확인
+        prefetched: 대상 파일 일괄 조회 결과 (선택사항)
+        extracted: extract_target_functions 결과 (선택사항, 있으면 파일 읽기/함수 추출 생략)
         
     Returns:
         테스트 결과
@@ -930,13 +1001,18 @@ def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMH
         
         # 1. 파일 내용 가져오기
         logger.info("Step 1: Bitbucket에서 파일 가져오기...")
-        current_content = bitbucket_api.get_file_content(file_info["path"], branch)
+        preloaded = (extracted or {}).get(file_info["path"])
+        if preloaded:
+            current_content = preloaded["content"]
+            file_info["path"] = preloaded["path"]
+        else:
+            current_content = read_file_content(bitbucket_api, file_info["path"], branch, prefetched)
         
         if current_content is None:
             # 대체 경로 시도 (예: .h -> .cpp)
             if "alternative_path" in file_info:
                 logger.warning(f"파일을 찾을 수 없음. 대체 경로 시도: {file_info['alternative_path']}")
-                current_content = bitbucket_api.get_file_content(file_info["alternative_path"], branch)
+                current_content = read_file_content(bitbucket_api, file_info["alternative_path"], branch, prefetched)
                 if current_content:
                     file_info["path"] = file_info["alternative_path"]
             
@@ -951,7 +1027,8 @@ def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMH
         relevant_functions, all_functions = extract_relevant_methods(
             current_content, 
             file_info['functions'],
-            file_info['path']  # 파일 경로 추가
+            file_info['path'],  # 파일 경로 추가
+            preloaded["functions"] if preloaded else None
         )
         
         # 함수 추출 결과 저장
@@ -986,8 +1063,7 @@ def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMH
         
         # LLM 호출 - Spec_File.md와 One_Shot.md를 기반으로 코드 수정
         try:
-            response = llm_handler.client.chat.completions.create(
-                model=llm_handler.model,
+            response_content = llm_handler.chat_completion(
                 messages=[
                     {
                         "role": "system",
@@ -1011,7 +1087,6 @@ def test_single_file_modification(bitbucket_api: BitbucketAPI, llm_handler: LLMH
                 max_tokens=8000  # 더 긴 응답을 위해 증가
             )
             
-            response_content = response.choices[0].message.content
             logger.info(f"LLM 응답 받음: {len(response_content)} characters")
             
             # JSON 파싱
@@ -1186,6 +1261,23 @@ def test_all_files(dry_run: bool = True, branch: str = "master",
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
+    # 대상 파일과 대체 경로를 한 번에 병렬로 가져오기
+    paths = []
+    for file_info in TARGET_FILES:
+        paths.append(file_info["path"])
+        if "alternative_path" in file_info:
+            paths.append(file_info["alternative_path"])
+    try:
+        prefetched = bitbucket_api.get_files_raw(paths, branch)
+        for path, seconds in prefetched.timings.items():
+            logger.info(f"  {path}: {seconds:.2f}초")
+    except Exception as e:
+        logger.warning(f"파일 일괄 조회 실패, 파일별로 조회합니다: {e}")
+        prefetched = None
+
+    # 함수 파일은 미리 한 번에 병렬 추출 (전체 추출 시간 ≈ 가장 느린 파일)
+    extracted = extract_target_functions(bitbucket_api, branch, prefetched)
+
     # 각 파일 처리
     results = []
     for file_info in TARGET_FILES:
@@ -1195,7 +1287,9 @@ def test_all_files(dry_run: bool = True, branch: str = "master",
             file_info,
             material_spec,
             branch, 
-            dry_run
+            dry_run,
+            prefetched,
+            extracted
         )
         results.append(result)
         
@@ -0,0 +1,218 @@
+"""
+단계별 메트릭 및 /metrics 엔드포인트 테스트
+"""
+
+import json
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from app import metrics, async_llm
+from app.async_llm import LLMRuntime
+from app.llm_handler import LLMHandler
+from app.issue_processor import IssueProcessor
+from app.target_files_config import get_target_files
+from app.metrics import Counter, Histogram, MetricsRegistry
+
+
+SAMPLE_CPP = """// sample
+BOOL CMatlDB::GetSteelList_SP16_2017_tB4(T_UNIT_INDEX UnitIndex, OUT T_MATL_LIST_STEEL& raSteelList)
+{
+    return TRUE;
+}
+"""
+
+
+class FakeBitbucketAPI:
+    """process_issue가 사용하는 Bitbucket 메서드만 흉내"""
+
+    def __init__(self, fail_commit=False):
+        self.fail_commit = fail_commit
+
+    def create_branch(self, branch_name, from_branch="master"):
+        return {'name': branch_name}
+
+    def get_file_content_raw(self, file_path, branch="master"):
+        return SAMPLE_CPP.encode('utf-8')
+
+    def commit_multiple_files_binary(self, branch, file_changes, message, parent_commit=None):
+        if self.fail_commit:
+            raise RuntimeError("commit rejected")
+        return {}
+
+    def commit_file_binary(self, branch, file_path, content_bytes, message):
+        return {}
+
+    def create_pull_request(self, source_branch, destination_branch, title, description):
+        return {'links': {'html': {'href': 'https://example/pr/1'}}}
+
+
+class UsageCompletions:
+    """usage를 포함해 응답하는 가짜 AsyncOpenAI chat.completions"""
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(0.01)
+        content = json.dumps({'modifications': [], 'summary': 'ok'})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        )
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(async_llm, '_runtime', LLMRuntime(max_concurrency=4))
+    monkeypatch.setenv('LLM_CACHE_ENABLED', 'false')
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    llm = LLMHandler()
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=UsageCompletions()))
+
+    def build(bitbucket_api=None, workers=4):
+        processor = IssueProcessor(bitbucket_api or FakeBitbucketAPI(), llm, max_file_workers=workers)
+        monkeypatch.setattr(processor, '_save_spec_file', lambda key, content: 'spec.md')
+        return processor
+
+    return build
+
+
+@pytest.fixture
+def issue():
+    return {'key': 'GEN-1', 'fields': {'summary': 'SDB 개발 요청', 'description': ''}}
+
+
+class TestMetricPrimitives:
+    """카운터/히스토그램 텍스트 형식 테스트"""
+
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        counter = registry.register(Counter('t_errors_total', '에러', ['stage']))
+        histogram = registry.register(Histogram('t_seconds', '시간', ['stage'], buckets=(0.1, 1.0)))
+
+        counter.inc(stage='commit')
+        counter.inc(2, stage='commit')
+        histogram.observe(0.05, stage='llm_call')
+        histogram.observe(0.5, stage='llm_call')
+
+        text = registry.render()
+        assert '# TYPE t_errors_total counter' in text
+        assert 't_errors_total{stage="commit"} 3' in text
+        assert 't_seconds_bucket{stage="llm_call",le="0.1"} 1' in text
+        assert 't_seconds_bucket{stage="llm_call",le="1.0"} 2' in text
+        assert 't_seconds_bucket{stage="llm_call",le="+Inf"} 2' in text
+        assert 't_seconds_count{stage="llm_call"} 2' in text
+
+    def test_label_escaping(self):
+        counter = Counter('t_total', 'x', ['name'])
+        counter.inc(name='a"b\\c')
+        assert counter.collect() == ['t_total{name="a\\"b\\\\c"} 1']
+
+    def test_stage_records_errors(self):
+        before = metrics.STAGE_ERRORS.value(stage='test_stage')
+        with metrics.issue_metrics('GEN-2') as recorder:
+            with pytest.raises(ValueError):
+                with metrics.stage('test_stage', 'a.cpp'):
+                    raise ValueError("boom")
+
+        assert metrics.STAGE_ERRORS.value(stage='test_stage') == before + 1
+        summary = recorder.summary()
+        assert summary['stages']['test_stage']['errors'] == 1
+        assert 'test_stage' in summary['files']['a.cpp']
+
+    def test_fail_stage_without_raise(self):
+        before = metrics.STAGE_ERRORS.value(stage='soft_stage')
+        with metrics.issue_metrics('GEN-3') as recorder:
+            with metrics.stage('soft_stage', 'a.cpp'):
+                metrics.fail_stage("empty response")
+            with metrics.stage('soft_stage', 'b.cpp'):
+                pass
+        metrics.fail_stage("outside stage")  # stage 밖이면 무시
+
+        assert metrics.STAGE_ERRORS.value(stage='soft_stage') == before + 1
+        assert recorder.summary()['stages']['soft_stage']['errors'] == 1
+
+
+class TestIssueMetrics:
+    """process_issue 결과에 첨부되는 이슈별 메트릭 테스트"""
+
+    def test_result_contains_stage_and_token_metrics(self, processor, issue):
+        result = processor().process_issue(issue)
+        summary = result['metrics']
+        target_paths = [f['path'] for f in get_target_files()]
+
+        assert result['status'] == 'completed'
+        for name in ['spec_conversion', 'branch_creation', 'commit', 'pull_request']:
+            assert summary['stages'][name]['count'] == 1
+        for name in ['file_fetch', 'encoding_detection', 'ast_extraction', 'prompt_build', 'llm_call', 'diff_apply']:
+            assert summary['stages'][name]['count'] == len(target_paths)
+        assert set(summary['files']) == set(target_paths)
+
+        # Spec 변환 1회 + 파일별 1회, 워커 스레드/LLM 런타임 루프에서 기록된 토큰도 포함
+        assert summary['llm_calls'] == 1 + len(target_paths)
+        assert summary['tokens'] == {
+            'prompt': 10 * (1 + len(target_paths)),
+            'completion': 5 * (1 + len(target_paths)),
+            'total': 15 * (1 + len(target_paths)),
+        }
+        json.dumps(summary)
+
+    def test_metrics_isolated_per_issue(self, processor, issue):
+        first = processor().process_issue(issue)
+        second = processor(workers=1).process_issue(dict(issue, key='GEN-2'))
+        assert first['metrics']['llm_calls'] == second['metrics']['llm_calls']
+
+    def test_swallowed_llm_error_counted(self, processor, issue, monkeypatch):
+        def failing_completion(*args, **kwargs):
+            raise RuntimeError("upstream 500")
+
+        before = metrics.STAGE_ERRORS.value(stage='llm_call')
+        instance = processor()
+        # Spec 변환은 성공시키고 파일별 LLM 호출만 실패
+        monkeypatch.setattr(instance.llm_handler, 'chat_completion', failing_completion)
+        result = instance.process_issue(issue)
+        target_count = len(get_target_files())
+
+        assert result['status'] == 'completed'
+        assert metrics.STAGE_ERRORS.value(stage='llm_call') == before + target_count
+        assert result['metrics']['stages']['llm_call']['errors'] == target_count
+
+    def test_swallowed_spec_conversion_error_counted(self, processor, issue, monkeypatch):
+        async def failing_completion(*args, **kwargs):
+            raise RuntimeError("upstream 500")
+
+        before = metrics.STAGE_ERRORS.value(stage='spec_conversion')
+        instance = processor()
+        monkeypatch.setattr(instance.llm_handler, 'achat_completion', failing_completion)
+        result = instance.process_issue(issue)
+
+        # 간단한 요약 Spec으로 계속 진행하되 단계 에러로 집계
+        assert result['status'] == 'completed'
+        assert metrics.STAGE_ERRORS.value(stage='spec_conversion') == before + 1
+        assert result['metrics']['stages']['spec_conversion']['errors'] == 1
+
+    def test_commit_error_counted(self, processor, issue):
+        before = metrics.STAGE_ERRORS.value(stage='commit')
+        result = processor(FakeBitbucketAPI(fail_commit=True)).process_issue(issue)
+
+        assert metrics.STAGE_ERRORS.value(stage='commit') == before + 1
+        assert result['metrics']['stages']['commit']['errors'] == 1
+
+
+class TestMetricsEndpoint:
+    """/metrics 라우트 테스트"""
+
+    def test_metrics_endpoint(self, processor, issue):
+        import app.main as main
+        processor().process_issue(issue)
+
+        response = main.app.test_client().get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        assert 'sdb_stage_duration_seconds_bucket{stage="llm_call",le="+Inf"}' in text
+        assert 'sdb_llm_tokens_total{model="gpt-4o",type="prompt"}' in text
+        assert 'sdb_issues_processed_total{status="completed"}' in text
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,71 @@
+"""
+스트리밍 multipart 인코더 테스트
+"""
+
+import pytest
+from urllib3.fields import RequestField
+from urllib3.filepost import encode_multipart_formdata
+
+from app.multipart import MultipartStream, SizedMultipartStream, multipart_stream
+
+
+def _requests_body(fields, files, boundary):
+    """requests가 data=/files=로 만드는 본문 (비교 기준)"""
+    request_fields = []
+    for name, value in fields.items():
+        field = RequestField(name, value.encode('utf-8'))
+        field.make_multipart()
+        request_fields.append(field)
+    for name, (filename, content, content_type) in files.items():
+        field = RequestField(name, content, filename=filename)
+        field.make_multipart(content_type=content_type)
+        request_fields.append(field)
+    return encode_multipart_formdata(request_fields, boundary=boundary)[0]
+
+
+class TestMultipartStream:
+    """본문 생성 테스트"""
+
+    def test_body_matches_requests_encoding(self):
+        fields = {'message': '[GEN-1] 재질 추가', 'branch': 'feature/GEN-1'}
+        files = {
+            'src/wg_db/MatlDB.cpp': ('src/wg_db/MatlDB.cpp', '// 재질\r\n'.encode('cp949'), 'application/octet-stream'),
+            'src/wg_db/a.h': ('src/wg_db/a.h', 'text', None),
+        }
+        stream = MultipartStream(fields, files, boundary='b' * 32, chunk_size=4)
+
+        assert stream.to_bytes() == _requests_body(fields, files, 'b' * 32)
+        assert stream.length == len(stream.to_bytes())
+
+    def test_file_content_not_copied(self):
+        content = bytes(range(256)) * 100
+        stream = MultipartStream(files={'a.bin': ('a.bin', content, None)}, chunk_size=1000)
+
+        views = [chunk for chunk in stream if isinstance(chunk, memoryview)]
+        assert len(views) == 26
+        assert all(view.obj is content for view in views)
+
+    def test_reiterable_for_retries(self):
+        stream = MultipartStream({'branch': 'master'}, {'a': ('a', b'payload', None)})
+        assert stream.to_bytes() == stream.to_bytes()
+
+    def test_none_fields_skipped(self):
+        stream = MultipartStream({'parents': None, 'branch': 'master'})
+        assert b'parents' not in stream.to_bytes()
+
+    def test_quotes_in_names_escaped(self):
+        stream = MultipartStream(files={'a"b.cpp': ('a"b.cpp', b'x', None)})
+        assert b'name="a%22b.cpp"; filename="a%22b.cpp"' in stream.to_bytes()
+
+    def test_sized_vs_chunked(self):
+        sized = multipart_stream({'branch': 'master'})
+        chunked = multipart_stream({'branch': 'master'}, chunked=True)
+
+        assert isinstance(sized, SizedMultipartStream)
+        assert len(sized) == sized.length
+        # 길이가 없으면 requests가 Transfer-Encoding: chunked로 전송
+        assert not hasattr(chunked, '__len__')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
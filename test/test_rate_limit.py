@@ -0,0 +1,124 @@
+"""
+토큰 버킷/AIMD 동시 요청 제한/Retry-After 파싱 테스트
+"""
+
+import time
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.rate_limit import (
+    AdaptiveConcurrency, QuotaTracker, TokenBucket, backoff_delay, parse_reset, parse_retry_after
+)
+
+
+class TestTokenBucket:
+    """토큰 버킷 테스트"""
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # 2개는 즉시, 나머지 4개는 초당 20개 속도
+        assert time.monotonic() - start >= 0.18
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket(rate=0)
+        start = time.monotonic()
+        for _ in range(1000):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.5
+
+    def test_pause_blocks_all_callers(self):
+        bucket = TokenBucket(rate=0)
+        bucket.pause(0.2)
+        start = time.monotonic()
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.19
+
+    def test_reserve_does_not_block(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        assert bucket.reserve() == 0
+        delay = bucket.reserve()
+        # 다음 토큰까지 약 0.1초 (비동기 클라이언트는 이만큼 await)
+        assert 0 < delay <= 0.1
+
+
+class TestAdaptiveConcurrency:
+    """AIMD 동시 요청 한도 테스트"""
+
+    def test_halves_on_throttle_and_recovers(self):
+        concurrency = AdaptiveConcurrency(max_limit=8, cooldown=0)
+        concurrency.on_throttle()
+        assert concurrency.limit == 4
+        concurrency.on_throttle()
+        assert concurrency.limit == 2
+
+        for _ in range(2 + 3):
+            concurrency.on_success()
+        assert concurrency.limit == 4
+
+    def test_burst_of_429_counts_once(self):
+        concurrency = AdaptiveConcurrency(max_limit=8, cooldown=10)
+        for _ in range(5):
+            concurrency.on_throttle()
+        assert concurrency.limit == 4
+
+    def test_limit_bounds_in_flight(self):
+        concurrency = AdaptiveConcurrency(max_limit=4, cooldown=0)
+        concurrency.on_throttle()  # 한도 2
+        peak = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def work():
+            with concurrency:
+                with lock:
+                    peak['now'] += 1
+                    peak['max'] = max(peak['max'], peak['now'])
+                time.sleep(0.05)
+                with lock:
+                    peak['now'] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak['max'] == 2
+
+
+class TestHeaderParsing:
+    """Retry-After / X-RateLimit-* 파싱 테스트"""
+
+    def test_retry_after_seconds_and_date(self):
+        assert parse_retry_after('5') == 5.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+    def test_reset_epoch_and_relative(self):
+        assert parse_reset('120') == 120.0
+        assert 55 <= parse_reset(str(int(time.time()) + 60)) <= 60
+
+    def test_quota_tracker(self):
+        tracker = QuotaTracker()
+        assert tracker.update({}) is False
+        assert tracker.update({'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '10',
+                               'X-RateLimit-NearLimit': 'true'}) is True
+        snapshot = tracker.snapshot()
+        assert snapshot['limit'] == 1000
+        assert snapshot['remaining'] == 10
+        assert snapshot['near_limit'] is True
+
+    def test_backoff_with_jitter_bounded(self):
+        delays = [backoff_delay(3, base=1.0, cap=5.0) for _ in range(200)]
+        assert all(0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
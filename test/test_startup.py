@@ -0,0 +1,177 @@
+"""
+워커 기동(app.main import) 비용 및 지연 초기화 테스트
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.main 누적 import 시간 상한 (느린 CI에서는 IMPORT_TIME_BUDGET_MS로 조정)
+IMPORT_TIME_BUDGET_MS = int(os.getenv('IMPORT_TIME_BUDGET_MS', '1000'))
+
+
+def _offline_env():
+    env = dict(os.environ)
+    env.update({
+        'BITBUCKET_ACCESS_TOKEN': 'dummy-token',
+        'OPENAI_API_KEY': 'dummy-key',
+        # 라우팅되지 않는 주소: import 중 네트워크 호출이 있으면 타임아웃까지 멈춤
+        'BITBUCKET_URL': 'http://10.255.255.1',
+    })
+    return env
+
+
+def _run_python(code, *flags):
+    start = time.time()
+    completed = subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=PROJECT_ROOT, env=_offline_env(),
+        capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed, time.time() - start
+
+
+def _parse_importtime(stderr):
+    """-X importtime 출력 → {모듈명: 누적 마이크로초}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        modules[name] = int(cumulative_us)
+    return modules
+
+
+class TestColdStart:
+    """app.main import 시 부수효과/비용 테스트"""
+
+    def test_import_time_budget(self):
+        completed, elapsed = _run_python('import app.main', '-X', 'importtime')
+        modules = _parse_importtime(completed.stderr)
+
+        assert modules['app.main'] / 1000 < IMPORT_TIME_BUDGET_MS
+        # 네트워크 호출이 없으므로 오프라인 주소여도 바로 끝남
+        assert elapsed < 10
+
+    def test_heavy_dependencies_not_imported(self):
+        completed, _ = _run_python('import app.main', '-X', 'importtime')
+        modules = _parse_importtime(completed.stderr)
+
+        assert 'openai' not in modules
+        assert 'clang.cindex' not in modules
+
+    def test_libclang_loaded_on_first_use(self):
+        code = (
+            "import app.code_chunker as c\n"
+            "chunker = c.CodeChunker()\n"
+            "print(c._libclang_loaded)\n"
+            "chunker.extract_functions('void f() {}\\n')\n"
+            "print(c._libclang_loaded)\n"
+        )
+        completed, _ = _run_python(code)
+        assert completed.stdout.split() == ['False', 'True']
+
+    def test_clang_preload_at_startup(self):
+        code = (
+            "import os\n"
+            "os.environ['CLANG_PRELOAD'] = 'true'\n"
+            "import app.main\n"
+            "import app.code_chunker as c\n"
+            "print(c._libclang_loaded, c._shared_chunker is not None)\n"
+        )
+        completed, _ = _run_python(code)
+        assert completed.stdout.split() == ['True', 'True']
+        assert 'Clang 사전 로드 완료' in completed.stderr
+
+
+class TestLazyInitialization:
+    """지연 생성되는 구성 요소 테스트"""
+
+    def test_openai_client_created_on_first_access(self, monkeypatch):
+        from app.llm_handler import LLMHandler
+        monkeypatch.setenv('OPENAI_API_KEY', 'dummy-key')
+
+        handler = LLMHandler()
+        assert handler._client_initialized is False
+        assert handler.client is not None
+        assert handler.client is handler.client
+
+    def test_mock_mode_without_key(self, monkeypatch):
+        from app.llm_handler import LLMHandler
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        assert LLMHandler().client is None
+
+    def test_large_file_handler_created_on_first_access(self, monkeypatch):
+        from app.llm_handler import LLMHandler
+        from app.issue_processor import IssueProcessor
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+        processor = IssueProcessor(None, LLMHandler())
+        assert processor._large_file_handler is None
+        assert processor.large_file_handler is processor.large_file_handler
+
+
+class TestBackgroundTokenValidation:
+    """첫 요청 시 백그라운드 토큰 검증과 /health 보고"""
+
+    @pytest.fixture
+    def main(self, monkeypatch):
+        import app.main as main
+        monkeypatch.setattr(main, 'BITBUCKET_ACCESS_TOKEN', 'dummy-token')
+        monkeypatch.setattr(main, '_token_validation_started', False)
+        monkeypatch.setattr(main, 'token_status', {'state': 'pending', 'repository': None, 'checked_at': None})
+        return main
+
+    def _wait_for_state(self, client, states):
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            status = client.get('/health').get_json()['bitbucket_token']
+            if status['state'] in states:
+                return status
+            time.sleep(0.02)
+        raise AssertionError(f"토큰 상태가 {states}가 되지 않음: {status}")
+
+    def test_validation_runs_in_background(self, main, monkeypatch):
+        release = threading.Event()
+        calls = []
+
+        def slow_validate():
+            calls.append(1)
+            release.wait(5)
+            return True, {'name': 'genw_new'}
+
+        monkeypatch.setattr(main.bitbucket_api, 'validate_token', slow_validate)
+        client = main.app.test_client()
+
+        # 검증이 끝나지 않아도 /health는 즉시 응답
+        response = client.get('/health')
+        assert response.status_code == 200
+        assert response.get_json()['bitbucket_token']['state'] in ('pending', 'checking')
+
+        release.set()
+        status = self._wait_for_state(client, {'valid'})
+        assert status['repository'] == 'genw_new'
+        assert status['checked_at'] is not None
+        assert len(calls) == 1
+
+    def test_invalid_token_reported(self, main, monkeypatch):
+        monkeypatch.setattr(main.bitbucket_api, 'validate_token', lambda: (False, None))
+        client = main.app.test_client()
+        client.get('/health')
+        assert self._wait_for_state(client, {'invalid'})['repository'] is None
+
+    def test_health_reports_llm_limits(self, main, monkeypatch):
+        monkeypatch.setattr(main.bitbucket_api, 'validate_token', lambda: (True, {'name': 'genw_new'}))
+        limits = main.app.test_client().get('/health').get_json()['llm_rate_limit']
+        assert {'rpm_limit', 'tpm_limit', 'waits', 'wait_seconds', 'in_flight'} <= set(limits)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])